@@ -0,0 +1,115 @@
+import sys
+import argparse
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+# パス設定
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+import feedparser
+
+from src.parser.fast_feed_parser import FastFeedParser
+
+
+def make_rss(items):
+    """RSS 2.0の合成フィードを作成"""
+    entries = "".join(
+        f"<item><title>お知らせ {i} &amp; 関連資料</title><link>https://www.fdma.go.jp/news/{i}.html</link>"
+        f"<guid>https://www.fdma.go.jp/news/{i}.html</guid>"
+        f"<pubDate>Thu, 22 May 2025 {i % 24:02d}:{i % 60:02d}:00 +0900</pubDate>"
+        f"<description><![CDATA[<p>{'本文の説明です。' * 20}</p>]]></description></item>"
+        for i in range(items)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>総務省消防庁</title>'
+        f'<link>https://www.fdma.go.jp/</link>{entries}</channel></rss>'
+    ).encode("utf-8")
+
+
+def make_rdf(items):
+    """RDF(RSS 1.0)の合成フィードを作成（Shift_JIS）"""
+    entries = "".join(
+        f'<item rdf:about="https://www.kantei.go.jp/jp/{i}.html"><title>記者会見 {i}</title>'
+        f"<link>https://www.kantei.go.jp/jp/{i}.html</link><description>{'会見の概要。' * 20}</description>"
+        f"<dc:date>2025-05-22T{i % 24:02d}:00:00+09:00</dc:date></item>"
+        for i in range(items)
+    )
+    return (
+        '<?xml version="1.0" encoding="Shift_JIS"?>'
+        '<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/" '
+        'xmlns:dc="http://purl.org/dc/elements/1.1/"><channel rdf:about="https://www.kantei.go.jp/">'
+        f'<title>首相官邸</title><link>https://www.kantei.go.jp/</link><description>新着</description></channel>{entries}</rdf:RDF>'
+    ).encode("cp932")
+
+
+def make_atom(items):
+    """Atomの合成フィードを作成"""
+    entries = "".join(
+        f'<entry><title>動画 {i}</title><link rel="alternate" href="https://www.gov-online.go.jp/movie/{i}.html"/>'
+        f"<id>urn:gov:{i}</id><updated>2025-05-22T{i % 24:02d}:00:00Z</updated>"
+        f"<summary>{'動画の説明。' * 20}</summary></entry>"
+        for i in range(items)
+    )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom">'
+        f'<title>政府広報</title><id>urn:gov</id><updated>2025-05-22T00:00:00Z</updated>{entries}</feed>'
+    ).encode("utf-8")
+
+
+def with_feedparser(content):
+    """feedparserでリンクと公開日時を取り出す"""
+    return [(entry.get("link"), entry.get("published_parsed") or entry.get("updated_parsed")) for entry in feedparser.parse(content).entries]
+
+
+def with_fast_parser(content):
+    """逐次解析でリンクと公開日時を取り出す"""
+    return [
+        (entry.get("link"), entry.get("published_parsed") or entry.get("updated_parsed"))
+        for entry in FastFeedParser().iter_entries(content)
+    ]
+
+
+def measure(func, content, runs):
+    """所要時間（秒）の中央値・最大メモリ使用量（バイト）・件数を返す"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        results = func(content)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        func(content)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return statistics.median(timings), peak, len(results)
+
+
+def main():
+    """feedparserと逐次解析の解析時間・メモリ使用量を比較"""
+    parser = argparse.ArgumentParser(description="大きな合成フィードでfeedparserと逐次解析を比較")
+    parser.add_argument("--items", type=int, default=2000, help="フィードのエントリ数")
+    parser.add_argument("--runs", type=int, default=5, help="計測回数")
+    args = parser.parse_args()
+
+    for name, make in (("RSS 2.0", make_rss), ("RDF (Shift_JIS)", make_rdf), ("Atom", make_atom)):
+        content = make(args.items)
+        print(f"{name}（{args.items}件, {len(content) / 1024 / 1024:.1f} MB）")
+
+        baseline = None
+        for label, func in (("feedparser", with_feedparser), ("逐次解析", with_fast_parser)):
+            elapsed, peak, count = measure(func, content, args.runs)
+            baseline = baseline or elapsed
+            print(
+                f"  {label:<10} 中央値 {elapsed * 1000:8.1f} ms  最大メモリ {peak / 1024 / 1024:6.1f} MB  "
+                f"{count}件  (feedparser比 {baseline / elapsed:.1f}倍)"
+            )
+
+
+if __name__ == "__main__":
+    main()
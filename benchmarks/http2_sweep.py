@@ -0,0 +1,210 @@
+import sys
+import argparse
+import asyncio
+import statistics
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# パス設定
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+import h2.config
+import h2.connection
+import h2.events
+
+from src.fetcher.fetch_engine import FetchEngine
+from src.fetcher.rss_fetcher import RSSFetcher
+from src.utils.http_client import HTTPClient
+from src.utils.http2_adapter import HTTP2Adapter
+
+
+def make_feed(index, items=20):
+    """ベンチマーク用のRSSフィードを作成"""
+    entries = "".join(
+        f"<item><title>お知らせ {index}-{i}</title><link>https://example.jp/{index}/{i}.html</link>"
+        f"<pubDate>Thu, 22 May 2025 10:{i:02d}:00 +0900</pubDate></item>"
+        for i in range(items)
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>フィード{index}</title>{entries}</channel></rss>'.encode("utf-8")
+
+
+class HTTP1Server:
+    """HTTP/1.1（keep-alive）で応答する検証用サーバー"""
+
+    def __init__(self, latency):
+        self.connections = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                server.connections += 1
+                super().setup()
+
+            def do_GET(self):
+                time.sleep(latency)
+                body = make_feed(self.path)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml; charset=UTF-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class _H2Protocol(asyncio.Protocol):
+    """h2c（平文のHTTP/2）の1接続分の処理"""
+
+    def __init__(self, server):
+        self.server = server
+        self.conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False, header_encoding="utf-8"))
+        self.window_updated = asyncio.Event()
+
+    def connection_made(self, transport):
+        self.server.connections += 1
+        self.transport = transport
+        self.conn.initiate_connection()
+        self.transport.write(self.conn.data_to_send())
+
+    def data_received(self, data):
+        for event in self.conn.receive_data(data):
+            if isinstance(event, h2.events.RequestReceived):
+                path = dict(event.headers)[":path"]
+                asyncio.ensure_future(self.respond(event.stream_id, path))
+            elif isinstance(event, h2.events.WindowUpdated):
+                self.window_updated.set()
+            elif isinstance(event, h2.events.ConnectionTerminated):
+                self.transport.close()
+        self.transport.write(self.conn.data_to_send())
+
+    async def respond(self, stream_id, path):
+        """遅延の後にフィードを返す（フロー制御の窓が空くまで待って送信）"""
+        await asyncio.sleep(self.server.latency)
+        body = make_feed(path)
+        self.conn.send_headers(stream_id, [
+            (":status", "200"),
+            ("content-type", "application/rss+xml; charset=UTF-8"),
+            ("content-length", str(len(body)))
+        ])
+
+        while body:
+            window = min(self.conn.local_flow_control_window(stream_id), self.conn.max_outbound_frame_size)
+            if window <= 0:
+                self.window_updated.clear()
+                await self.window_updated.wait()
+                continue
+            chunk, body = body[:window], body[window:]
+            self.conn.send_data(stream_id, chunk, end_stream=not body)
+            self.transport.write(self.conn.data_to_send())
+
+
+class HTTP2Server:
+    """h2c（平文のHTTP/2）で応答する検証用サーバー"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.connections = 0
+        self.loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def serve():
+            asyncio.set_event_loop(self.loop)
+            self.server = self.loop.run_until_complete(
+                self.loop.create_server(lambda: _H2Protocol(self), "127.0.0.1", 0)
+            )
+            self.port = self.server.sockets[0].getsockname()[1]
+            ready.set()
+            self.loop.run_forever()
+
+        threading.Thread(target=serve, daemon=True).start()
+        ready.wait()
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+def run_sweep(http_client, port, feeds, per_host_concurrency):
+    """同一オリジンのフィードを1巡回分取得して所要時間（秒）を返す"""
+    sources = [{"name": f"feed{i}", "url": f"http://127.0.0.1:{port}/feed/{i}.xml"} for i in range(feeds)]
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        fetcher = RSSFetcher(data_dir=data_dir, http_client=http_client)
+        engine = FetchEngine(max_concurrency=per_host_concurrency, per_host_concurrency=per_host_concurrency)
+
+        started = time.perf_counter()
+        results = engine.run([(fetcher, source) for source in sources])
+        elapsed = time.perf_counter() - started
+
+    if sum(len(entries) for entries in results) != feeds * 20:
+        raise RuntimeError("取得結果が不足しています")
+
+    return elapsed
+
+
+def benchmark(name, server, http_client, args):
+    """同じ条件で複数回巡回し、所要時間の中央値と接続数を表示"""
+    # 接続の確立も計測に含めるため、巡回ごとに接続プールを作り直す
+    timings = []
+    for _ in range(args.runs):
+        client = http_client()
+        try:
+            timings.append(run_sweep(client, server.port, args.feeds, args.per_host))
+        finally:
+            client.close()
+
+    print(
+        f"{name:<9} 中央値 {statistics.median(timings) * 1000:8.1f} ms  "
+        f"(最小 {min(timings) * 1000:.1f} ms, 最大 {max(timings) * 1000:.1f} ms, 接続数 {server.connections / args.runs:.0f}/巡回)"
+    )
+
+
+def main():
+    """HTTP/1.1とHTTP/2の巡回時間を比較"""
+    parser = argparse.ArgumentParser(description="同一オリジンのフィード巡回をHTTP/1.1とHTTP/2で比較")
+    parser.add_argument("--feeds", type=int, default=30, help="同一オリジンのフィード数")
+    parser.add_argument("--per-host", type=int, default=8, help="ホストごとの同時取得数")
+    parser.add_argument("--latency", type=float, default=0.05, help="サーバーの応答遅延（秒）")
+    parser.add_argument("--runs", type=int, default=5, help="巡回回数")
+    args = parser.parse_args()
+
+    config = {"rate_limit": {"enabled": False}, "max_retries": 0}
+
+    def http1_client():
+        return HTTPClient(config=config)
+
+    def http2_client():
+        # 検証用サーバーは平文のため、HTTP/2のみで接続する（h2c prior knowledge）
+        client = HTTPClient(config=config)
+        client.session.mount("http://", HTTP2Adapter(http1=False))
+        return client
+
+    print(f"フィード数 {args.feeds}, ホスト毎の同時取得数 {args.per_host}, 応答遅延 {args.latency * 1000:.0f} ms, {args.runs}回")
+
+    http1_server = HTTP1Server(args.latency)
+    http2_server = HTTP2Server(args.latency)
+    try:
+        benchmark("HTTP/1.1", http1_server, http1_client, args)
+        benchmark("HTTP/2", http2_server, http2_client, args)
+    finally:
+        http1_server.close()
+        http2_server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import sys
+import argparse
+import json
+import re
+import statistics
+import time
+from pathlib import Path
+
+# パス設定
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.parser.backends import parse_html
+from src.parser.media_scanner import scan_media_urls
+
+
+def script_heavy_page(scripts, media_every):
+    """解析タグ・設定・バンドルなどのインラインスクリプトが多いページを作成（media_every個に1個が動画を含む）"""
+    blocks = []
+    for i in range(scripts):
+        if i % media_every == 0:
+            body = (
+                f'var player{i} = {{"url": "https://www.gov-online.go.jp/movie/{i}.mp4", "title": "動画{i}", "autoplay": false}};'
+                f"loadPlayer('https://stream.gov-online.go.jp/live/{i}/master.m3u8?token={i}');"
+            )
+        else:
+            body = ""
+        # 動画を含まない大きな設定・関数（JSONらしい断片を多く含む）
+        body += "var settings%d = [%s];" % (i, ",".join(f'{{"url": "/page/{i}/{n}.html", "id": {n}}}' for n in range(40)))
+        body += "function f%d(a){return a.map(function(x){return {key: x, value: 'v' + x};});}" % i
+        blocks.append(f"<script>{body}</script>")
+
+    return f"<html><head><title>動画</title>{''.join(blocks[:scripts // 2])}</head><body><main>本文</main>{''.join(blocks[scripts // 2:])}</body></html>"
+
+
+def legacy_scan(texts):
+    """以前の実装（スクリプトごとにm3u8・mp4・JSONの3回の走査、JSONらしい断片はすべて読み込みを試行）"""
+    videos = []
+    for text in texts:
+        if not text:
+            continue
+        for match in re.findall(r'[\'"]((https?://[^\'"\s]+\.m3u8)[^\'"]*)[\'"]', text):
+            videos.append(match[0])
+        for match in re.findall(r'[\'"]((https?://[^\'"\s]+\.mp4)[^\'"]*)[\'"]', text):
+            videos.append(match[0])
+        for json_obj in re.findall(r'({[^{}]*"url"[^{}]*})', text):
+            try:
+                data = json.loads(re.sub(r'([{,])\s*(\w+):', r'\1"\2":', json_obj))
+                url = data.get('url')
+                if isinstance(url, str) and url.endswith(('.mp4', '.m3u8')):
+                    videos.append(url)
+            except Exception:
+                pass
+    return videos
+
+
+def single_pass_scan(texts):
+    """1回の走査で重複なく取り出す"""
+    return [media['url'] for media in scan_media_urls(texts)]
+
+
+def measure(func, texts, runs):
+    """所要時間（秒）の中央値と検出件数を返す"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        results = func(texts)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), len(results)
+
+
+def main():
+    """スクリプトの多いページで以前の走査と1回の走査を比較"""
+    parser = argparse.ArgumentParser(description="スクリプトの多いページで動画URLの走査時間を比較")
+    parser.add_argument("--scripts", type=int, default=200, help="ページ内のスクリプト数")
+    parser.add_argument("--runs", type=int, default=10, help="計測回数")
+    args = parser.parse_args()
+
+    for media_every in (1, 10, args.scripts):
+        html = script_heavy_page(args.scripts, media_every)
+        texts = [script.string for script in parse_html(html, "html.parser").find_all("script")]
+        print(f"スクリプト{args.scripts}個（{media_every}個に1個が動画を含む, {len(html) / 1024:.0f} KB）")
+
+        baseline = None
+        for label, func in (("以前の走査", legacy_scan), ("1回の走査", single_pass_scan)):
+            elapsed, count = measure(func, texts, args.runs)
+            baseline = baseline or elapsed
+            print(f"  {label:<8} 中央値 {elapsed * 1000:8.2f} ms  {count}件  (以前比 {baseline / elapsed:.1f}倍)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import sys
+import argparse
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+# パス設定
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.parser.backends import BACKENDS, is_backend_available, parse_html, select_html
+
+FIXTURE_DIR = root_dir / "tests" / "fixtures" / "html"
+
+# 計測するページとセレクタ
+CASES = [
+    ("news_list.html", ".news-list li"),
+    ("news_dl.html", ".news-list dt, .news-list dd"),
+    ("video_page.html", ".movie-container a"),
+]
+
+
+def scale_page(html, repeat):
+    """bodyの中身を繰り返して実際の一覧ページに近い大きさにする"""
+    head, rest = html.split("<body>", 1)
+    body, tail = rest.rsplit("</body>", 1)
+    return f"{head}<body>{body * repeat}</body>{tail}"
+
+
+def portal_page(items):
+    """ヘッダー・メニュー・フッター・インラインスクリプトが大きいポータルサイト風のページを作成"""
+    menu = "".join(f'<li class="menu-item"><a href="/menu/{i}.html"><span>メニュー{i}</span></a></li>' for i in range(400))
+    script = "<script>var config = {" + ",".join(f'"key{i}": "{"x" * 40}"' for i in range(300)) + "};</script>"
+    banners = "".join(f'<div class="banner"><a href="/b/{i}"><img src="/img/{i}.png" alt="バナー{i}"></a><p>{"説明文" * 20}</p></div>' for i in range(200))
+    news = "".join(
+        f'<li><span class="news-date">2025年5月{i % 28 + 1}日</span><a href="/news/{i}.html">お知らせ {i}</a></li>' for i in range(items)
+    )
+    return (
+        f'<html><head><title>ポータル</title>{script}</head><body>'
+        f'<header><nav><ul class="global-menu">{menu}</ul></nav></header>'
+        f'<main><section class="banners">{banners}</section><ul class="news-list">{news}</ul></main>'
+        f'<footer><ul class="footer-menu">{menu}</ul>{script}</footer></body></html>'
+    )
+
+
+def parse_and_select(html, backend, selector, partial=False):
+    """解析してセレクタの要素からテキストとリンクを取り出す"""
+    if partial:
+        elements = select_html(html, selector, backend)
+    else:
+        elements = parse_html(html, backend).select(selector)
+
+    results = []
+    for element in elements:
+        link = element.find("a")
+        results.append((element.get_text(strip=True), link.get("href") if link else None))
+    return results
+
+
+def measure(html, backend, selector, runs, partial=False):
+    """解析＋抽出の所要時間（秒）の中央値と抽出件数を返す"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        results = parse_and_select(html, backend, selector, partial)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), len(results)
+
+
+def measure_memory(html, backend, selector, partial):
+    """解析＋抽出中のPythonオブジェクトの最大メモリ使用量（バイト）を返す"""
+    tracemalloc.start()
+    try:
+        parse_and_select(html, backend, selector, partial)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def compare_partial(backends, args):
+    """ポータルサイト風のページで全体解析と部分解析を比較"""
+    html = portal_page(args.items)
+    selector = ".news-list li"
+    print(f"部分解析の比較（ポータルページ {len(html.encode('utf-8')) / 1024:.0f} KB, セレクタ \"{selector}\"）")
+
+    # selectolaxは常に全体を解析するため比較しない
+    for backend in [backend for backend in backends if backend != "selectolax"]:
+        for partial in (False, True):
+            elapsed, count = measure(html, backend, selector, args.runs, partial)
+            memory = measure_memory(html, backend, selector, partial)
+            label = "部分解析" if partial else "全体解析"
+            print(f"  {backend:<12} {label}  中央値 {elapsed * 1000:8.2f} ms  最大メモリ {memory / 1024 / 1024:6.1f} MB  {count}件")
+
+
+def main():
+    """HTMLパーサーごとの解析＋抽出時間を比較"""
+    parser = argparse.ArgumentParser(description="HTMLパーサーごとの解析＋CSSセレクタ抽出の時間を比較")
+    parser.add_argument("--repeat", type=int, default=50, help="ページ本文を繰り返す回数（ページの大きさ）")
+    parser.add_argument("--runs", type=int, default=20, help="計測回数")
+    parser.add_argument("--items", type=int, default=50, help="ポータルページの新着情報の件数")
+    args = parser.parse_args()
+
+    backends = [backend for backend in BACKENDS if is_backend_available(backend)]
+    skipped = [backend for backend in BACKENDS if backend not in backends]
+    if skipped:
+        print(f"未インストールのため計測しないパーサー: {', '.join(skipped)}")
+
+    for name, selector in CASES:
+        html = scale_page((FIXTURE_DIR / name).read_text(encoding="utf-8"), args.repeat)
+        print(f"{name}（{len(html.encode('utf-8')) / 1024:.0f} KB, セレクタ \"{selector}\"）")
+
+        baseline = None
+        for backend in backends:
+            elapsed, count = measure(html, backend, selector, args.runs)
+            baseline = baseline or elapsed
+            print(f"  {backend:<12} 中央値 {elapsed * 1000:8.2f} ms  {count}件  (html.parser比 {baseline / elapsed:.1f}倍)")
+
+    compare_partial(backends, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+import sys
+import signal
+import threading
+import time
+import yaml
+from pathlib import Path
+
+# パス設定
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.logger import get_logger
+from src.utils.http_client import get_http_client
+from src.watcher.url_watcher import URLWatcher, create_circuit_breaker
+from src.watcher.video_watcher import VideoWatcher
+
+
+config_file = root_dir / "config" / "settings.yaml"
+secrets_file = root_dir / "config" / "secrets.yaml"
+
+# 設定ファイルの変更を確認する間隔（秒）
+CONFIG_CHECK_INTERVAL = 30
+
+# 起動時に作成したコンポーネントで使う設定（変更の反映には再起動が必要）
+RESTART_REQUIRED_SECTIONS = ("http", "circuit_breaker", "http_cache", "archive")
+RESTART_REQUIRED_GENERAL = ("data_dir", "log_dir", "detail_workers")
+
+
+def read_yaml(path):
+    """YAMLファイルの読み込み"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
+def load_config():
+    """設定ファイルの読み込み"""
+    try:
+        return read_yaml(config_file)
+    except Exception as e:
+        print(f"設定ファイルの読み込みエラー: {e}")
+        sys.exit(1)
+
+
+def load_secrets():
+    """秘密キー設定ファイルの読み込み"""
+    if not secrets_file.exists():
+        return {}
+
+    try:
+        return read_yaml(secrets_file)
+    except Exception as e:
+        print(f"秘密キー設定ファイルの読み込みエラー: {e}")
+        return {}
+
+
+def get_intervals(config):
+    """URL監視・動画監視の実行間隔（秒）"""
+    general = config["general"]
+    url_interval = general.get("execution_interval", 15)
+    video_interval = general.get("video_interval", url_interval)
+    return url_interval * 60, video_interval * 60
+
+
+def get_restart_required_changes(old_config, new_config):
+    """再読み込みでは反映されない設定のうち、変更された項目名を返す"""
+    changed = [
+        section for section in RESTART_REQUIRED_SECTIONS
+        if old_config.get(section) != new_config.get(section)
+    ]
+    old_general = old_config.get("general") or {}
+    new_general = new_config.get("general") or {}
+    changed.extend(
+        f"general.{key}" for key in RESTART_REQUIRED_GENERAL
+        if old_general.get(key) != new_general.get(key)
+    )
+    return changed
+
+
+def run_sweep(name, watcher, logger):
+    """1回分の巡回を実行（例外で常駐プロセスを止めない）"""
+    try:
+        watcher.run()
+    except Exception as e:
+        logger.error(f"{name}でエラーが発生しました: {e}")
+
+
+def main():
+    """常駐モード: 設定・接続・監視済み状態・Whisperモデルを保持したまま定期実行"""
+    # 設定の読み込み
+    config = load_config()
+    secrets = load_secrets()
+
+    # ログディレクトリ
+    log_dir = root_dir / config["general"]["log_dir"]
+    log_dir.mkdir(exist_ok=True, parents=True)
+
+    # データディレクトリ
+    data_dir = root_dir / config["general"]["data_dir"]
+    data_dir.mkdir(exist_ok=True, parents=True)
+
+    # ロガーの初期化
+    logger = get_logger(log_dir=log_dir)
+    logger.info("常駐モードを開始します")
+
+    # 終了シグナルを受けたら実行中の巡回が終わった時点で停止する
+    stop_event = threading.Event()
+
+    def handle_signal(signum, frame):
+        logger.info(f"終了シグナルを受信しました ({signum})。実行中の処理が終わり次第停止します")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+    if hasattr(signal, "SIGBREAK"):
+        signal.signal(signal.SIGBREAK, handle_signal)
+
+    # 常駐中に使い回すコンポーネントの初期化
+    circuit_breaker = create_circuit_breaker(config, data_dir, logger=logger)
+    http_client = get_http_client(config.get("http"), logger=logger, circuit_breaker=circuit_breaker)
+    url_watcher = URLWatcher(config, data_dir=data_dir, logger=logger, http_client=http_client)
+    video_watcher = VideoWatcher(config, secrets=secrets, data_dir=data_dir, logger=logger, http_client=http_client)
+
+    url_interval, video_interval = get_intervals(config)
+    config_mtime = config_file.stat().st_mtime
+
+    next_url_run = time.monotonic()
+    next_video_run = time.monotonic()
+
+    while not stop_event.is_set():
+        # 設定ファイルの変更を検知して再読み込み
+        try:
+            mtime = config_file.stat().st_mtime
+            if mtime != config_mtime:
+                config_mtime = mtime
+                new_config = read_yaml(config_file)
+                url_watcher.update_config(new_config)
+                video_watcher.update_config(new_config)
+                url_interval, video_interval = get_intervals(new_config)
+                logger.info("設定ファイルを再読み込みしました")
+
+                # HTTPクライアント・サーキットブレーカー・キャッシュなどは起動時の設定のまま使う
+                changed = get_restart_required_changes(config, new_config)
+                if changed:
+                    logger.warning(f"次の設定の変更を反映するには再起動が必要です: {', '.join(changed)}")
+        except Exception as e:
+            logger.error(f"設定ファイルの再読み込みエラー（以前の設定で継続します）: {e}")
+
+        now = time.monotonic()
+
+        if now >= next_url_run:
+            run_sweep("URL監視処理", url_watcher, logger)
+            next_url_run = time.monotonic() + url_interval
+
+        if stop_event.is_set():
+            break
+
+        if now >= next_video_run:
+            run_sweep("動画監視処理", video_watcher, logger)
+            next_video_run = time.monotonic() + video_interval
+
+        # 次の実行時刻か設定確認のタイミングまで待機（シグナルで即座に起きる）
+        wait = min(next_url_run, next_video_run) - time.monotonic()
+        stop_event.wait(timeout=max(0.0, min(wait, CONFIG_CHECK_INTERVAL)))
+
+    http_client.close()
+    logger.info("常駐モードを終了しました")
+
+
+if __name__ == "__main__":
+    main()
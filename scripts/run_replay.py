@@ -0,0 +1,112 @@
+import sys
+import argparse
+import tempfile
+import yaml
+from pathlib import Path
+from datetime import datetime, time
+
+# パス設定
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.logger import get_logger
+from src.utils.deduplicator import Deduplicator
+from src.storage.file_storage import FileStorage
+from src.storage.response_archive import ResponseArchive
+from src.storage.state_manager import StateManager
+from src.watcher.replay import ResponseReplayer, record_sweep
+
+
+def load_config():
+    """設定ファイルの読み込み"""
+    config_file = root_dir / "config" / "settings.yaml"
+
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f)
+    except Exception as e:
+        print(f"設定ファイルの読み込みエラー: {e}")
+        sys.exit(1)
+
+
+def parse_until(value):
+    """--untilの日時を解析（日付のみの場合はその日の終わりまでを含む）"""
+    until = datetime.fromisoformat(value)
+    if len(value) == len("YYYY-MM-DD"):
+        until = datetime.combine(until.date(), time.max)
+    return until
+
+
+def parse_args(data_dir):
+    """コマンドライン引数の解析"""
+    parser = argparse.ArgumentParser(description="レスポンスの記録と、記録したレスポンスの再解析")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    default_dir = str(data_dir / "archive")
+
+    record = subparsers.add_parser("record", help="全ソースのレスポンスを解析せずに保存")
+    record.add_argument("--dir", default=default_dir, help="保存先ディレクトリ")
+
+    replay = subparsers.add_parser("replay", help="保存したレスポンスを解析・重複排除し直す（通信しない）")
+    replay.add_argument("--dir", default=default_dir, help="アーカイブのディレクトリ")
+    replay.add_argument("--type", choices=["rss", "html", "video"], help="対象のソース種別")
+    replay.add_argument("--source", help="対象のソース名")
+    replay.add_argument("--since", type=datetime.fromisoformat, help="この日時以降の取得分のみ（YYYY-MM-DD）")
+    replay.add_argument("--until", type=parse_until, help="この日時以前の取得分のみ（YYYY-MM-DD の場合はその日を含む）")
+    replay.add_argument("--state", help="重複排除に使う監視済みURLのディレクトリ（省略時は空の状態から開始）")
+    replay.add_argument("--no-dedupe", action="store_true", help="重複排除を行わない（解析速度の計測用）")
+    replay.add_argument("--output", help="新着エントリを保存するJSONファイル")
+
+    return parser.parse_args()
+
+
+def main():
+    """記録/再解析メインスクリプト"""
+    # 設定の読み込み
+    config = load_config()
+
+    # ログディレクトリ
+    log_dir = root_dir / config["general"]["log_dir"]
+    log_dir.mkdir(exist_ok=True, parents=True)
+
+    # データディレクトリ
+    data_dir = root_dir / config["general"]["data_dir"]
+    data_dir.mkdir(exist_ok=True, parents=True)
+
+    args = parse_args(data_dir)
+
+    # ロガーの初期化
+    logger = get_logger(log_dir=log_dir)
+
+    archive = ResponseArchive(args.dir, compression=(config.get("archive") or {}).get("compression", "auto"), logger=logger)
+
+    if args.command == "record":
+        count = record_sweep(config, archive, logger=logger)
+        logger.success(f"{count}件のソースのレスポンスを保存しました: {args.dir}")
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        state = None
+        deduplicator = None
+        if not args.no_dedupe:
+            # 一時ディレクトリを削除する前にデータベースを閉じられるよう、プロセス共通の状態とは別に作成
+            state = StateManager(data_dir=args.state or temp_dir)
+
+            # URLごとのログ出力で解析速度の計測がぶれないようロガーは渡さない
+            deduplicator = Deduplicator(data_dir=args.state or temp_dir, logger=None, state=state)
+
+        try:
+            replayer = ResponseReplayer(archive, config, deduplicator=deduplicator, logger=logger)
+            stats = replayer.replay(source_type=args.type, source_name=args.source, since=args.since, until=args.until)
+        finally:
+            # Windowsでは開いたままのデータベースがあると一時ディレクトリを削除できない
+            if state:
+                state.close()
+
+    if args.output:
+        output = Path(args.output).resolve()
+        FileStorage(data_dir=output.parent, logger=logger).save_json(stats["new_entries"], output.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,13 @@
 import sys
-import os
 import yaml
 from pathlib import Path
-from datetime import datetime
 
 # パス設定
 root_dir = Path(__file__).resolve().parent.parent
 sys.path.append(str(root_dir))
 
 from src.utils.logger import get_logger
-from src.fetcher.rss_fetcher import RSSFetcher
-from src.fetcher.html_scraper import HTMLScraper
-from src.utils.notifier import Notifier
+from src.watcher.url_watcher import URLWatcher
 
 
 def load_config():
@@ -41,42 +37,10 @@ def main():
 
     # ロガーの初期化
     logger = get_logger(log_dir=log_dir)
-    logger.info("URL監視処理を開始します")
 
-    # RSSフェッチャーの初期化
-    rss_fetcher = RSSFetcher(data_dir=data_dir, logger=logger)
-
-    # HTMLスクレイパーの初期化
-    html_scraper = HTMLScraper(data_dir=data_dir, logger=logger)
-
-    # 通知モジュールの初期化
-    notifier = Notifier(config["notification"], logger=logger)
-
-    # RSS取得処理
-    rss_entries = []
-    for source in config["rss_sources"]:
-        if source.get("enabled", True):
-            entries = rss_fetcher.fetch(source)
-            rss_entries.extend(entries)
-
-    # HTML取得処理
-    html_entries = []
-    for source in config["html_sources"]:
-        if source.get("enabled", True):
-            entries = html_scraper.fetch(source)
-            html_entries.extend(entries)
-
-    # 全エントリの結合
-    all_entries = rss_entries + html_entries
-
-    # 新着情報の通知
-    if all_entries:
-        logger.info(f"合計 {len(all_entries)} 件の新着情報を検出しました")
-        notifier.notify_url_updates(all_entries)
-    else:
-        logger.info("新着情報はありませんでした")
-
-    logger.info("URL監視処理が完了しました")
+    # URL監視の実行
+    url_watcher = URLWatcher(config, data_dir=data_dir, logger=logger)
+    url_watcher.run()
 
 
 if __name__ == "__main__":
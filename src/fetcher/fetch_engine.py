@@ -0,0 +1,66 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+
+class FetchEngine:
+    """複数ソースの取得をasyncioで並行実行するクラス"""
+
+    def __init__(self, max_concurrency=10, per_host_concurrency=2, logger=None):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.per_host_concurrency = max(1, int(per_host_concurrency))
+        self.logger = logger
+
+    def _get_host(self, url):
+        """URLからホスト名を取得"""
+        return urlparse(url).netloc.lower()
+
+    async def _fetch_one(self, fetcher, source, executor, global_semaphore, host_semaphores):
+        """1ソース分の取得処理"""
+        host = self._get_host(source['url'])
+
+        if host not in host_semaphores:
+            host_semaphores[host] = asyncio.Semaphore(self.per_host_concurrency)
+
+        # ホスト単位の枠を先に確保し、混雑したホストが全体の枠を占有しないようにする
+        async with host_semaphores[host]:
+            async with global_semaphore:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(executor, fetcher.fetch, source)
+
+    async def _run_all(self, jobs):
+        """全ジョブを並行実行"""
+        global_semaphore = asyncio.Semaphore(self.max_concurrency)
+        host_semaphores = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            tasks = [
+                self._fetch_one(fetcher, source, executor, global_semaphore, host_semaphores)
+                for fetcher, source in jobs
+            ]
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+    def run(self, jobs):
+        """(fetcher, source) のリストを並行取得し、ジョブ順に結果を返す"""
+        if not jobs:
+            return []
+
+        if self.logger:
+            self.logger.info(
+                f"並行取得開始: {len(jobs)}件 (最大同時数: {self.max_concurrency}, "
+                f"ホスト毎: {self.per_host_concurrency})"
+            )
+
+        results = asyncio.run(self._run_all(jobs))
+
+        # 例外は空の結果として扱う
+        fetched = []
+        for (fetcher, source), result in zip(jobs, results):
+            if isinstance(result, Exception):
+                if self.logger:
+                    self.logger.error(f"並行取得エラー: {source.get('name', source['url'])} - {result}")
+                fetched.append([])
+            else:
+                fetched.append(result)
+
+        return fetched
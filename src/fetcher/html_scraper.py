@@ -1,126 +1,186 @@
-import requests
-from bs4 import BeautifulSoup
-import json
+import threading
 from pathlib import Path
-from datetime import datetime
 import hashlib
 
+from src.utils.http_client import get_http_client, get_request_limits, RateLimitDeadlineExceeded
+from src.utils.encoding import EncodingResolver
+from src.parser.backends import select_html, get_source_backend
+from src.parser.html_parser import HTMLParser
+from src.storage.state_manager import get_state_manager
+
 
 class HTMLScraper:
     """固定URLからHTMLを取得して解析するクラス"""
 
-    def __init__(self, data_dir="data", logger=None):
+    def __init__(self, data_dir="data", logger=None, http_client=None, archive=None, circuit_breaker=None, parser_backend=None, partial_parse=True, state=None):
         self.data_dir = Path(data_dir)
         self.logger = logger
 
+        # HTMLパーサー（ソースごとのparserで上書き可）
+        self.parser_backend = parser_backend
+
+        # セレクタに関係する部分だけを解析するか（ソースごとのpartial_parseで上書き可）
+        self.partial_parse = partial_parse
+
+        # 新着エントリのデータの作成（タイトル・リンクの抽出）
+        self.html_parser = HTMLParser(logger=logger)
+
+        # 共通HTTPクライアント
+        self.http_client = http_client or get_http_client(logger=logger)
+
+        # 取得したレスポンスの保存先（Noneの場合は保存しない）
+        self.archive = archive
+
+        # ソース単位のサーキットブレーカー（Noneの場合は使用しない）
+        self.circuit_breaker = circuit_breaker
+
+        # 文字コード判定（ホストごとの判定結果を保持）
+        self.encoding_resolver = EncodingResolver(logger=logger)
+
         # データディレクトリが存在しない場合は作成
         self.data_dir.mkdir(exist_ok=True, parents=True)
 
-        # 監視済みURLの保存ファイル
-        self.watched_file = self.data_dir / "watched_urls.json"
+        # プロセス共通の監視済み状態（巡回中の保存は巡回の終わりにまとめて行う）
+        self.state = state or get_state_manager(data_dir, logger=logger)
 
-        # 以前に取得したURLのリスト
-        self.watched_urls = self._load_watched_urls()
+        # 監視済みURL（索引付きのテーブルとソースごとの集合で新着判定）
+        self.seen_store = self.state.seen_store
 
-    def _load_watched_urls(self):
-        """監視済みURLをロード"""
-        if self.watched_file.exists():
-            try:
-                with open(self.watched_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                if self.logger:
-                    self.logger.error(f"監視済みURLの読み込みエラー: {e}")
-                return {"rss": {}, "html": {}, "video": {}}
-        else:
-            return {"rss": {}, "html": {}, "video": {}}
+        # ソースごとのページ本文・セレクタ範囲のフィンガープリント
+        self.fingerprints = self.state.document("html_fingerprints.json")
 
-    def _save_watched_urls(self):
-        """監視済みURLを保存"""
-        try:
-            with open(self.watched_file, 'w', encoding='utf-8') as f:
-                json.dump(self.watched_urls, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            if self.logger:
-                self.logger.error(f"監視済みURLの保存エラー: {e}")
+        # 並行解析時にフィンガープリントの更新と保存を直列化するためのロック（監視済みURLはSeenStore側で排他制御）
+        self._lock = threading.Lock()
 
     def _get_content_hash(self, content):
         """コンテンツのハッシュ値を取得"""
         return hashlib.md5(content.encode('utf-8')).hexdigest()
 
-    def fetch(self, source):
-        """HTML固定ページから新着情報を取得"""
+    def _get_region_hash(self, items):
+        """セレクタで抽出した要素群を空白正規化してハッシュ化"""
+        region = '\n'.join(' '.join(str(item).split()) for item in items)
+        return self._get_content_hash(region)
+
+    def _is_unchanged(self, source_id, selector, kind, value):
+        """前回と同じフィンガープリントか判定"""
+        # 監視済みURLが失われている場合は必ず解析する
+        if not self.seen_store.has_source("html", source_id):
+            return False
+
+        state = self.fingerprints.get(source_id)
+        if not state or state.get('selector') != selector:
+            return False
+
+        return state.get(kind) == value
+
+    def download(self, source):
+        """HTMLを取得してレスポンスを返す（停止中・取得エラーの場合はNone）"""
+        # 連続して失敗しているソースは冷却期間中は取得しない
+        source_key = f"html:{source['url']}"
+        if self.circuit_breaker and not self.circuit_breaker.allow(source_key):
+            if self.logger:
+                self.logger.warning(f"停止中のソースのためスキップします: {source['name']}")
+            return None
+
         if self.logger:
             self.logger.info(f"HTML取得開始: {source['name']} ({source['url']})")
 
-        # HTMLの取得
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(source['url'], headers=headers, timeout=30)
+            response = self.http_client.get(source['url'], **get_request_limits(source))
+
+            # 取得したレスポンスを保存
+            if self.archive:
+                self.archive.store('html', source, response)
+
             response.raise_for_status()
 
+            # 取得成功を記録
+            if self.circuit_breaker:
+                self.circuit_breaker.record_success(source_key)
+
+            return response
+
+        except Exception as e:
+            # 送信速度制御による打ち切りはソースの障害として記録しない
+            if self.circuit_breaker and not isinstance(e, RateLimitDeadlineExceeded):
+                self.circuit_breaker.record_failure(source_key, e)
+            if self.logger:
+                self.logger.error(f"HTML取得エラー: {source['name']} - {e}")
+            return None
+
+    def iter_new_entries(self, source, response):
+        """取得したHTMLを解析し、新着エントリを見つけた順に返す（監視済み状態は最後に保存）"""
+        source_id = source['url']
+        selector = source.get('selector') or ''
+        count = 0
+
+        try:
+            # 本文が前回とバイト単位で同じ場合は解析せずに終了
+            body_hash = hashlib.md5(response.content).hexdigest()
+            if self._is_unchanged(source_id, selector, 'body', body_hash):
+                if self.logger:
+                    self.logger.success(f"HTML取得完了: {source['name']} - 変更なし")
+                return
+
             # 文字コードを適切に設定
-            response.encoding = response.apparent_encoding
+            response.encoding = self.encoding_resolver.resolve_response(response)
 
-            # HTMLの解析
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # HTMLを解析してセレクタに一致する要素を抽出（セレクタがない場合は空）
+            items = select_html(
+                response.text, selector, get_source_backend(source, self.parser_backend),
+                logger=self.logger, partial=source.get('partial_parse', self.partial_parse)
+            )
 
-            # セレクタが指定されている場合はそれに従って要素を抽出
-            items = []
-            if 'selector' in source and source['selector']:
-                items = soup.select(source['selector'])
+            # セレクタ範囲が前回と同じ場合は新着判定と監視済みURLの保存を省略
+            region_hash = self._get_region_hash(items)
+            if self._is_unchanged(source_id, selector, 'region', region_hash):
+                with self._lock:
+                    self.fingerprints[source_id] = {'selector': selector, 'body': body_hash, 'region': region_hash}
+                    self.state.save(self.fingerprints)
 
-            # 新着情報の抽出
-            new_entries = []
-            source_id = source['url']
+                if self.logger:
+                    self.logger.success(f"HTML取得完了: {source['name']} - 変更なし")
+                return
 
-            # ソースIDがwatched_urlsに存在しない場合は初期化
-            if source_id not in self.watched_urls["html"]:
-                self.watched_urls["html"][source_id] = []
+            # 監視を始めたソースとして記録
+            self.seen_store.add_source("html", source_id)
 
+            # エントリを返している間はロックを持たない（他のソースの解析を止めない）
             for item in items:
-                # タイトルの抽出
-                title = item.get_text(strip=True)
-
-                # リンクの抽出
-                link = item.find('a')
-                if link and link.has_attr('href'):
-                    link_url = link['href']
-
-                    # 相対URLを絶対URLに変換
-                    if link_url.startswith('/'):
-                        from urllib.parse import urlparse
-                        parsed_url = urlparse(source['url'])
-                        base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-                        link_url = base_url + link_url
-                else:
-                    # リンクがない場合は要素のハッシュ値をIDとして使用
-                    link_url = source['url'] + '#' + self._get_content_hash(title)
-
-                # 新着判定
-                if link_url not in self.watched_urls["html"][source_id]:
-                    # 新着エントリとして追加
-                    new_entries.append({
-                        'title': title,
-                        'link': link_url,
-                        'published': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        'source': source['name']
-                    })
-
-                    # 監視済みURLに追加
-                    self.watched_urls["html"][source_id].append(link_url)
-
-            # 監視済みURLを保存
-            self._save_watched_urls()
+                # タイトル・リンクの抽出（公開日は取得時刻）
+                entry = self.html_parser.build_entry(item, source['url'], source['name'], extract_date=False)
 
-            if self.logger:
-                self.logger.success(f"HTML取得完了: {source['name']} - 新着{len(new_entries)}件")
+                # 以前の形式のリンクで監視済みの場合は、現在の形式でも監視済みにして新着にしない
+                legacy_link = self.html_parser.legacy_link(item, source['url'])
+                if legacy_link and self.seen_store.contains("html", source_id, legacy_link):
+                    self.seen_store.add("html", source_id, entry['link'])
+                    continue
+
+                # 新着判定（未監視のURLは監視済みに追加）
+                if self.seen_store.add("html", source_id, entry['link']):
+                    # 新着エントリとして返す
+                    count += 1
+                    yield entry
+
+            with self._lock:
+                # 次回の比較用にフィンガープリントを記録
+                self.fingerprints[source_id] = {'selector': selector, 'body': body_hash, 'region': region_hash}
 
-            return new_entries
+                # 監視済みURLとフィンガープリントを保存
+                self.state.save(self.fingerprints)
+
+            if self.logger:
+                self.logger.success(f"HTML取得完了: {source['name']} - 新着{count}件")
 
         except Exception as e:
+            if self.circuit_breaker:
+                self.circuit_breaker.record_failure(f"html:{source['url']}", e)
             if self.logger:
                 self.logger.error(f"HTML取得エラー: {source['name']} - {e}")
-            return []
\ No newline at end of file
+
+    def fetch(self, source):
+        """HTML固定ページから新着エントリのリストを返す"""
+        response = self.download(source)
+        if response is None:
+            return []
+        return list(self.iter_new_entries(source, response))
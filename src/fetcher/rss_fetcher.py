@@ -1,104 +1,231 @@
-import feedparser
-import requests
 from datetime import datetime
-import json
+import threading
 from pathlib import Path
 
+from src.utils.http_client import get_http_client, get_request_limits, RateLimitDeadlineExceeded
+from src.parser.fast_feed_parser import FastFeedParser, FeedParseError
+from src.parser.rss_parser import RSSParser
+from src.storage.state_manager import get_state_manager
+
 
 class RSSFetcher:
     """RSSフィードからデータを取得するクラス"""
 
-    def __init__(self, data_dir="data", logger=None):
+    # 既読位置として記録するフィード先頭付近のID数
+    HIGH_WATER_IDS = 20
+
+    # 打ち切りを続けた場合に全件を確認し直す間隔（取得回数）
+    FULL_SCAN_EVERY = 24
+
+    def __init__(self, data_dir="data", logger=None, http_client=None, archive=None, circuit_breaker=None, fast_parse=True, state=None):
         self.data_dir = Path(data_dir)
         self.logger = logger
 
+        # フィードの解析（整形式のフィードは逐次解析し、それ以外はfeedparserで解析）
+        self.feed_parser = FastFeedParser(logger=logger)
+        self.fast_parse = fast_parse
+
+        # 新着エントリのデータの作成
+        self.rss_parser = RSSParser(logger=logger)
+
+        # 共通HTTPクライアント
+        self.http_client = http_client or get_http_client(logger=logger)
+
+        # 取得したレスポンスの保存先（Noneの場合は保存しない）
+        self.archive = archive
+
+        # ソース単位のサーキットブレーカー（Noneの場合は使用しない）
+        self.circuit_breaker = circuit_breaker
+
         # データディレクトリが存在しない場合は作成
         self.data_dir.mkdir(exist_ok=True, parents=True)
 
-        # 監視済みURLの保存ファイル
-        self.watched_file = self.data_dir / "watched_urls.json"
-
-        # 以前に取得したURLのリスト
-        self.watched_urls = self._load_watched_urls()
-
-    def _load_watched_urls(self):
-        """監視済みURLをロード"""
-        if self.watched_file.exists():
-            try:
-                with open(self.watched_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                if self.logger:
-                    self.logger.error(f"監視済みURLの読み込みエラー: {e}")
-                return {"rss": {}, "html": {}, "video": {}}
-        else:
-            return {"rss": {}, "html": {}, "video": {}}
+        # プロセス共通の監視済み状態（巡回中の保存は巡回の終わりにまとめて行う）
+        self.state = state or get_state_manager(data_dir, logger=logger)
 
-    def _save_watched_urls(self):
-        """監視済みURLを保存"""
-        try:
-            with open(self.watched_file, 'w', encoding='utf-8') as f:
-                json.dump(self.watched_urls, f, ensure_ascii=False, indent=2)
-        except Exception as e:
+        # 監視済みURL（索引付きのテーブルとソースごとの集合で新着判定）
+        self.seen_store = self.state.seen_store
+
+        # フィードごとのバリデータ（ETag/Last-Modified）と既読位置
+        self.feed_state = self.state.document("feed_state.json")
+
+        # 並行解析時にフィード状態の更新と保存を直列化するためのロック（監視済みURLはSeenStore側で排他制御）
+        self._lock = threading.Lock()
+
+    def _update_validators(self, source_id, response):
+        """レスポンスのETag/Last-Modifiedを記録"""
+        validators = {}
+
+        etag = response.headers.get('ETag')
+        if etag:
+            validators['etag'] = etag
+
+        modified = response.headers.get('Last-Modified')
+        if modified:
+            validators['modified'] = modified
+
+        # 既読位置（high_water）は残してバリデータだけを置き換える
+        state = {k: v for k, v in self.feed_state.get(source_id, {}).items() if k not in ('etag', 'modified')}
+        state.update(validators)
+
+        if state:
+            self.feed_state[source_id] = state
+        else:
+            self.feed_state.pop(source_id, None)
+
+    def _get_entry_time(self, entry):
+        """エントリの公開（更新）日時を比較用の文字列で返す（ない場合はNone）"""
+        parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+        if not parsed:
+            return None
+        return datetime(*parsed[:6]).strftime('%Y-%m-%d %H:%M:%S')
+
+    def _update_high_water(self, source_id, seen, ordered, full_scan):
+        """既読位置（最新の公開日時・先頭付近のID・日付順か）を記録"""
+        state = self.feed_state.setdefault(source_id, {})
+        mark = state.get('high_water', {})
+
+        times = [entry_time for _, entry_time in seen if entry_time] + ([mark['published']] if mark.get('published') else [])
+        ids = list(dict.fromkeys([entry_id for entry_id, _ in seen] + mark.get('ids', [])))[:self.HIGH_WATER_IDS]
+
+        state['high_water'] = {
+            'published': max(times) if times else None,
+            'ids': ids,
+            # 全件を確認した場合は判定し直し、途中で打ち切った場合は前回の判定を引き継ぐ
+            'ordered': ordered if full_scan else ordered and mark.get('ordered', False),
+            'partial_scans': 0 if full_scan else mark.get('partial_scans', 0) + 1
+        }
+
+    def download(self, source):
+        """RSSフィードを取得してレスポンスを返す（停止中・取得エラーの場合はNone）"""
+        # 連続して失敗しているソースは冷却期間中は取得しない
+        source_key = f"rss:{source['url']}"
+        if self.circuit_breaker and not self.circuit_breaker.allow(source_key):
             if self.logger:
-                self.logger.error(f"監視済みURLの保存エラー: {e}")
+                self.logger.warning(f"停止中のソースのためスキップします: {source['name']}")
+            return None
 
-    def fetch(self, source):
-        """RSSフィードを取得"""
         if self.logger:
             self.logger.info(f"RSS取得開始: {source['name']} ({source['url']})")
 
-        # RSSフィードの取得
         try:
-            feed = feedparser.parse(source['url'])
+            # 前回のバリデータを付けて条件付きで取得
+            validators = self.feed_state.get(source['url'], {})
+            headers = {}
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('modified'):
+                headers['If-Modified-Since'] = validators['modified']
 
-            # フィードの取得に失敗した場合
-            if feed.bozo and not feed.entries:
-                if self.logger:
-                    self.logger.error(f"RSS取得エラー: {source['name']} - {feed.bozo_exception}")
-                return []
+            response = self.http_client.get(source['url'], headers=headers, **get_request_limits(source))
 
-            # 新着エントリの抽出
-            new_entries = []
-            source_id = source['url']
+            # 取得したレスポンスを保存
+            if self.archive:
+                self.archive.store('rss', source, response)
 
-            # ソースIDがwatched_urlsに存在しない場合は初期化
-            if source_id not in self.watched_urls["rss"]:
-                self.watched_urls["rss"][source_id] = []
+            response.raise_for_status()
 
-            for entry in feed.entries:
+            # 取得成功を記録
+            if self.circuit_breaker:
+                self.circuit_breaker.record_success(source_key)
+
+            # 304 Not Modified の場合は解析せず新着なしとして扱う（取得の失敗とは区別してレスポンスを返す）
+            if response.status_code == 304 and self.logger:
+                self.logger.success(f"RSS取得完了: {source['name']} - 更新なし (304)")
+
+            return response
+
+        except Exception as e:
+            # 送信速度制御による打ち切りはソースの障害として記録しない
+            if self.circuit_breaker and not isinstance(e, RateLimitDeadlineExceeded):
+                self.circuit_breaker.record_failure(source_key, e)
+            if self.logger:
+                self.logger.error(f"RSS取得エラー: {source['name']} - {e}")
+            return None
+
+    def iter_new_entries(self, source, response):
+        """取得したフィードを解析し、新着エントリを見つけた順に返す（監視済み状態は最後に保存）"""
+        source_id = source['url']
+        count = 0
+
+        # 更新がない場合（304 Not Modified）は解析しない
+        if response.status_code == 304:
+            return
+
+        try:
+            # エントリは解析しながら順に取り出す（相対URLのリンクはフィードのURLを基準に解決）
+            entries = self.feed_parser.iter_entries(
+                response.content, response_headers=dict(response.headers), fast=self.fast_parse,
+                base_url=response.url or source['url']
+            )
+
+            # 監視を始めたソースとして記録
+            self.seen_store.add_source("rss", source_id)
+
+            # 前回の既読位置（日付順のフィードでは既読位置に達した時点で打ち切る）
+            mark = self.feed_state.get(source_id, {}).get('high_water') or {}
+            early_stop = (
+                mark.get('ordered') and mark.get('published') and not source.get('full_scan', False)
+                and mark.get('partial_scans', 0) < self.FULL_SCAN_EVERY
+            )
+            mark_ids = set(mark.get('ids', []))
+
+            seen = []
+            ordered = True
+            previous_time = None
+            full_scan = True
+
+            # エントリを返している間はロックを持たない（他のソースの解析を止めない）
+            for entry in entries:
                 # エントリのURLまたはIDを取得
                 entry_id = entry.get('link', entry.get('id', ''))
+                entry_time = self._get_entry_time(entry)
+                seen.append((entry_id, entry_time))
 
-                # 新着判定
-                if entry_id and entry_id not in self.watched_urls["rss"][source_id]:
-                    # エントリの公開日時を取得
-                    published = entry.get('published_parsed')
-                    if published:
-                        published = datetime(*published[:6]).strftime('%Y-%m-%d %H:%M:%S')
-                    else:
-                        published = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-                    # 新着エントリとして追加
-                    new_entries.append({
-                        'title': entry.get('title', 'タイトルなし'),
-                        'link': entry_id,
-                        'published': published,
-                        'source': source['name']
-                    })
-
-                    # 監視済みURLに追加
-                    self.watched_urls["rss"][source_id].append(entry_id)
-
-            # 監視済みURLを保存
-            self._save_watched_urls()
+                # 新しい順に並んでいるか（日付のないエントリがあれば順序は判定できない）
+                if entry_time is None or (previous_time and entry_time > previous_time):
+                    ordered = False
+                previous_time = entry_time or previous_time
+
+                # 既読位置まで達したら以降は既読として打ち切る
+                if early_stop and ordered and entry_id in mark_ids and entry_time <= mark['published']:
+                    full_scan = False
+                    break
+
+                # 新着判定（未監視のURLは監視済みに追加）
+                if entry_id and self.seen_store.add("rss", source_id, entry_id):
+                    # 新着エントリとして返す
+                    count += 1
+                    yield self.rss_parser.build_entry(entry, source['name'])
+
+            with self._lock:
+                # 次回の打ち切り判定に使う既読位置を記録
+                if seen:
+                    self._update_high_water(source_id, seen, ordered, full_scan)
+
+                # 次回の条件付き取得に使うバリデータを記録
+                self._update_validators(source_id, response)
+
+                # 監視済みURLとフィード状態を保存
+                self.state.save(self.feed_state)
 
             if self.logger:
-                self.logger.success(f"RSS取得完了: {source['name']} - 新着{len(new_entries)}件")
+                self.logger.success(f"RSS取得完了: {source['name']} - 新着{count}件")
 
-            return new_entries
+        except FeedParseError as e:
+            # フィードの解析に失敗した場合（feedparserでもエントリを取得できない）
+            if self.logger:
+                self.logger.error(f"RSS取得エラー: {source['name']} - {e}")
 
         except Exception as e:
+            if self.circuit_breaker:
+                self.circuit_breaker.record_failure(f"rss:{source['url']}", e)
             if self.logger:
                 self.logger.error(f"RSS取得エラー: {source['name']} - {e}")
-            return []
\ No newline at end of file
+
+    def fetch(self, source):
+        """RSSフィードを取得して新着エントリのリストを返す"""
+        response = self.download(source)
+        if response is None:
+            return []
+        return list(self.iter_new_entries(source, response))
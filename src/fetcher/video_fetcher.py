@@ -1,58 +1,85 @@
-import requests
-from bs4 import BeautifulSoup
-import json
 import re
 from pathlib import Path
 from datetime import datetime
 import hashlib
+import threading
 import m3u8
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.http_client import get_http_client, get_request_limits, RateLimitDeadlineExceeded
+from src.utils.encoding import EncodingResolver
+from src.parser.backends import parse_html, get_source_backend
+from src.parser.media_scanner import scan_media_urls
+from src.storage.state_manager import get_state_manager
 
 
 class VideoFetcher:
     """動画ページからビデオURLを取得するクラス"""
 
-    def __init__(self, data_dir="data", logger=None):
+    # 保持するm3u8の解析結果の上限（古く使われていないものから削除）
+    M3U8_MEMO_SIZE = 256
+
+    def __init__(self, data_dir="data", logger=None, http_client=None, detail_workers=4, http_cache=None, archive=None, circuit_breaker=None, parser_backend=None, state=None):
         self.data_dir = Path(data_dir)
         self.logger = logger
 
+        # HTMLパーサー（ソースごとのparserで上書き可）
+        self.parser_backend = parser_backend
+
+        # リンク先ページ・m3u8のディスクキャッシュ（Noneの場合は使用しない）
+        self.http_cache = http_cache
+
+        # m3u8の解析結果（URLと本文のハッシュが同じなら再解析しない）
+        self._m3u8_results = OrderedDict()
+        self._m3u8_lock = threading.Lock()
+
+        # リンク先ページを並行して解析するワーカー数
+        self.detail_workers = detail_workers
+
+        # 共通HTTPクライアント
+        self.http_client = http_client or get_http_client(logger=logger)
+
+        # 取得したレスポンスの保存先（Noneの場合は保存しない）
+        self.archive = archive
+
+        # ソース単位のサーキットブレーカー（Noneの場合は使用しない）
+        self.circuit_breaker = circuit_breaker
+
+        # 文字コード判定（ホストごとの判定結果を保持）
+        self.encoding_resolver = EncodingResolver(logger=logger)
+
         # データディレクトリが存在しない場合は作成
         self.data_dir.mkdir(exist_ok=True, parents=True)
         self.video_dir = self.data_dir / "video_captures"
         self.video_dir.mkdir(exist_ok=True, parents=True)
 
-        # 監視済みURLの保存ファイル
-        self.watched_file = self.data_dir / "watched_urls.json"
-
-        # 以前に取得したURLのリスト
-        self.watched_urls = self._load_watched_urls()
-
-    def _load_watched_urls(self):
-        """監視済みURLをロード"""
-        if self.watched_file.exists():
-            try:
-                with open(self.watched_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                if self.logger:
-                    self.logger.error(f"監視済みURLの読み込みエラー: {e}")
-                return {"rss": {}, "html": {}, "video": {}}
-        else:
-            return {"rss": {}, "html": {}, "video": {}}
+        # プロセス共通の監視済み状態（巡回中の保存は巡回の終わりにまとめて行う）
+        self.state = state or get_state_manager(data_dir, logger=logger)
 
-    def _save_watched_urls(self):
-        """監視済みURLを保存"""
-        try:
-            with open(self.watched_file, 'w', encoding='utf-8') as f:
-                json.dump(self.watched_urls, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            if self.logger:
-                self.logger.error(f"監視済みURLの保存エラー: {e}")
+        # 監視済みURL（索引付きのテーブルとソースごとの集合で新着判定）
+        self.seen_store = self.state.seen_store
 
     def _get_content_hash(self, content):
         """コンテンツのハッシュ値を取得"""
         return hashlib.md5(content.encode('utf-8')).hexdigest()
 
-    def _extract_video_url(self, element, base_url):
+    def _get_cached(self, url, cache_ttl=None):
+        """キャッシュを優先してGETする"""
+        if self.http_cache:
+            cached = self.http_cache.get(url)
+            if cached is not None:
+                return cached
+
+        response = self.http_client.get(url)
+        response.raise_for_status()
+
+        if self.http_cache:
+            self.http_cache.put(url, response, ttl=cache_ttl)
+
+        return response
+
+    def _extract_video_url(self, element, base_url, cache_ttl=None, backend=None):
         """ビデオURL抽出の共通処理"""
         # video要素から直接取得
         if element.name == 'video' and element.has_attr('src'):
@@ -83,10 +110,9 @@ class VideoFetcher:
 
             # リンク先ページを解析して動画URLを探す
             try:
-                response = requests.get(href, timeout=30)
-                response.raise_for_status()
-                response.encoding = response.apparent_encoding
-                soup = BeautifulSoup(response.text, 'html.parser')
+                response = self._get_cached(href, cache_ttl)
+                response.encoding = self.encoding_resolver.resolve_response(response)
+                soup = parse_html(response.text, backend, logger=self.logger)
 
                 # iframe検索
                 iframe = soup.find('iframe')
@@ -104,32 +130,48 @@ class VideoFetcher:
                     if source and source.has_attr('src'):
                         return source['src']
 
-                # JS内の動画URL検索
-                scripts = soup.find_all('script')
-                for script in scripts:
-                    if script.string:
-                        # m3u8ファイルパターン検索
-                        m3u8_matches = re.findall(r'[\'"]((https?://[^\'"\s]+\.m3u8)[^\'"]*)[\'"]', script.string)
-                        if m3u8_matches:
-                            return m3u8_matches[0][0]
-
-                        # mp4ファイルパターン検索
-                        mp4_matches = re.findall(r'[\'"]((https?://[^\'"\s]+\.mp4)[^\'"]*)[\'"]', script.string)
-                        if mp4_matches:
-                            return mp4_matches[0][0]
+                # JS内の動画URL検索（スクリプトごとにm3u8を優先）
+                for script in soup.find_all('script'):
+                    media = scan_media_urls([script.string])
+                    if media:
+                        preferred = next((m for m in media if m['format'] == 'm3u8'), media[0])
+                        from urllib.parse import urljoin
+                        return urljoin(href, preferred['url'])
             except Exception as e:
                 if self.logger:
                     self.logger.error(f"リンク先解析エラー: {href} - {e}")
 
         return None
 
-    def _process_m3u8(self, m3u8_url):
+    def _process_m3u8(self, m3u8_url, cache_ttl=None):
         """m3u8ファイルを解析して最高画質のビデオURLを取得"""
         try:
-            response = requests.get(m3u8_url, timeout=30)
-            response.raise_for_status()
+            response = self._get_cached(m3u8_url, cache_ttl)
+
+            # 同じ内容のプレイリストは解析済みの結果を使う
+            memo_key = (m3u8_url, hashlib.md5(response.content).hexdigest())
+            with self._m3u8_lock:
+                if memo_key in self._m3u8_results:
+                    self._m3u8_results.move_to_end(memo_key)
+                    return self._m3u8_results[memo_key]
+
+            result = self._select_best_playlist(m3u8_url, response.text)
+            with self._m3u8_lock:
+                self._m3u8_results[memo_key] = result
+                while len(self._m3u8_results) > self.M3U8_MEMO_SIZE:
+                    self._m3u8_results.popitem(last=False)
+            return result
 
-            m3u8_obj = m3u8.loads(response.text)
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"m3u8解析エラー: {m3u8_url} - {e}")
+
+        return m3u8_url
+
+    def _select_best_playlist(self, m3u8_url, m3u8_text):
+        """m3u8の内容から最高画質のビデオURLを選択"""
+        try:
+            m3u8_obj = m3u8.loads(m3u8_text)
 
             # プレイリストがある場合
             if m3u8_obj.playlists:
@@ -153,24 +195,67 @@ class VideoFetcher:
 
         return m3u8_url
 
+    def _resolve_video_url(self, item, base_url, cache_ttl=None, backend=None):
+        """要素から動画URLを解決（リンク先ページ・m3u8の取得を含む）"""
+        video_url = self._extract_video_url(item, base_url, cache_ttl, backend)
+
+        # m3u8ファイルの場合は処理
+        if video_url and video_url.endswith('.m3u8'):
+            video_url = self._process_m3u8(video_url, cache_ttl)
+
+        return video_url
+
+    def _resolve_video_urls(self, items, base_url, source):
+        """複数要素の動画URLを並行して解決（結果は要素の順序を維持）"""
+        workers = min(source.get('detail_workers', self.detail_workers), len(items))
+
+        # ソースごとのキャッシュ有効期間（秒）の上書き
+        cache_ttl = source.get('cache_ttl')
+
+        # リンク先ページも一覧と同じパーサーで解析
+        backend = get_source_backend(source, self.parser_backend)
+
+        if workers <= 1:
+            return [self._resolve_video_url(item, base_url, cache_ttl, backend) for item in items]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda item: self._resolve_video_url(item, base_url, cache_ttl, backend), items))
+
     def fetch(self, source):
         """動画ページから新しい動画URLを取得"""
+        return self.fetch_videos(source) or []
+
+    def fetch_videos(self, source):
+        """動画ページから新しい動画URLを取得（停止中・取得エラーの場合はNone）"""
+        # 連続して失敗しているソースは冷却期間中は取得しない
+        source_key = f"video:{source['url']}"
+        if self.circuit_breaker and not self.circuit_breaker.allow(source_key):
+            if self.logger:
+                self.logger.warning(f"停止中のソースのためスキップします: {source['name']}")
+            return None
+
         if self.logger:
             self.logger.info(f"動画URL取得開始: {source['name']} ({source['url']})")
 
         # HTMLの取得
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(source['url'], headers=headers, timeout=30)
+            response = self.http_client.get(source['url'], **get_request_limits(source))
+
+            # 取得したレスポンスを保存
+            if self.archive:
+                self.archive.store('video', source, response)
+
             response.raise_for_status()
 
+            # 取得成功を記録
+            if self.circuit_breaker:
+                self.circuit_breaker.record_success(source_key)
+
             # 文字コードを適切に設定
-            response.encoding = response.apparent_encoding
+            response.encoding = self.encoding_resolver.resolve_response(response)
 
             # HTMLの解析
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = parse_html(response.text, get_source_backend(source, self.parser_backend), logger=self.logger)
 
             # ベースURLの取得
             from urllib.parse import urlparse
@@ -186,19 +271,14 @@ class VideoFetcher:
             new_videos = []
             source_id = source['url']
 
-            # ソースIDがwatched_urlsに存在しない場合は初期化
-            if source_id not in self.watched_urls["video"]:
-                self.watched_urls["video"][source_id] = []
+            # 監視を始めたソースとして記録
+            self.seen_store.add_source("video", source_id)
 
-            for item in items:
-                # 動画URLの抽出
-                video_url = self._extract_video_url(item, base_url)
+            # 動画URLの抽出（リンク先ページの解析は並行実行）
+            video_urls = self._resolve_video_urls(items, base_url, source)
 
+            for item, video_url in zip(items, video_urls):
                 if video_url:
-                    # m3u8ファイルの場合は処理
-                    if video_url.endswith('.m3u8'):
-                        video_url = self._process_m3u8(video_url)
-
                     # タイトルの抽出
                     title = None
                     # 要素自体にタイトルがある場合
@@ -222,8 +302,8 @@ class VideoFetcher:
                         parsed_video_url = urlparse(video_url)
                         title = f"{source['name']}の動画 - {Path(parsed_video_url.path).stem}"
 
-                    # 新着判定
-                    if video_url not in self.watched_urls["video"][source_id]:
+                    # 新着判定（未監視のURLは監視済みに追加）
+                    if self.seen_store.add("video", source_id, video_url):
                         # 新着動画として追加
                         video_id = self._get_content_hash(video_url)
 
@@ -238,11 +318,8 @@ class VideoFetcher:
                             'summarize': source.get('summarize', True)
                         })
 
-                        # 監視済みURLに追加
-                        self.watched_urls["video"][source_id].append(video_url)
-
             # 監視済みURLを保存
-            self._save_watched_urls()
+            self.state.save()
 
             if self.logger:
                 self.logger.success(f"動画URL取得完了: {source['name']} - 新着{len(new_videos)}件")
@@ -250,6 +327,14 @@ class VideoFetcher:
             return new_videos
 
         except Exception as e:
+            # 送信速度制御による打ち切りはソースの障害として記録しない
+            if self.circuit_breaker and not isinstance(e, RateLimitDeadlineExceeded):
+                self.circuit_breaker.record_failure(source_key, e)
             if self.logger:
                 self.logger.error(f"動画URL取得エラー: {source['name']} - {e}")
-            return []
\ No newline at end of file
+            return None
+
+        finally:
+            # キャッシュの索引（追加したエントリ・最終アクセス時刻）をまとめて保存
+            if self.http_cache:
+                self.http_cache.save()
\ No newline at end of file
@@ -0,0 +1,264 @@
+import re
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401  BeautifulSoupのlxmlツリービルダーに必要
+except ImportError:  # pragma: no cover - lxmlは任意
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - selectolaxは任意
+    LexborHTMLParser = None
+
+
+# 既定のパーサー（標準ライブラリのみで動作）
+DEFAULT_BACKEND = 'html.parser'
+
+# 選択できるパーサー
+BACKENDS = ('html.parser', 'lxml', 'selectolax')
+
+# 利用できないパーサーを指定された場合の警告済み一覧
+_warned = set()
+
+# 部分解析に使えるセレクタの先頭部分（タグ名・id・classのみ）
+_COMPOUND_RE = re.compile(r'([a-zA-Z][\w-]*)?((?:[.#][\w-]+)*)(?=\s|>|$)')
+
+# 部分解析では事前に絞り込めない記号（属性・疑似クラス・兄弟結合子・全称・エスケープ）
+_UNSUPPORTED_CHARS = set('[]():+~*\\"\'')
+
+# 文書全体を含むため部分解析しても効果のない要素
+_ROOT_TAGS = ('html', 'body')
+
+
+def is_backend_available(backend):
+    """パーサーが利用できるか"""
+    if backend == 'html.parser':
+        return True
+    if backend == 'lxml':
+        return lxml is not None
+    if backend == 'selectolax':
+        return LexborHTMLParser is not None
+    return False
+
+
+def available_backends():
+    """利用できるパーサーの一覧"""
+    return [backend for backend in BACKENDS if is_backend_available(backend)]
+
+
+def resolve_backend(backend, logger=None):
+    """利用できるパーサー名を返す（指定がない・利用できない場合はhtml.parser）"""
+    if not backend:
+        return DEFAULT_BACKEND
+
+    if is_backend_available(backend):
+        return backend
+
+    if backend not in _warned:
+        _warned.add(backend)
+        if logger:
+            logger.warning(f"HTMLパーサー {backend} が利用できないため {DEFAULT_BACKEND} を使用します")
+
+    return DEFAULT_BACKEND
+
+
+def get_source_backend(source, default=None):
+    """ソースごとの設定（parser）を優先してパーサー名を返す"""
+    return source.get('parser') or default
+
+
+def parse_html(html_content, backend=DEFAULT_BACKEND, logger=None):
+    """HTMLを解析して文書のルートを返す（どのパーサーでもBeautifulSoupのTagと同じ操作で扱える）"""
+    backend = resolve_backend(backend, logger)
+
+    if backend == 'selectolax':
+        return SelectolaxNode(LexborHTMLParser(html_content).root)
+
+    return BeautifulSoup(html_content, backend)
+
+
+def node_key(node):
+    """要素を識別するキー（BeautifulSoupのTagは内容で比較されるため、同じ内容の別要素も区別する）"""
+    if isinstance(node, SelectolaxNode):
+        return node._node.mem_id
+    return id(node)
+
+
+def _has_classes(value, classes):
+    """class属性に指定のクラスがすべて含まれるか"""
+    if not value:
+        return False
+    names = value.split() if isinstance(value, str) else value
+    return all(cls in names for cls in classes)
+
+
+def build_strainer(selector):
+    """セレクタに一致しうる部分木だけを解析するSoupStrainerを作成（絞り込めない場合はNone）"""
+    if not selector or _UNSUPPORTED_CHARS & set(selector):
+        return None
+
+    # カンマ区切りの各セレクタの先頭部分が同じ場合のみ絞り込む
+    compounds = set()
+    for part in selector.split(','):
+        match = _COMPOUND_RE.match(part.strip())
+        if not match or not match.group(0):
+            return None
+        compounds.add((match.group(1) or '').lower() + match.group(2))
+
+    if len(compounds) != 1:
+        return None
+
+    match = _COMPOUND_RE.match(compounds.pop())
+    name, rest = match.group(1), match.group(2)
+    if name in _ROOT_TAGS:
+        return None
+
+    classes = re.findall(r'\.([\w-]+)', rest)
+    ids = re.findall(r'#([\w-]+)', rest)
+    if len(ids) > 1:
+        return None
+
+    attrs = {}
+    if classes:
+        attrs['class'] = lambda value: _has_classes(value, classes)
+    if ids:
+        attrs['id'] = ids[0]
+
+    return SoupStrainer(name, attrs)
+
+
+def select_html(html_content, selector, backend=DEFAULT_BACKEND, logger=None, partial=True):
+    """HTMLを解析してセレクタに一致する要素を返す（partialの場合はセレクタに関係する部分木だけを解析）"""
+    if not selector:
+        return []
+
+    backend = resolve_backend(backend, logger)
+
+    # selectolaxは文書全体を高速に解析できるため絞り込まない
+    strainer = build_strainer(selector) if partial and backend != 'selectolax' else None
+    if strainer is None:
+        return parse_html(html_content, backend, logger).select(selector)
+
+    return BeautifulSoup(html_content, backend, parse_only=strainer).select(selector)
+
+
+class SelectolaxNode:
+    """selectolaxのノードをBeautifulSoupのTagと同じ使い方で扱うラッパー（このプロジェクトで使う操作のみ）"""
+
+    def __init__(self, node):
+        self._node = node
+
+    def __eq__(self, other):
+        return isinstance(other, SelectolaxNode) and self._node.mem_id == other._node.mem_id
+
+    def __hash__(self):
+        return hash(self._node.mem_id)
+
+    def __str__(self):
+        return self._node.html or ''
+
+    def __getitem__(self, key):
+        value = self.attrs[key]
+        # BeautifulSoupと同様にclass属性はリストで返す
+        return value.split() if key == 'class' else value
+
+    @property
+    def name(self):
+        """タグ名"""
+        return self._node.tag
+
+    @property
+    def attrs(self):
+        """属性（値のない属性は空文字列）"""
+        return {key: value if value is not None else '' for key, value in self._node.attributes.items()}
+
+    @property
+    def parent(self):
+        """親要素"""
+        parent = self._node.parent
+        return SelectolaxNode(parent) if parent is not None else None
+
+    @property
+    def string(self):
+        """子要素を持たない場合のテキスト（script要素の中身など）"""
+        if self._node.child is None:
+            return None
+        if any(node.tag != '-text' for node in self._node.iter(include_text=True)):
+            return None
+        return self._node.text(deep=False)
+
+    def has_attr(self, key):
+        """属性を持つか"""
+        return key in self._node.attributes
+
+    def get(self, key, default=None):
+        """属性値を取得"""
+        return self[key] if self.has_attr(key) else default
+
+    def get_text(self, separator='', strip=False):
+        """配下のテキストを結合して返す"""
+        return self._node.text(deep=True, separator=separator, strip=strip)
+
+    def select(self, selector):
+        """CSSセレクタに一致する子孫要素"""
+        return [SelectolaxNode(node) for node in self._node.css(selector) if node.mem_id != self._node.mem_id]
+
+    def select_one(self, selector):
+        """CSSセレクタに一致する最初の子孫要素"""
+        matches = self.select(selector)
+        return matches[0] if matches else None
+
+    def _descendants(self):
+        """子孫要素を文書順に返す"""
+        nodes = self._node.traverse(include_text=False)
+        next(nodes, None)
+        return nodes
+
+    @property
+    def descendants(self):
+        """子孫要素（テキストは除く）"""
+        return (SelectolaxNode(node) for node in self._descendants())
+
+    def _matches(self, node, names, class_):
+        """タグ名・class属性の条件に一致するか"""
+        if names and node.tag not in names:
+            return False
+        if class_ is not None:
+            classes = (node.attributes.get('class') or '')
+            if not classes:
+                return False
+            if hasattr(class_, 'search'):
+                return any(class_.search(c) for c in classes.split()) or bool(class_.search(classes))
+            return class_ in classes.split()
+        return True
+
+    def find_all(self, name=None, class_=None):
+        """条件に一致する子孫要素を文書順に返す"""
+        names = [name] if isinstance(name, str) else name
+        return [SelectolaxNode(node) for node in self._descendants() if self._matches(node, names, class_)]
+
+    def find(self, name=None, class_=None):
+        """条件に一致する最初の子孫要素"""
+        names = [name] if isinstance(name, str) else name
+        for node in self._descendants():
+            if self._matches(node, names, class_):
+                return SelectolaxNode(node)
+        return None
+
+    def find_previous(self, name=None):
+        """文書内でこの要素より前にある、条件に一致する最後の要素"""
+        names = [name] if isinstance(name, str) else name
+
+        root = self._node
+        while root.parent is not None:
+            root = root.parent
+
+        previous = None
+        for node in root.traverse(include_text=False):
+            if node.mem_id == self._node.mem_id:
+                break
+            if self._matches(node, names, None):
+                previous = node
+
+        return SelectolaxNode(previous) if previous is not None else None
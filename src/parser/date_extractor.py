@@ -0,0 +1,108 @@
+import re
+import unicodedata
+from datetime import datetime
+from functools import lru_cache
+
+
+# 日付を含む要素のクラス名（先にあるものを優先）
+DATE_CLASSES = ('date', 'time', 'datetime', 'published', 'updated')
+
+# 和暦の元年（西暦）
+ERA_BASE_YEARS = {
+    '明治': 1868, 'M': 1868,
+    '大正': 1912, 'T': 1912,
+    '昭和': 1926, 'S': 1926,
+    '平成': 1989, 'H': 1989,
+    '令和': 2019, 'R': 2019,
+}
+
+# クラス名ごとのパターン（大文字・小文字を区別しない部分一致）
+_CLASS_PATTERNS = tuple(re.compile(cls, re.IGNORECASE) for cls in DATE_CLASSES)
+
+# 西暦（2025/5/1, 2025-05-01, 2025.5.1, 2025年5月1日）と和暦（令和7年5月1日, R7.5.1）の日付と、続く時刻
+_DATE_RE = re.compile(
+    r'(?:(?<![A-Za-z])(?P<era>明治|大正|昭和|平成|令和|[MTSHR])\s*(?P<era_year>\d{1,2}|元)\s*[年.]\s*'
+    r'(?P<era_month>\d{1,2})\s*[月.]\s*(?P<era_day>\d{1,2})(?!\d)日?'
+    r'|(?<!\d)(?P<year>\d{4})\s*[年/.\-]\s*(?P<month>\d{1,2})\s*[月/.\-]\s*(?P<day>\d{1,2})(?!\d)日?)'
+    r'(?:(?:T|\s*(?:\([^)]{1,3}\))?\s*)(?P<hour>\d{1,2})\s*[:時]\s*(?P<minute>\d{1,2})(?:\s*:\s*(?P<second>\d{2}))?)?'
+)
+
+
+@lru_cache(maxsize=4096)
+def _class_priorities(class_value):
+    """class属性に一致する日付クラスの優先順位"""
+    return tuple(i for i, pattern in enumerate(_CLASS_PATTERNS) if pattern.search(class_value))
+
+
+@lru_cache(maxsize=4096)
+def normalize_date(text):
+    """文字列中の最初の日付を「YYYY-MM-DD HH:MM:SS」形式に変換（見つからない場合はNone）"""
+    if not text:
+        return None
+
+    # 全角数字・㋿などの合字を半角・通常の文字に変換
+    for match in _DATE_RE.finditer(unicodedata.normalize('NFKC', text)):
+        if match.group('era'):
+            era_year = match.group('era_year')
+            year = ERA_BASE_YEARS[match.group('era')] + (1 if era_year == '元' else int(era_year)) - 1
+            month, day = match.group('era_month'), match.group('era_day')
+        else:
+            year, month, day = match.group('year'), match.group('month'), match.group('day')
+
+        # 存在しない日付（2月30日など）は次の候補を探す
+        try:
+            return datetime(
+                int(year), int(month), int(day),
+                int(match.group('hour') or 0), int(match.group('minute') or 0), int(match.group('second') or 0)
+            ).isoformat(sep=' ')
+        except ValueError:
+            continue
+
+    return None
+
+
+def _iter_tags(element):
+    """子孫要素を文書順に返す（テキストは除く）"""
+    return (node for node in element.descendants if node.name)
+
+
+class DateExtractor:
+    """一覧の要素から公開日を抽出するクラス"""
+
+    def extract(self, element):
+        """要素から日付を抽出して「YYYY-MM-DD HH:MM:SS」形式で返す（見つからない場合はNone）"""
+        # 子孫要素を1回だけ走査し、クラスごとの最初の要素と最初のtime要素を記録
+        candidates = [None] * len(DATE_CLASSES)
+        time_element = None
+
+        for node in _iter_tags(element):
+            classes = node.get('class')
+            if classes:
+                for priority in _class_priorities(' '.join(classes)):
+                    if candidates[priority] is None:
+                        candidates[priority] = node
+
+                # 最優先のクラスの要素が日付であればそれ以上探さない
+                if candidates[0] is node:
+                    date = normalize_date(node.get_text(strip=True))
+                    if date:
+                        return date
+
+            if time_element is None and node.name == 'time':
+                time_element = node
+
+        # クラスで探す
+        for node in candidates:
+            if node is not None:
+                date = normalize_date(node.get_text(strip=True))
+                if date:
+                    return date
+
+        # time要素で探す
+        if time_element is not None:
+            date = normalize_date(time_element.get('datetime')) or normalize_date(time_element.get_text(strip=True))
+            if date:
+                return date
+
+        # 要素のテキストから日付形式の文字列を探す
+        return normalize_date(element.get_text())
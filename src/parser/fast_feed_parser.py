@@ -0,0 +1,285 @@
+import calendar
+import re
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_tz, mktime_tz
+from urllib.parse import urljoin
+
+import feedparser
+
+from src.utils.encoding import normalize_encoding
+
+
+# 名前空間
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+RDF_NS = '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}'
+RSS10_NS = '{http://purl.org/rss/1.0/}'
+RSS090_NS = '{http://my.netscape.com/rdf/simple/0.9/}'
+DC_NS = '{http://purl.org/dc/elements/1.1/}'
+CONTENT_NS = '{http://purl.org/rss/1.0/modules/content/}'
+
+# 相対URLの基準を指定する属性
+XML_BASE = '{http://www.w3.org/XML/1998/namespace}base'
+
+# 一度に解析器へ渡すバイト数
+CHUNK_SIZE = 64 * 1024
+
+# Content-Typeヘッダーのcharset
+_HEADER_CHARSET = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+
+# XML宣言のencoding
+_XML_ENCODING = re.compile(rb'^\s*<\?xml[^>]+encoding\s*=\s*["\']([\w.:-]+)', re.IGNORECASE)
+
+# alternateリンクとして扱うtype属性
+_HTML_TYPES = ('text/html', 'application/xhtml+xml')
+
+
+class FeedParseError(Exception):
+    """フィードを解析できない場合の例外（feedparserでもエントリを取得できない場合）"""
+
+
+class _UnsupportedFeed(Exception):
+    """高速解析の対象外の形式（feedparserで解析し直す）"""
+
+
+def _parse_date(value):
+    """RFC 822・W3C-DTF形式の日時をUTCのstruct_timeに変換（feedparserの*_parsedと同じ形式）"""
+    if not value:
+        return None
+
+    value = value.strip()
+
+    # RFC 822（RSS 2.0のpubDate）
+    parsed = parsedate_tz(value)
+    if parsed:
+        try:
+            return time.gmtime(mktime_tz(parsed))
+        except (OverflowError, ValueError):
+            return None
+
+    # W3C-DTF（Atom・dc:date）。タイムゾーンがない場合はUTCとして扱う
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00').replace('z', '+00:00'))
+    except ValueError:
+        return None
+
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return time.gmtime(calendar.timegm(dt.utctimetuple()))
+
+
+def _element_base(base, element):
+    """要素のxml:baseを反映した相対URLの基準"""
+    xml_base = element.get(XML_BASE)
+    if xml_base:
+        return urljoin(base or '', xml_base.strip())
+    return base
+
+
+def _resolve(base, element, url):
+    """要素の中の相対URLを解決（基準がない場合はそのまま返す）"""
+    base = _element_base(base, element)
+    return urljoin(base, url) if base else url
+
+
+def _text(element):
+    """要素の中のテキスト（前後の空白を除く）"""
+    if element is None:
+        return None
+    return ''.join(element.itertext()).strip()
+
+
+class FastFeedParser:
+    """整形式のRSS 2.0/RDF(RSS 1.0)/Atomを逐次解析し、必要な項目だけを持つエントリを返すクラス"""
+
+    # 形式ごとのエントリ要素
+    ITEM_TAGS = {
+        'rss': ('item',),
+        'rdf': (RSS10_NS + 'item', RSS090_NS + 'item'),
+        'atom': (ATOM_NS + 'entry',),
+    }
+
+    def __init__(self, logger=None):
+        self.logger = logger
+
+    def _get_encoding(self, content, response_headers):
+        """文字コードを決定（Content-Typeヘッダー・XML宣言の順、なければUTF-8）"""
+        headers = {k.lower(): v for k, v in (response_headers or {}).items()}
+        match = _HEADER_CHARSET.search(headers.get('content-type', ''))
+        if match:
+            return normalize_encoding(match.group(1))
+
+        match = _XML_ENCODING.match(content[:256])
+        if match:
+            return normalize_encoding(match.group(1))
+
+        return 'utf-8'
+
+    def _iter_chunks(self, content, response_headers):
+        """解析器に渡すデータを分割して返す（UTF-8以外は文字列に変換して渡す）"""
+        if isinstance(content, bytes):
+            encoding = self._get_encoding(content, response_headers)
+            if encoding is None:
+                raise _UnsupportedFeed("不明な文字コード")
+
+            # UTF-8（BOM付きを含む）はそのまま渡し、それ以外はPythonで文字列に変換（expatはShift_JIS等を扱えない）
+            declared = _XML_ENCODING.match(content[:256])
+            if encoding not in ('utf-8', 'utf-8-sig') or (declared and normalize_encoding(declared.group(1)) != 'utf-8'):
+                content = content.decode(encoding)
+
+        for start in range(0, len(content), CHUNK_SIZE):
+            yield content[start:start + CHUNK_SIZE]
+
+    def _iter_elements(self, content, response_headers, base_url=None):
+        """エントリ要素（item/entry）の終了ごとに (形式, 要素, 相対URLの基準) を返し、返した要素は木から外す"""
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        stack = []
+        bases = []
+        feed_type = None
+
+        for chunk in self._iter_chunks(content, response_headers):
+            parser.feed(chunk)
+
+            for event, element in parser.read_events():
+                if event == 'start':
+                    if feed_type is None:
+                        feed_type = self._detect_type(element)
+                    stack.append(element)
+                    bases.append(_element_base(bases[-1] if bases else base_url, element))
+                    continue
+
+                stack.pop()
+                base = bases.pop()
+                if element.tag in self.ITEM_TAGS[feed_type]:
+                    yield feed_type, element, base
+
+                    # 解析済みのエントリは保持しない
+                    if stack:
+                        stack[-1].remove(element)
+
+        parser.close()
+
+    def _detect_type(self, root):
+        """ルート要素からフィードの形式を判定"""
+        if root.tag == 'rss':
+            return 'rss'
+        if root.tag == RDF_NS + 'RDF':
+            return 'rdf'
+        if root.tag == ATOM_NS + 'feed':
+            return 'atom'
+        raise _UnsupportedFeed(f"対象外のルート要素: {root.tag}")
+
+    def _rss_entry(self, item, ns='', base=None):
+        """RSS 2.0/RDFのitem要素からエントリを作成（相対URLのリンクはbaseを基準に解決）"""
+        entry = {}
+
+        title = _text(item.find(ns + 'title'))
+        if title is not None:
+            entry['title'] = title
+
+        link_element = item.find(ns + 'link')
+        link = _text(link_element)
+        if link:
+            entry['link'] = _resolve(base, link_element, link)
+
+        guid = item.find('guid')
+        if guid is not None and _text(guid):
+            entry['id'] = _text(guid)
+            # isPermaLinkがtrue（既定）のguidはURLとして解決し、リンクとしても使う（feedparserと同じ）
+            if guid.get('isPermaLink', 'true').lower() == 'true':
+                entry['id'] = _resolve(base, guid, entry['id'])
+                entry.setdefault('link', entry['id'])
+        elif item.get(RDF_NS + 'about'):
+            entry['id'] = item.get(RDF_NS + 'about')
+
+        description = _text(item.find(ns + 'description'))
+        if description is None:
+            description = _text(item.find(CONTENT_NS + 'encoded'))
+        if description is not None:
+            entry['summary'] = entry['description'] = description
+
+        published = _parse_date(_text(item.find('pubDate')))
+        if published:
+            entry['published_parsed'] = published
+
+        updated = _parse_date(_text(item.find(DC_NS + 'date')))
+        if updated:
+            entry['updated_parsed'] = updated
+
+        return entry
+
+    def _atom_entry(self, item, base=None):
+        """Atomのentry要素からエントリを作成（相対URLのリンク・IDはxml:baseとbaseを基準に解決）"""
+        entry = {}
+
+        title = item.find(ATOM_NS + 'title')
+        if title is not None:
+            if title.get('type', 'text') not in ('text', 'html'):
+                raise _UnsupportedFeed("XHTML形式のタイトル")
+            entry['title'] = _text(title)
+
+        for link in item.findall(ATOM_NS + 'link'):
+            if link.get('rel', 'alternate') == 'alternate' and link.get('type', 'text/html') in _HTML_TYPES:
+                href = (link.get('href') or '').strip()
+                entry['link'] = _resolve(base, link, href) if href else href
+                break
+
+        id_element = item.find(ATOM_NS + 'id')
+        entry_id = _text(id_element)
+        if entry_id:
+            entry['id'] = _resolve(base, id_element, entry_id)
+            # alternateリンクがない場合はIDをリンクとして使う（feedparserと同じ）
+            entry.setdefault('link', entry['id'])
+
+        # summaryがない場合はcontentを使う（feedparserと同じ）
+        summary = item.find(ATOM_NS + 'summary')
+        if summary is None:
+            summary = item.find(ATOM_NS + 'content')
+        if summary is not None and summary.get('type', 'text') in ('text', 'html'):
+            entry['summary'] = entry['description'] = _text(summary)
+
+        published = _parse_date(_text(item.find(ATOM_NS + 'published')))
+        if published:
+            entry['published_parsed'] = published
+
+        updated = _parse_date(_text(item.find(ATOM_NS + 'updated')))
+        if updated:
+            entry['updated_parsed'] = updated
+
+        return entry
+
+    def _make_entry(self, feed_type, element, base=None):
+        """形式に応じてエントリを作成"""
+        if feed_type == 'rss':
+            return self._rss_entry(element, base=base)
+        if feed_type == 'rdf':
+            return self._rss_entry(element, ns=element.tag[:element.tag.index('}') + 1], base=base)
+        return self._atom_entry(element, base=base)
+
+    def iter_entries(self, content, response_headers=None, fast=True, base_url=None):
+        """フィードのエントリを逐次返す（相対URLはbase_urlを基準に解決。整形式でない場合・fastがFalseの場合はfeedparserで解析）"""
+        yielded = 0
+
+        # feedparserはContent-Locationを相対URLの基準にする
+        if base_url:
+            response_headers = dict(response_headers or {}, **{'content-location': base_url})
+
+        if fast:
+            try:
+                for feed_type, element, base in self._iter_elements(content, response_headers, base_url):
+                    yield self._make_entry(feed_type, element, base)
+                    yielded += 1
+                return
+            except (ET.ParseError, _UnsupportedFeed, LookupError, UnicodeDecodeError) as e:
+                if self.logger:
+                    self.logger.debug(f"高速解析できないためfeedparserで解析します: {e}")
+
+        feed = feedparser.parse(content, response_headers=response_headers)
+
+        if feed.bozo and not feed.entries:
+            raise FeedParseError(feed.bozo_exception)
+
+        # 高速解析で返したエントリの続きから返す
+        for entry in feed.entries[yielded:]:
+            yield entry
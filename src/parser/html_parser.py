@@ -1,71 +1,37 @@
-from bs4 import BeautifulSoup
-import re
+import hashlib
 from datetime import datetime
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urljoin, urlparse
+
+from src.parser.backends import parse_html, select_html
+from src.parser.date_extractor import DateExtractor
 
 
 class HTMLParser:
     """HTMLページの解析を行うクラス"""
 
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, backend=None, partial_parse=True):
         self.logger = logger
 
-    def parse(self, html_content, source_url, selector=None, source_name=""):
-        """HTMLを解析してエントリのリストを返す"""
+        # HTMLパーサー（html.parser / lxml / selectolax）
+        self.backend = backend
+
+        # セレクタに関係する部分だけを解析するか
+        self.partial_parse = partial_parse
+
+        # 日付の抽出
+        self.date_extractor = DateExtractor()
+
+    def parse(self, html_content, source_url, selector=None, source_name="", backend=None):
+        """HTMLを解析してエントリのリストを返す（backendでソースごとにパーサーを上書き）"""
         try:
             if self.logger:
                 self.logger.info(f"HTMLパース開始: {source_name}")
 
-            # BeautifulSoupで解析
-            soup = BeautifulSoup(html_content, 'html.parser')
-
-            # ベースURLの取得
-            parsed_url = urlparse(source_url)
-            base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-
-            # セレクタが指定されている場合はそれに従って要素を抽出
-            elements = []
-            if selector:
-                elements = soup.select(selector)
+            # 指定のパーサーで解析してセレクタに一致する要素を抽出（セレクタがない場合は空）
+            elements = select_html(html_content, selector, backend or self.backend, logger=self.logger, partial=self.partial_parse)
 
             # エントリのリスト
-            entries = []
-
-            for element in elements:
-                # タイトルの抽出
-                title = element.get_text(strip=True)
-
-                # リンクの抽出
-                link = None
-                a_tag = element.find('a')
-                if a_tag and a_tag.has_attr('href'):
-                    link_url = a_tag['href']
-
-                    # 相対URLを絶対URLに変換
-                    if not link_url.startswith(('http://', 'https://')):
-                        if link_url.startswith('/'):
-                            link_url = base_url + link_url
-                        else:
-                            link_url = urljoin(source_url, link_url)
-
-                    link = link_url
-
-                # 日付の抽出
-                date_str = self._extract_date(element)
-                if date_str:
-                    published = date_str
-                else:
-                    published = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-                # エントリデータの構築
-                entry_data = {
-                    'title': title,
-                    'link': link or source_url,
-                    'published': published,
-                    'source': source_name
-                }
-
-                entries.append(entry_data)
+            entries = [self.build_entry(element, source_url, source_name) for element in elements]
 
             if self.logger:
                 self.logger.success(f"HTMLパース完了: {source_name} - {len(entries)}件")
@@ -77,43 +43,58 @@ class HTMLParser:
                 self.logger.error(f"HTMLパース例外: {source_name} - {e}")
             return []
 
+    def build_entry(self, element, source_url, source_name="", extract_date=True):
+        """セレクタに一致した要素から通知・保存用のエントリデータを作成（extract_dateがFalseの場合は公開日を現在時刻にする）"""
+        # タイトルの抽出
+        title = element.get_text(strip=True)
+
+        # リンクの抽出
+        a_tag = element.find('a')
+        if a_tag and a_tag.has_attr('href'):
+            link = a_tag['href']
+
+            # 相対URLを絶対URLに変換
+            if not link.startswith(('http://', 'https://')):
+                link = urljoin(source_url, link)
+        else:
+            # リンクがない場合は要素のハッシュ値をIDとして使用
+            link = source_url + '#' + hashlib.md5(title.encode('utf-8')).hexdigest()
+
+        # 日付の抽出
+        published = (extract_date and self._extract_date(element)) or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        return {
+            'title': title,
+            'link': link,
+            'published': published,
+            'source': source_name
+        }
+
+    def legacy_link(self, element, source_url):
+        """以前の形式のリンク（"/"で始まるhrefだけをホストに連結し、他の相対URLはそのまま）を返す（build_entryと同じ場合はNone）"""
+        a_tag = element.find('a')
+        if not a_tag or not a_tag.has_attr('href'):
+            return None
+
+        href = a_tag['href']
+        if href.startswith(('http://', 'https://')):
+            return None
+
+        legacy = href
+        if href.startswith('/'):
+            parsed_url = urlparse(source_url)
+            legacy = f"{parsed_url.scheme}://{parsed_url.netloc}{href}"
+
+        return legacy if legacy != urljoin(source_url, href) else None
+
     def _extract_date(self, element):
-        """要素から日付を抽出"""
-        # 日付を含むクラス名や要素を探す
-        date_classes = ['date', 'time', 'datetime', 'published', 'updated']
-
-        # クラスで探す
-        for cls in date_classes:
-            date_element = element.find(class_=re.compile(cls, re.IGNORECASE))
-            if date_element:
-                return date_element.get_text(strip=True)
-
-        # time要素で探す
-        time_element = element.find('time')
-        if time_element:
-            if time_element.has_attr('datetime'):
-                return time_element['datetime']
-            return time_element.get_text(strip=True)
-
-        # 日付形式の文字列を探す
-        text = element.get_text()
-
-        # YYYY/MM/DD または YYYY-MM-DD 形式を探す
-        date_match = re.search(r'\d{4}[/-]\d{1,2}[/-]\d{1,2}', text)
-        if date_match:
-            return date_match.group(0)
-
-        # YYYY年MM月DD日 形式を探す
-        date_match = re.search(r'\d{4}年\d{1,2}月\d{1,2}日', text)
-        if date_match:
-            return date_match.group(0)
-
-        return None
+        """要素から日付を抽出（「YYYY-MM-DD HH:MM:SS」形式）"""
+        return self.date_extractor.extract(element)
 
     def extract_page_title(self, html_content):
         """ページタイトルを抽出"""
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = parse_html(html_content, self.backend, logger=self.logger)
             title_tag = soup.find('title')
 
             if title_tag:
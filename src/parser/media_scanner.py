@@ -0,0 +1,75 @@
+import json
+import re
+
+
+# 検出する動画ファイルの形式
+MEDIA_FORMATS = ('m3u8', 'mp4', 'mov')
+
+# いずれかを含まないスクリプトは走査しない
+_MEDIA_HINTS = tuple(f'.{fmt}' for fmt in MEDIA_FORMATS)
+
+# url: "..." 形式のキー（JSON・JavaScriptのオブジェクト）と、引用符で囲まれた絶対URLを1回の走査で探す
+# （キーを先に試すため、キーの値になっている絶対URLは二重に検出しない）
+_MEDIA_RE = re.compile(
+    r'''\burl["']?\s*:\s*(?P<key_quote>["'])(?P<key_url>[^"'\s]+?\.(?P<key_format>m3u8|mp4|mov)(?!\w)[^"']*)(?P=key_quote)'''
+    r'''|(?P<quote>["'])(?P<url>https?:(?:\\?/){2}[^"'\s]+?\.(?P<format>m3u8|mp4|mov)(?!\w)[^"']*)(?P=quote)'''
+)
+
+# オブジェクト内のtitleキー
+_TITLE_RE = re.compile(r'''\btitle["']?\s*:\s*(["'])((?:\\.|(?!\1).)*)\1''')
+
+
+def has_media_hint(text):
+    """動画ファイルの拡張子を含む可能性があるか"""
+    return bool(text) and any(hint in text for hint in _MEDIA_HINTS)
+
+
+def _unescape(value):
+    """JavaScriptのエスケープ（\\/ や \\uXXXX）を戻す"""
+    if '\\' not in value:
+        return value
+    try:
+        return json.loads(f'"{value}"')
+    except ValueError:
+        return value.replace('\\/', '/')
+
+
+def _find_title(text, start, end):
+    """url:キーを囲むオブジェクト（入れ子のないもの）からtitleを取得"""
+    open_brace = text.rfind('{', 0, start)
+    close_brace = text.find('}', end)
+    if open_brace == -1 or close_brace == -1:
+        return None
+    if '}' in text[open_brace:start] or '{' in text[end:close_brace]:
+        return None
+
+    match = _TITLE_RE.search(text, open_brace, close_brace)
+    return _unescape(match.group(2)) if match else None
+
+
+def iter_media_urls(text):
+    """スクリプト中の動画URLを出現順に返す（{'url', 'format'[, 'title']}）"""
+    if not has_media_hint(text):
+        return
+
+    for match in _MEDIA_RE.finditer(text):
+        if match.group('key_url'):
+            media = {'url': _unescape(match.group('key_url')), 'format': match.group('key_format')}
+            title = _find_title(text, match.start(), match.end())
+            if title:
+                media['title'] = title
+        else:
+            media = {'url': _unescape(match.group('url')), 'format': match.group('format')}
+        yield media
+
+
+def scan_media_urls(texts):
+    """複数のスクリプトの動画URLを重複なく出現順に返す（動画の拡張子を含まないものは走査しない）"""
+    results = {}
+    for text in texts:
+        for media in iter_media_urls(text):
+            if media['url'] not in results:
+                results[media['url']] = media
+            elif 'title' in media:
+                results[media['url']].setdefault('title', media['title'])
+    return list(results.values())
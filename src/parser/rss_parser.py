@@ -1,6 +1,8 @@
 from datetime import datetime
 import feedparser
 
+from src.parser.fast_feed_parser import FastFeedParser, FeedParseError
+
 
 class RSSParser:
     """RSSフィードの解析を行うクラス"""
@@ -8,58 +10,64 @@ class RSSParser:
     def __init__(self, logger=None):
         self.logger = logger
 
-    def parse(self, feed_content, source_name=""):
-        """RSSフィードを解析してエントリのリストを返す"""
+        # 整形式のフィードを逐次解析するパーサー（それ以外はfeedparserで解析）
+        self.feed_parser = FastFeedParser(logger=logger)
+
+    def parse(self, feed_content, source_name="", response_headers=None, base_url=None):
+        """RSSフィードを解析してエントリのリストを返す（相対URLのリンクはbase_urlを基準に解決）"""
         try:
             if self.logger:
                 self.logger.info(f"RSSパース開始: {source_name}")
 
-            # 文字列の場合はfeedparserで解析
-            if isinstance(feed_content, str):
-                feed = feedparser.parse(feed_content)
+            # 文字列・バイト列の場合は逐次解析し、feedparserの解析結果の場合はそのまま使う
+            if isinstance(feed_content, (str, bytes)):
+                feed_entries = self.feed_parser.iter_entries(feed_content, response_headers=response_headers, base_url=base_url)
             else:
-                feed = feed_content
-
-            # パース失敗の場合
-            if feed.bozo and not feed.entries:
-                if self.logger:
-                    self.logger.error(f"RSSパースエラー: {source_name} - {feed.bozo_exception}")
-                return []
+                # パース失敗の場合
+                if feed_content.bozo and not feed_content.entries:
+                    raise FeedParseError(feed_content.bozo_exception)
+                feed_entries = feed_content.entries
 
             entries = []
 
-            for entry in feed.entries:
-                # エントリのURLまたはIDを取得
-                entry_id = entry.get('link', entry.get('id', ''))
-
-                # 公開日時の取得と変換
-                published = entry.get('published_parsed') or entry.get('updated_parsed')
-                if published:
-                    published_date = datetime(*published[:6]).strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    published_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-                # エントリデータの構築
-                entry_data = {
-                    'title': entry.get('title', 'タイトルなし'),
-                    'link': entry_id,
-                    'published': published_date,
-                    'source': source_name,
-                    'description': entry.get('description', entry.get('summary', ''))
-                }
-
-                entries.append(entry_data)
+            for entry in feed_entries:
+                entries.append(self.build_entry(entry, source_name))
 
             if self.logger:
                 self.logger.success(f"RSSパース完了: {source_name} - {len(entries)}件")
 
             return entries
 
+        except FeedParseError as e:
+            if self.logger:
+                self.logger.error(f"RSSパースエラー: {source_name} - {e}")
+            return []
+
         except Exception as e:
             if self.logger:
                 self.logger.error(f"RSSパース例外: {source_name} - {e}")
             return []
 
+    def build_entry(self, entry, source_name=""):
+        """フィードのエントリから通知・保存用のエントリデータを作成"""
+        # エントリのURLまたはIDを取得
+        entry_id = entry.get('link', entry.get('id', ''))
+
+        # 公開日時の取得と変換
+        published = entry.get('published_parsed') or entry.get('updated_parsed')
+        if published:
+            published_date = datetime(*published[:6]).strftime('%Y-%m-%d %H:%M:%S')
+        else:
+            published_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        return {
+            'title': entry.get('title', 'タイトルなし'),
+            'link': entry_id,
+            'published': published_date,
+            'source': source_name,
+            'description': entry.get('description', entry.get('summary', ''))
+        }
+
     def extract_feed_metadata(self, feed_content):
         """フィードのメタデータを抽出"""
         try:
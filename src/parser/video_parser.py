@@ -1,24 +1,93 @@
-from bs4 import BeautifulSoup
 import re
-import json
+from bisect import bisect_left, bisect_right
 from urllib.parse import urlparse, urljoin
 import m3u8
 
+from src.parser.backends import parse_html, node_key
+from src.parser.media_scanner import scan_media_urls
+
+
+# タイトルを探す見出し（先にあるものを優先）
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+
+class HeadingIndex:
+    """文書内の要素の順番と見出しの位置の索引（最初の検索時に1回だけ作成）"""
+
+    def __init__(self, soup):
+        self.soup = soup
+        self._positions = None
+        self._headings = None
+
+    def _build(self):
+        """文書順に要素を1回だけたどって索引を作成"""
+        self._positions = {}
+        self._headings = {tag: ([], []) for tag in HEADING_TAGS}
+
+        for node in self.soup.descendants:
+            # テキストノードは除く
+            if node.name is None:
+                continue
+            position = len(self._positions)
+            self._positions[node_key(node)] = position
+            if node.name in self._headings:
+                positions, headings = self._headings[node.name]
+                positions.append(position)
+                headings.append(node)
+
+    def _position(self, element):
+        """文書内の順番（文書全体・索引にない要素は-1）"""
+        if self._positions is None:
+            self._build()
+        return self._positions.get(node_key(element), -1)
+
+    def first_within(self, parent, tag):
+        """parent内で最初のtagの見出し（parent.find(tag)と同じ）"""
+        start = self._position(parent)
+        positions, headings = self._headings[tag]
+        index = bisect_right(positions, start)
+        if index == len(headings):
+            return None
+
+        heading = headings[index]
+        # 文書全体の場合は祖先を確かめない
+        if start < 0:
+            return heading
+
+        # parentより後の最初の見出しがparentの子孫でなければ、parent内にtagの見出しはない
+        key = node_key(parent)
+        ancestor = heading.parent
+        while ancestor is not None and self._position(ancestor) >= start:
+            if node_key(ancestor) == key:
+                return heading
+            ancestor = ancestor.parent
+        return None
+
+    def nearest_before(self, element, tag):
+        """elementより前で最も近いtagの見出し（element.find_previous(tag)と同じ）"""
+        position = self._position(element)
+        positions, headings = self._headings[tag]
+        index = bisect_left(positions, position)
+        return headings[index - 1] if index > 0 else None
+
 
 class VideoParser:
     """動画ページとm3u8ファイルの解析を行うクラス"""
 
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, backend=None):
         self.logger = logger
 
-    def parse_video_page(self, html_content, source_url, video_selector=None, source_name=""):
-        """動画ページを解析して動画情報を抽出"""
+        # HTMLパーサー（html.parser / lxml / selectolax）
+        self.backend = backend
+
+    def parse_video_page(self, html_content, source_url, video_selector=None, source_name="", backend=None):
+        """動画ページを解析して動画情報を抽出（backendでソースごとにパーサーを上書き）"""
         try:
             if self.logger:
                 self.logger.info(f"動画ページ解析開始: {source_name}")
 
-            # BeautifulSoupで解析
-            soup = BeautifulSoup(html_content, 'html.parser')
+            # 指定のパーサーで解析
+            soup = parse_html(html_content, backend or self.backend, logger=self.logger)
 
             # ベースURLの取得
             parsed_url = urlparse(source_url)
@@ -32,13 +101,16 @@ class VideoParser:
             # 動画情報のリスト
             videos = []
 
+            # タイトルを探す見出しの索引（文書ごとに1回だけ作成）
+            headings = HeadingIndex(soup)
+
             for element in video_elements:
                 # 動画URLの抽出
                 video_url = self._extract_video_url(element, base_url, source_url)
 
                 if video_url:
                     # タイトルの抽出
-                    title = self._extract_video_title(element, soup)
+                    title = self._extract_video_title(element, soup, headings)
 
                     # 動画情報の構築
                     video_info = {
@@ -57,7 +129,7 @@ class VideoParser:
                     video_url = self._extract_video_url(video, base_url, source_url)
 
                     if video_url:
-                        title = self._extract_video_title(video, soup)
+                        title = self._extract_video_title(video, soup, headings)
 
                         video_info = {
                             'url': video_url,
@@ -75,7 +147,7 @@ class VideoParser:
 
                         # YouTubeなどの埋め込み動画
                         if 'youtube.com' in iframe_src or 'youtu.be' in iframe_src or 'vimeo.com' in iframe_src:
-                            title = self._extract_video_title(iframe, soup)
+                            title = self._extract_video_title(iframe, soup, headings)
 
                             video_info = {
                                 'url': iframe_src,
@@ -142,24 +214,25 @@ class VideoParser:
 
         return url
 
-    def _extract_video_title(self, element, soup):
-        """動画のタイトルを抽出"""
+    def _extract_video_title(self, element, soup, headings=None):
+        """動画のタイトルを抽出（headingsは文書ごとの見出しの索引）"""
         # 要素自体にタイトルがある場合
         if element.get_text(strip=True):
             return element.get_text(strip=True)
 
         # 親要素または兄弟要素からタイトルを探す
         parent = element.parent
+        headings = headings or HeadingIndex(soup)
 
         # 見出し要素を探す
-        for heading_tag in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
+        for heading_tag in HEADING_TAGS:
             # 親要素内の見出し
-            heading = parent.find(heading_tag)
+            heading = headings.first_within(parent, heading_tag)
             if heading:
                 return heading.get_text(strip=True)
 
             # 近くの見出し
-            prev_heading = element.find_previous(heading_tag)
+            prev_heading = headings.nearest_before(element, heading_tag)
             if prev_heading:
                 return prev_heading.get_text(strip=True)
 
@@ -171,50 +244,15 @@ class VideoParser:
         return None
 
     def _extract_videos_from_js(self, soup, base_url):
-        """JavaScriptから動画URLを抽出"""
+        """JavaScriptから動画URLを抽出（全スクリプトを1回ずつ走査し、重複は除く）"""
         videos = []
 
-        scripts = soup.find_all('script')
-        for script in scripts:
-            if not script.string:
-                continue
-
-            # m3u8ファイルパターン検索
-            m3u8_matches = re.findall(r'[\'"]((https?://[^\'"\s]+\.m3u8)[^\'"]*)[\'"]', script.string)
-            for match in m3u8_matches:
-                videos.append({
-                    'url': match[0],
-                    'title': f"m3u8動画 {len(videos)+1}",
-                    'format': 'm3u8'
-                })
-
-            # mp4ファイルパターン検索
-            mp4_matches = re.findall(r'[\'"]((https?://[^\'"\s]+\.mp4)[^\'"]*)[\'"]', script.string)
-            for match in mp4_matches:
-                videos.append({
-                    'url': match[0],
-                    'title': f"mp4動画 {len(videos)+1}",
-                    'format': 'mp4'
-                })
-
-            # JSON文字列を探す
-            json_objects = re.findall(r'({[^{}]*"url"[^{}]*})', script.string)
-            for json_obj in json_objects:
-                try:
-                    # JSON文字列の修正（JavaScript -> JSON）
-                    json_str = re.sub(r'([{,])\s*(\w+):', r'\1"\2":', json_obj)
-                    data = json.loads(json_str)
-
-                    if 'url' in data:
-                        url = data['url']
-                        if isinstance(url, str) and (url.endswith('.mp4') or url.endswith('.m3u8')):
-                            videos.append({
-                                'url': url,
-                                'title': data.get('title', f"JSON動画 {len(videos)+1}"),
-                                'format': url.split('.')[-1]
-                            })
-                except Exception:
-                    pass
+        for media in scan_media_urls(script.string for script in soup.find_all('script')):
+            videos.append({
+                'url': media['url'],
+                'title': media.get('title') or f"{media['format']}動画 {len(videos)+1}",
+                'format': media['format']
+            })
 
         return videos
 
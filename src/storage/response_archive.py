@@ -0,0 +1,169 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from datetime import datetime
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstd圧縮は任意
+    zstandard = None
+
+
+class ResponseArchive:
+    """取得したレスポンス本文を内容ハッシュ単位で圧縮保存し、取得履歴を索引に記録するクラス"""
+
+    # 圧縮形式と拡張子
+    EXTENSIONS = {'zstd': '.zst', 'gzip': '.gz'}
+
+    def __init__(self, archive_dir, compression="auto", logger=None):
+        self.archive_dir = Path(archive_dir)
+        self.logger = logger
+
+        # 圧縮形式（autoの場合はzstandardがあればzstd、なければgzip）
+        if compression == "auto":
+            compression = "zstd" if zstandard is not None else "gzip"
+        if compression == "zstd" and zstandard is None:
+            if self.logger:
+                self.logger.warning("zstandardがインストールされていないためgzipで保存します")
+            compression = "gzip"
+        self.compression = compression
+
+        # 本文ファイルのディレクトリ
+        self.objects_dir = self.archive_dir / "objects"
+        self.objects_dir.mkdir(exist_ok=True, parents=True)
+
+        # 取得履歴の索引（1行1件のJSON）
+        self.index_file = self.archive_dir / "index.jsonl"
+
+        self._lock = threading.Lock()
+
+    def _get_object_path(self, content_hash, compression):
+        """本文ファイルのパス（先頭2文字でディレクトリを分ける）"""
+        return self.objects_dir / content_hash[:2] / f"{content_hash}{self.EXTENSIONS[compression]}"
+
+    def _find_object(self, content_hash):
+        """保存済みの本文ファイルを探す"""
+        for compression in self.EXTENSIONS:
+            path = self._get_object_path(content_hash, compression)
+            if path.exists():
+                return path, compression
+        return None, None
+
+    def _compress(self, body):
+        """本文を圧縮"""
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor(level=10).compress(body)
+        return gzip.compress(body, compresslevel=6)
+
+    def _write_object(self, content_hash, body):
+        """本文を保存（同じ内容が保存済みなら何もしない）"""
+        path, _ = self._find_object(content_hash)
+        if path:
+            return False
+
+        path = self._get_object_path(content_hash, self.compression)
+        path.parent.mkdir(exist_ok=True)
+        with tempfile.NamedTemporaryFile('wb', dir=path.parent, suffix='.tmp', delete=False) as f:
+            f.write(self._compress(body))
+            temp_path = f.name
+        os.replace(temp_path, path)
+        return True
+
+    def store(self, source_type, source, response, fetched_at=None):
+        """レスポンスを保存して索引に記録（本文のハッシュを返す）"""
+        fetched_at = fetched_at or datetime.now()
+
+        try:
+            body = response.content or b''
+            content_hash = hashlib.sha256(body).hexdigest() if body else None
+
+            entry = {
+                'time': fetched_at.isoformat(timespec='seconds'),
+                'type': source_type,
+                'source': source.get('name', ''),
+                'url': source['url'],
+                'status': response.status_code,
+                'hash': content_hash,
+                'size': len(body),
+                'content_type': response.headers.get('Content-Type')
+            }
+
+            with self._lock:
+                if content_hash:
+                    self._write_object(content_hash, body)
+                with open(self.index_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+            return content_hash
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"レスポンス保存エラー: {source.get('name', source['url'])} - {e}")
+            return None
+
+    def entries(self, source_type=None, source_name=None, since=None, until=None):
+        """索引のエントリを古い順に返す（種別・ソース名・期間で絞り込み）"""
+        if not self.index_file.exists():
+            return
+
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # 書き込み途中で中断された行は読み飛ばす
+                    continue
+
+                if source_type and entry.get('type') != source_type:
+                    continue
+                if source_name and entry.get('source') != source_name:
+                    continue
+
+                fetched_at = datetime.fromisoformat(entry['time'])
+                if since and fetched_at < since:
+                    continue
+                if until and fetched_at > until:
+                    continue
+
+                yield entry
+
+    def open_body(self, content_hash):
+        """本文を展開しながら読み込むファイルオブジェクトを返す"""
+        path, compression = self._find_object(content_hash)
+        if not path:
+            raise FileNotFoundError(f"アーカイブに本文がありません: {content_hash}")
+
+        if compression == "zstd":
+            if zstandard is None:
+                raise RuntimeError("zstd圧縮の本文を読むにはzstandardが必要です")
+            return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+        return gzip.open(path, 'rb')
+
+    def read_body(self, content_hash):
+        """本文を展開して返す"""
+        if not content_hash:
+            return b''
+        with self.open_body(content_hash) as f:
+            return f.read()
+
+    def to_response(self, entry):
+        """索引のエントリからResponseを復元"""
+        response = requests.Response()
+        response.status_code = entry['status']
+        response._content = self.read_body(entry.get('hash'))
+        response.url = entry['url']
+        response.headers = CaseInsensitiveDict()
+        if entry.get('content_type'):
+            response.headers['Content-Type'] = entry['content_type']
+        return response
+
+    def total_size(self):
+        """保存済み本文の合計バイト数（圧縮後）"""
+        return sum(path.stat().st_size for path in self.objects_dir.glob("*/*") if path.suffix in self.EXTENSIONS.values())
@@ -0,0 +1,211 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import datetime
+
+
+class SeenStore:
+    """監視済みURLをSQLiteの索引付きテーブルに保存し、ソースごとの集合で新着判定するクラス"""
+
+    # 未保存の追加がこの件数に達したらまとめて書き込む
+    BATCH_SIZE = 500
+
+    def __init__(self, data_dir="data", db_name="seen_urls.db", legacy_file="watched_urls.json", logger=None):
+        self.data_dir = Path(data_dir)
+        self.logger = logger
+
+        # データディレクトリが存在しない場合は作成
+        self.data_dir.mkdir(exist_ok=True, parents=True)
+
+        # データベースファイルのパス
+        self.db_path = self.data_dir / db_name
+
+        # 以前の監視済みURLのファイル（初回のみ取り込む）
+        self.legacy_file = self.data_dir / legacy_file if legacy_file else None
+
+        # ソースごとの監視済みURLの集合（読み込んだソースのみ）
+        self._sets = {}
+
+        # 未保存の追加（監視済みURL・ソース）
+        self._pending = []
+        self._pending_sources = {}
+
+        # 並行取得時に集合の更新と書き込みを直列化するためのロック
+        self._lock = threading.RLock()
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._init_db()
+        self._migrate_legacy_file()
+
+    def _init_db(self):
+        """テーブルと索引の作成"""
+        with self._lock:
+            # 読み込み中の別プロセスを待たせずに書き込む
+            self.conn.execute('PRAGMA journal_mode=WAL')
+
+            # 監視済みURL（種別・ソース・URLの一意索引で検索）
+            self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS seen_urls (
+                source_type TEXT NOT NULL,
+                source_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                seen_at TEXT NOT NULL,
+                UNIQUE (source_type, source_id, url)
+            )
+            ''')
+
+            # 監視を始めたソース（監視済みURLがまだないソースを含む）
+            self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS seen_sources (
+                source_type TEXT NOT NULL,
+                source_id TEXT NOT NULL,
+                PRIMARY KEY (source_type, source_id)
+            )
+            ''')
+
+            # 移行済みかどうかなどの状態
+            self.conn.execute('CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT)')
+            self.conn.commit()
+
+    def _migrate_legacy_file(self):
+        """watched_urls.jsonの監視済みURLを1度だけ取り込む（取り込んだファイルは.migratedに改名）"""
+        if not self.legacy_file or not self.legacy_file.exists():
+            return
+
+        with self._lock:
+            try:
+                # 同時に起動した別プロセスと二重に取り込まないよう、書き込みロックを取ってから確認
+                self.conn.execute('BEGIN IMMEDIATE')
+                if self.conn.execute("SELECT 1 FROM store_meta WHERE key = 'legacy_migrated'").fetchone():
+                    self.conn.rollback()
+                    return
+
+                with open(self.legacy_file, 'r', encoding='utf-8') as f:
+                    legacy = json.load(f)
+
+                seen_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                count = 0
+                for source_type, sources in legacy.items():
+                    if source_type.startswith('__') or not isinstance(sources, dict):
+                        continue
+                    for source_id, urls in sources.items():
+                        # "__comment1" などの説明用の項目は取り込まない
+                        if source_id.startswith('__') or not isinstance(urls, list):
+                            continue
+                        self.conn.execute('INSERT OR IGNORE INTO seen_sources VALUES (?, ?)', (source_type, source_id))
+                        self.conn.executemany(
+                            'INSERT OR IGNORE INTO seen_urls VALUES (?, ?, ?, ?)',
+                            ((source_type, source_id, url, seen_at) for url in urls)
+                        )
+                        count += len(urls)
+
+                self.conn.execute("INSERT INTO store_meta VALUES ('legacy_migrated', ?)", (str(self.legacy_file),))
+                self.conn.commit()
+
+                self.legacy_file.replace(self.legacy_file.with_name(self.legacy_file.name + '.migrated'))
+
+                if self.logger:
+                    self.logger.info(f"監視済みURLを移行しました: {self.legacy_file} - {count}件")
+
+            except Exception as e:
+                self.conn.rollback()
+                if self.logger:
+                    self.logger.error(f"監視済みURLの移行エラー: {e}")
+
+    def _get_set(self, source_type, source_id):
+        """ソースの監視済みURLの集合（初回のみデータベースから読み込む）"""
+        key = (source_type, source_id)
+        if key not in self._sets:
+            rows = self.conn.execute(
+                'SELECT url FROM seen_urls WHERE source_type = ? AND source_id = ?', key
+            )
+            self._sets[key] = {url for url, in rows}
+        return self._sets[key]
+
+    def has_source(self, source_type, source_id):
+        """監視を始めたソースか"""
+        with self._lock:
+            key = (source_type, source_id)
+            if key in self._pending_sources:
+                return True
+            return self.conn.execute(
+                'SELECT 1 FROM seen_sources WHERE source_type = ? AND source_id = ?', key
+            ).fetchone() is not None
+
+    def add_source(self, source_type, source_id):
+        """監視を始めたソースとして記録"""
+        with self._lock:
+            if not self.has_source(source_type, source_id):
+                self._pending_sources[(source_type, source_id)] = True
+
+    def contains(self, source_type, source_id, url):
+        """監視済みのURLか"""
+        with self._lock:
+            return url in self._get_set(source_type, source_id)
+
+    def add(self, source_type, source_id, url):
+        """URLを監視済みとして追加（新しく追加した場合はTrue。書き込みはcommit()でまとめて行う）"""
+        with self._lock:
+            urls = self._get_set(source_type, source_id)
+            if url in urls:
+                return False
+
+            urls.add(url)
+            self._pending.append((source_type, source_id, url, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+            self._pending_sources[(source_type, source_id)] = True
+
+            if len(self._pending) >= self.BATCH_SIZE:
+                self.commit()
+
+            return True
+
+    def remove(self, source_type, source_id, urls):
+        """URLを監視済みから削除"""
+        with self._lock:
+            self.commit()
+            self._get_set(source_type, source_id).difference_update(urls)
+            self.conn.executemany(
+                'DELETE FROM seen_urls WHERE source_type = ? AND source_id = ? AND url = ?',
+                ((source_type, source_id, url) for url in urls)
+            )
+            self.conn.commit()
+
+    def urls(self, source_type, source_id):
+        """ソースの監視済みURLを追加順に返す"""
+        with self._lock:
+            self.commit()
+            rows = self.conn.execute(
+                'SELECT url FROM seen_urls WHERE source_type = ? AND source_id = ? ORDER BY rowid', (source_type, source_id)
+            )
+            return [url for url, in rows]
+
+    def sources(self, source_type):
+        """監視を始めたソースのIDを返す"""
+        with self._lock:
+            self.commit()
+            rows = self.conn.execute('SELECT source_id FROM seen_sources WHERE source_type = ? ORDER BY rowid', (source_type,))
+            return [source_id for source_id, in rows]
+
+    def commit(self):
+        """未保存の追加をまとめて書き込む"""
+        with self._lock:
+            if not self._pending and not self._pending_sources:
+                return
+
+            try:
+                self.conn.executemany('INSERT OR IGNORE INTO seen_sources VALUES (?, ?)', self._pending_sources)
+                self.conn.executemany('INSERT OR IGNORE INTO seen_urls VALUES (?, ?, ?, ?)', self._pending)
+                self.conn.commit()
+                self._pending = []
+                self._pending_sources = {}
+            except Exception as e:
+                self.conn.rollback()
+                if self.logger:
+                    self.logger.error(f"監視済みURLの保存エラー: {e}")
+
+    def close(self):
+        """未保存の追加を書き込んで接続を閉じる"""
+        with self._lock:
+            self.commit()
+            self.conn.close()
@@ -0,0 +1,178 @@
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from src.storage.seen_store import SeenStore
+from src.utils.file_lock import FileLock
+
+
+class StateDocument:
+    """キーごとの状態を保持するJSONファイル（変更したキーだけを保存時のファイルの内容にマージ）"""
+
+    def __init__(self, path, logger=None):
+        self.path = Path(path)
+        self.logger = logger
+
+        # 別プロセスとの書き込みを直列化するロックファイル
+        self.lock_file = self.path.with_name(self.path.name + '.lock')
+
+        # 状態と、前回の保存から変更・削除したキー
+        self.data = self._read()
+        self._dirty = set()
+
+        self._lock = threading.RLock()
+
+    def _read(self):
+        """ファイルの内容をロード（ない場合・読み込めない場合は空）"""
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"状態ファイルの読み込みエラー: {self.path.name} - {e}")
+        return {}
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def __len__(self):
+        return len(self.data)
+
+    def items(self):
+        return self.data.items()
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self.data[key] = value
+            self._dirty.add(key)
+
+    def setdefault(self, key, default=None):
+        """キーの値を返す（返した値は呼び出し側で更新される前提で変更扱いにする）"""
+        with self._lock:
+            self._dirty.add(key)
+            return self.data.setdefault(key, default)
+
+    def pop(self, key, *default):
+        with self._lock:
+            self._dirty.add(key)
+            return self.data.pop(key, *default)
+
+    def flush(self):
+        """変更したキーを最新のファイルの内容にマージして一時ファイル経由で置き換える"""
+        with self._lock:
+            if not self._dirty:
+                return
+
+            try:
+                with FileLock(self.lock_file):
+                    # 別プロセスが保存した他のキーの状態は残す
+                    merged = self._read()
+                    for key in self._dirty:
+                        if key in self.data:
+                            merged[key] = self.data[key]
+                        else:
+                            merged.pop(key, None)
+
+                    with tempfile.NamedTemporaryFile(
+                        'w', encoding='utf-8', dir=self.path.parent, suffix='.tmp', delete=False
+                    ) as f:
+                        json.dump(merged, f, ensure_ascii=False, indent=2)
+                        temp_path = f.name
+                    os.replace(temp_path, self.path)
+
+                self.data = merged
+                self._dirty = set()
+
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"状態ファイルの保存エラー: {self.path.name} - {e}")
+
+
+class StateManager:
+    """監視済みURLとソースごとの状態ファイルをまとめて保持し、巡回の終わりに1度だけ保存するクラス"""
+
+    def __init__(self, data_dir="data", logger=None, legacy_file="watched_urls.json"):
+        self.data_dir = Path(data_dir)
+        self.logger = logger
+
+        # データディレクトリが存在しない場合は作成
+        self.data_dir.mkdir(exist_ok=True, parents=True)
+
+        # 監視済みURL
+        self.seen_store = SeenStore(data_dir=self.data_dir, legacy_file=legacy_file, logger=logger)
+
+        # ファイル名ごとの状態
+        self._documents = {}
+
+        # 実行中の巡回の数（0より大きい間は保存を巡回の終わりまで遅らせる）
+        self._sweep_depth = 0
+
+        self._lock = threading.RLock()
+
+    def document(self, name):
+        """状態ファイルを取得（同じファイル名には同じインスタンスを返す）"""
+        with self._lock:
+            if name not in self._documents:
+                self._documents[name] = StateDocument(self.data_dir / name, logger=self.logger)
+            return self._documents[name]
+
+    def save(self, *documents):
+        """監視済みURLと指定した状態ファイルを保存（巡回中は巡回の終わりにまとめて保存）"""
+        with self._lock:
+            if self._sweep_depth:
+                return
+
+            self.seen_store.commit()
+            for document in documents:
+                document.flush()
+
+    def flush(self):
+        """未保存の監視済みURLと状態ファイルをすべて保存"""
+        with self._lock:
+            self.seen_store.commit()
+            for document in self._documents.values():
+                document.flush()
+
+    def close(self):
+        """未保存の状態をすべて保存し、監視済みURLのデータベースを閉じる"""
+        with self._lock:
+            self.flush()
+            self.seen_store.close()
+
+    @contextmanager
+    def sweep(self):
+        """巡回中の保存をまとめ、巡回の終わりに1度だけ保存する"""
+        with self._lock:
+            self._sweep_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._sweep_depth -= 1
+                if not self._sweep_depth:
+                    self.flush()
+
+
+# データディレクトリごとのプロセス共通の状態
+_shared_managers = {}
+_shared_lock = threading.Lock()
+
+
+def get_state_manager(data_dir="data", logger=None, legacy_file="watched_urls.json"):
+    """データディレクトリのプロセス共通の状態を取得（初回呼び出し時に生成）"""
+    key = Path(data_dir).resolve()
+
+    with _shared_lock:
+        if key not in _shared_managers:
+            _shared_managers[key] = StateManager(data_dir=data_dir, logger=logger, legacy_file=legacy_file)
+        return _shared_managers[key]
@@ -0,0 +1,131 @@
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+from src.storage.state_manager import get_state_manager
+
+
+class CircuitOpenError(requests.RequestException):
+    """サーキットが開いているため通信しなかった場合の例外"""
+
+
+class CircuitBreaker:
+    """ソース・ホストごとの連続失敗を記録し、一定回数を超えたら冷却期間中の通信を止めるクラス"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, data_dir="data", failure_threshold=3, cooldown=600, max_cooldown=3600,
+                 enabled=True, logger=None, clock=time.time, state=None):
+        self.data_dir = Path(data_dir)
+        self.logger = logger
+        self.enabled = enabled
+        self.clock = clock
+
+        # サーキットを開くまでの連続失敗回数と、再試行までの冷却期間（秒）
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown = cooldown
+        self.max_cooldown = max(cooldown, max_cooldown)
+
+        # データディレクトリが存在しない場合は作成
+        self.data_dir.mkdir(exist_ok=True, parents=True)
+
+        # プロセス共通の状態（URL監視・動画監視で同じファイルを共有）
+        self.state = state or get_state_manager(data_dir, logger=logger)
+
+        # キー（"host:ホスト名" または "種別:URL"）ごとの状態
+        self.states = self.state.document("circuit_state.json")
+
+        self._lock = threading.Lock()
+
+    def save(self):
+        """サーキット状態を保存（別プロセスが更新した他のキーの状態は残す）"""
+        with self._lock:
+            self.state.save(self.states)
+
+    def allow(self, key):
+        """通信してよいか判定（冷却期間後は1件だけ試行を許可）"""
+        if not self.enabled:
+            return True
+
+        with self._lock:
+            state = self.states.get(key)
+            if not state or state['state'] == self.CLOSED:
+                return True
+
+            now = self.clock()
+            if now < state['retry_at']:
+                return False
+
+            # 冷却期間が過ぎたら試行を1件だけ通す（結果が返らないまま冷却期間が過ぎたら再度通す）
+            state['state'] = self.HALF_OPEN
+            state['retry_at'] = now + state['cooldown']
+            self.states[key] = state
+
+        if self.logger:
+            self.logger.info(f"サーキット試行: {key}")
+        return True
+
+    def record_success(self, key):
+        """通信成功を記録（サーキットを閉じる）"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            # 失敗の記録がなければ状態を変更しない（保存対象にもしない）
+            if key not in self.states:
+                return
+            state = self.states.pop(key, None)
+
+        if state and state['state'] != self.CLOSED and self.logger:
+            self.logger.success(f"サーキット復旧: {key}")
+
+    def record_failure(self, key, error=None):
+        """通信失敗を記録（連続失敗が上限に達したらサーキットを開く）"""
+        if not self.enabled:
+            return
+
+        with self._lock:
+            now = self.clock()
+            state = self.states.setdefault(
+                key, {'state': self.CLOSED, 'failures': 0, 'cooldown': self.cooldown, 'retry_at': 0}
+            )
+            state['failures'] += 1
+            state['last_error'] = str(error)[:200] if error else None
+            previous = state['state']
+
+            if previous == self.HALF_OPEN:
+                # 試行に失敗したら冷却期間を延ばして開き直す
+                state['cooldown'] = min(self.max_cooldown, state['cooldown'] * 2)
+            elif previous == self.CLOSED and state['failures'] < self.failure_threshold:
+                return
+
+            state['state'] = self.OPEN
+            state['retry_at'] = now + state['cooldown']
+            failures = state['failures']
+            cooldown = state['cooldown']
+
+        if self.logger and previous != self.OPEN:
+            self.logger.warning(
+                f"サーキットを開きました: {key} (連続失敗 {failures}回, {cooldown:.0f}秒後に再試行) - {error}"
+            )
+
+    def get_state(self, key):
+        """キーの状態（closed / open / half_open）"""
+        with self._lock:
+            state = self.states.get(key)
+            return state['state'] if state else self.CLOSED
+
+    def get_open_keys(self):
+        """開いている（試行中を含む）サーキットのキー一覧"""
+        with self._lock:
+            return sorted(key for key, state in self.states.items() if state['state'] != self.CLOSED)
+
+    def log_summary(self):
+        """開いているサーキットをログに出力"""
+        open_keys = self.get_open_keys()
+        if open_keys and self.logger:
+            self.logger.warning(f"通信を停止中のソース・ホスト: {len(open_keys)}件 ({', '.join(open_keys)})")
@@ -1,46 +1,29 @@
-import json
 import hashlib
 from pathlib import Path
 from datetime import datetime, timedelta
 
+from src.storage.state_manager import get_state_manager
+
 
 class Deduplicator:
     """重複データの検出と排除を行うクラス"""
 
-    def __init__(self, data_dir="data", watched_file="watched_urls.json", logger=None):
+    def __init__(self, data_dir="data", watched_file="watched_urls.json", logger=None, state=None):
         self.data_dir = Path(data_dir)
         self.logger = logger
 
         # データディレクトリが存在しない場合は作成
         self.data_dir.mkdir(exist_ok=True, parents=True)
 
-        # 監視済みURLの保存ファイル
-        self.watched_file = self.data_dir / watched_file
-
-        # 以前に取得したURLのリスト
-        self.watched_urls = self._load_watched_urls()
-
-    def _load_watched_urls(self):
-        """監視済みURLをロード"""
-        if self.watched_file.exists():
-            try:
-                with open(self.watched_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                if self.logger:
-                    self.logger.error(f"監視済みURLの読み込みエラー: {e}")
-                return {"rss": {}, "html": {}, "video": {}}
-        else:
-            return {"rss": {}, "html": {}, "video": {}}
-
-    def _save_watched_urls(self):
+        # プロセス共通の監視済み状態（watched_fileは以前の形式のファイルとして初回のみ取り込む）
+        self.state = state or get_state_manager(data_dir, logger=logger, legacy_file=watched_file)
+
+        # 監視済みURL
+        self.seen_store = self.state.seen_store
+
+    def save(self):
         """監視済みURLを保存"""
-        try:
-            with open(self.watched_file, 'w', encoding='utf-8') as f:
-                json.dump(self.watched_urls, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            if self.logger:
-                self.logger.error(f"監視済みURLの保存エラー: {e}")
+        self.state.save()
 
     def _get_content_hash(self, content):
         """コンテンツのハッシュ値を取得"""
@@ -48,33 +31,23 @@ class Deduplicator:
 
     def is_new_url(self, url, source_id, source_type='rss'):
         """URLが新規かどうかを判定"""
-        # ソースIDがwatched_urlsに存在しない場合は初期化
-        if source_id not in self.watched_urls[source_type]:
-            self.watched_urls[source_type][source_id] = []
-
         # 新規判定
-        is_new = url not in self.watched_urls[source_type][source_id]
+        is_new = not self.seen_store.contains(source_type, source_id, url)
 
         if is_new and self.logger:
             self.logger.info(f"新規URL検出: {url}")
 
         return is_new
 
-    def mark_as_processed(self, url, source_id, source_type='rss'):
-        """URLを処理済みとしてマーク"""
-        # ソースIDがwatched_urlsに存在しない場合は初期化
-        if source_id not in self.watched_urls[source_type]:
-            self.watched_urls[source_type][source_id] = []
-
-        # 既に処理済みの場合はスキップ
-        if url in self.watched_urls[source_type][source_id]:
+    def mark_as_processed(self, url, source_id, source_type='rss', save=True):
+        """URLを処理済みとしてマーク（save=Falseの場合はsave()でまとめて保存）"""
+        # 処理済みURLに追加（既に処理済みの場合はスキップ）
+        if not self.seen_store.add(source_type, source_id, url):
             return False
 
-        # 処理済みURLに追加
-        self.watched_urls[source_type][source_id].append(url)
-
         # 監視済みURLを保存
-        self._save_watched_urls()
+        if save:
+            self.state.save()
 
         if self.logger:
             self.logger.info(f"URL処理済みマーク: {url}")
@@ -95,10 +68,10 @@ class Deduplicator:
             total_removed = 0
 
             # RSSエントリの処理
-            for source_id in self.watched_urls["rss"]:
+            for source_id in self.seen_store.sources("rss"):
                 old_urls = []
 
-                for url in self.watched_urls["rss"][source_id]:
+                for url in self.seen_store.urls("rss", source_id):
                     # URLに日付があるか確認（例: YYYY/MM/DD形式やYYYYMMDD形式）
                     date_found = False
 
@@ -120,12 +93,9 @@ class Deduplicator:
                         continue
 
                 # 古いURLを削除
-                for url in old_urls:
-                    self.watched_urls["rss"][source_id].remove(url)
-                    total_removed += 1
-
-            # 監視済みURLを保存
-            self._save_watched_urls()
+                if old_urls:
+                    self.seen_store.remove("rss", source_id, old_urls)
+                    total_removed += len(old_urls)
 
             if self.logger:
                 self.logger.info(f"古いURL削除完了: {total_removed}件")
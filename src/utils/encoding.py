@@ -0,0 +1,156 @@
+import codecs
+import re
+import threading
+from urllib.parse import urlparse
+
+try:
+    from charset_normalizer import from_bytes
+except ImportError:  # pragma: no cover - requestsの依存によってはchardetのみ
+    from_bytes = None
+
+try:
+    import chardet
+except ImportError:  # pragma: no cover
+    chardet = None
+
+
+# Content-Typeヘッダーのcharset
+_HEADER_CHARSET = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+
+# <meta charset="..."> / <meta http-equiv="Content-Type" content="...; charset=..."> / <?xml encoding="..."?>
+_META_CHARSET = re.compile(
+    rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)|<\?xml[^>]+encoding\s*=\s*["\']([\w.:-]+)',
+    re.IGNORECASE
+)
+
+# BOMと文字コードの対応（長いものから判定）
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# Pythonのcodecsが知らない表記
+_LABELS = {
+    'x-sjis': 'cp932',
+    'windows-31j': 'cp932',
+    'x-euc-jp': 'euc_jp',
+}
+
+# 実際のページで使われる上位互換の文字コードへの読み替え
+_ALIASES = {
+    'shift_jis': 'cp932',
+    'ascii': 'utf-8',
+    'iso8859-1': 'cp1252',
+}
+
+
+def normalize_encoding(name):
+    """文字コード名を正規化（Pythonで扱えない場合はNone）"""
+    if not name:
+        return None
+
+    if isinstance(name, bytes):
+        name = name.decode('ascii', errors='ignore')
+
+    name = name.strip().lower()
+    try:
+        codec_name = codecs.lookup(_LABELS.get(name, name)).name
+    except LookupError:
+        return None
+
+    # Shift_JIS表記のページは機種依存文字を含むことが多いためcp932として扱う
+    return _ALIASES.get(codec_name, codec_name)
+
+
+class EncodingResolver:
+    """HTTPヘッダー・BOM・metaタグ・ホスト履歴・サンプル判定の順で文字コードを決めるクラス"""
+
+    def __init__(self, meta_scan_bytes=4096, sample_bytes=32 * 1024, logger=None):
+        # metaタグを探す先頭バイト数
+        self.meta_scan_bytes = meta_scan_bytes
+
+        # 統計的判定に使う先頭バイト数
+        self.sample_bytes = sample_bytes
+
+        self.logger = logger
+
+        # ホストごとに前回判定した文字コード
+        self._host_encodings = {}
+        self._lock = threading.Lock()
+
+    def _from_header(self, headers):
+        """Content-Typeヘッダーのcharsetから判定"""
+        content_type = headers.get('Content-Type') if headers else None
+        if not isinstance(content_type, str):
+            return None
+
+        match = _HEADER_CHARSET.search(content_type)
+        return normalize_encoding(match.group(1)) if match else None
+
+    def _from_bom(self, content):
+        """BOMから判定"""
+        for bom, encoding in _BOMS:
+            if content.startswith(bom):
+                return encoding
+        return None
+
+    def _from_meta(self, content):
+        """先頭部分のmetaタグ・XML宣言から判定"""
+        match = _META_CHARSET.search(content[:self.meta_scan_bytes])
+        if not match:
+            return None
+        return normalize_encoding(match.group(1) or match.group(2))
+
+    def _detect(self, content):
+        """先頭部分のサンプルから統計的に判定"""
+        sample = content[:self.sample_bytes]
+
+        # UTF-8として正しく読めるならそれを採用（末尾で切れたマルチバイト文字は許容）
+        try:
+            sample.decode('utf-8')
+            return 'utf-8'
+        except UnicodeDecodeError as e:
+            # サンプル末尾で切れたマルチバイト文字だけが原因ならUTF-8とみなす
+            if len(sample) < len(content) and e.start >= len(sample) - 3:
+                return 'utf-8'
+
+        if from_bytes is not None:
+            best = from_bytes(sample).best()
+            if best is not None:
+                return normalize_encoding(best.encoding)
+
+        if chardet is not None:
+            result = chardet.detect(sample)
+            return normalize_encoding(result.get('encoding'))
+
+        return None
+
+    def _get_host(self, url):
+        """URLからホスト名を取得"""
+        return urlparse(url).netloc.lower() if isinstance(url, str) else None
+
+    def resolve(self, content, headers=None, url=None):
+        """本文とヘッダーから文字コードを決定"""
+        host = self._get_host(url)
+
+        encoding = self._from_header(headers) or self._from_bom(content) or self._from_meta(content)
+
+        if not encoding and host:
+            with self._lock:
+                encoding = self._host_encodings.get(host)
+
+        if not encoding:
+            encoding = self._detect(content) or 'utf-8'
+
+        if host:
+            with self._lock:
+                self._host_encodings[host] = encoding
+
+        return encoding
+
+    def resolve_response(self, response):
+        """requestsのResponseの文字コードを決定（response.textの前に設定する）"""
+        return self.resolve(response.content, getattr(response, 'headers', None), getattr(response, 'url', None))
@@ -0,0 +1,67 @@
+import os
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # Windowsではmsvcrtでロックする
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """ロック用のファイルでプロセス間の排他制御を行うクラス（with文で使用）"""
+
+    def __init__(self, path, timeout=30, poll_interval=0.05):
+        self.path = str(path)
+
+        # ロックを取得できるまで待つ最大秒数と再試行の間隔
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+
+        self._fd = None
+
+    def _try_lock(self, fd):
+        """ロックを1回試行（取得できなければOSError）"""
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+    def acquire(self):
+        """ロックを取得（timeout秒以内に取得できなければTimeoutError）"""
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            try:
+                self._try_lock(fd)
+                self._fd = fd
+                return
+            except OSError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise TimeoutError(f"ファイルロックを取得できませんでした: {self.path}")
+                time.sleep(self.poll_interval)
+
+    def release(self):
+        """ロックを解放"""
+        if self._fd is None:
+            return
+
+        try:
+            if fcntl:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
@@ -0,0 +1,135 @@
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import httpx
+    import h2  # noqa: F401  httpxのHTTP/2対応に必要
+except ImportError:  # pragma: no cover - HTTP/2は任意
+    httpx = None
+
+
+def is_http2_available():
+    """HTTP/2通信に必要なライブラリ（httpx・h2）があるか"""
+    return httpx is not None
+
+
+def _convert_error(error):
+    """httpxの例外をrequestsの例外に変換"""
+    if isinstance(error, httpx.ConnectTimeout):
+        return requests.ConnectTimeout(str(error))
+    if isinstance(error, httpx.TimeoutException):
+        return requests.ReadTimeout(str(error))
+    return requests.ConnectionError(str(error))
+
+
+class _HTTPXStream:
+    """httpxのレスポンス本文をrequestsのResponse.rawとして読むためのラッパー"""
+
+    def __init__(self, response):
+        self._response = response
+        self._iterator = None
+        self._buffer = b''
+
+    def stream(self, chunk_size=65536, decode_content=True):
+        """本文をチャンク単位で返す（Content-Encodingは展開済み）"""
+        try:
+            for chunk in self._response.iter_bytes(chunk_size):
+                yield chunk
+        except httpx.HTTPError as e:
+            raise _convert_error(e)
+        finally:
+            self._response.close()
+
+    def read(self, amt=None, decode_content=True):
+        """指定バイト数まで読み込む"""
+        if self._iterator is None:
+            self._iterator = self.stream()
+
+        while amt is None or len(self._buffer) < amt:
+            chunk = next(self._iterator, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+
+        if amt is None:
+            data, self._buffer = self._buffer, b''
+        else:
+            data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+        return data
+
+    def close(self):
+        """接続を解放"""
+        self._response.close()
+
+    def release_conn(self):
+        """接続を解放"""
+        self._response.close()
+
+
+class HTTP2Adapter(BaseAdapter):
+    """httpxで同一オリジンへのリクエストを1本のHTTP/2接続に多重化するrequests用アダプター"""
+
+    # HTTP/2では送れない接続単位のヘッダー（Accept-Encodingは展開できる形式をhttpxが付ける）
+    SKIPPED_HEADERS = ('connection', 'keep-alive', 'proxy-connection', 'transfer-encoding', 'upgrade', 'accept-encoding')
+
+    def __init__(self, max_connections=20, max_keepalive_connections=10, http1=True, verify=True, transport=None):
+        super().__init__()
+
+        if httpx is None:
+            raise ImportError("HTTP/2通信には httpx[http2] が必要です")
+
+        # http1=Falseの場合はHTTP/2のみで通信（平文のh2cサーバー向け）
+        self.client = httpx.Client(
+            http1=http1,
+            http2=True,
+            verify=verify,
+            follow_redirects=False,
+            transport=transport,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections
+            )
+        )
+
+    def _get_timeout(self, timeout):
+        """requests形式のタイムアウトをhttpx形式に変換"""
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(connect=connect, read=read, write=read, pool=connect)
+        return httpx.Timeout(timeout)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        """requestsのPreparedRequestをhttpxで送信してrequestsのResponseを返す"""
+        httpx_request = self.client.build_request(
+            request.method,
+            request.url,
+            headers=[(k, v) for k, v in request.headers.items() if k.lower() not in self.SKIPPED_HEADERS],
+            content=request.body,
+            timeout=self._get_timeout(timeout)
+        )
+
+        try:
+            httpx_response = self.client.send(httpx_request, stream=True)
+        except httpx.HTTPError as e:
+            raise _convert_error(e)
+
+        response = requests.Response()
+        response.status_code = httpx_response.status_code
+        response.headers = CaseInsensitiveDict(httpx_response.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = httpx_response.reason_phrase
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.raw = _HTTPXStream(httpx_response)
+
+        # HTTPバージョン（ログ・ベンチマーク用）
+        response.http_version = httpx_response.http_version
+
+        return response
+
+    def close(self):
+        """接続を閉じる"""
+        self.client.close()
@@ -0,0 +1,197 @@
+import json
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class HTTPCache:
+    """Cache-Control/Expiresに従ってレスポンスをディスクに保存するキャッシュ（サイズ上限付きLRU）"""
+
+    # 保存するレスポンスヘッダー
+    KEPT_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Expires')
+
+    def __init__(self, cache_dir, max_bytes=100 * 1024 * 1024, default_ttl=0, logger=None, clock=time.time):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.logger = logger
+        self.clock = clock
+
+        # キャッシュディレクトリが存在しない場合は作成
+        self.cache_dir.mkdir(exist_ok=True, parents=True)
+
+        # キャッシュの索引ファイル
+        self.index_file = self.cache_dir / "index.json"
+
+        # URLのハッシュ -> {url, expires, size, last_access, headers, encoding}
+        self.index = self._load_index()
+
+        self._lock = threading.Lock()
+
+    def _load_index(self):
+        """索引をロード"""
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"HTTPキャッシュ索引の読み込みエラー: {e}")
+        return {}
+
+    def _write_atomic(self, path, data, mode='wb'):
+        """一時ファイル経由でファイルを書き込む"""
+        kwargs = {} if 'b' in mode else {'encoding': 'utf-8'}
+        with tempfile.NamedTemporaryFile(mode, dir=self.cache_dir, suffix='.tmp', delete=False, **kwargs) as f:
+            if isinstance(data, (bytes, str)):
+                f.write(data)
+            else:
+                json.dump(data, f, ensure_ascii=False)
+            temp_path = f.name
+        os.replace(temp_path, path)
+
+    def save(self):
+        """索引を保存"""
+        try:
+            with self._lock:
+                self._write_atomic(self.index_file, dict(self.index), mode='w')
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"HTTPキャッシュ索引の保存エラー: {e}")
+
+    def _get_key(self, url):
+        """URLからキャッシュキーを作成"""
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def _get_body_path(self, key):
+        """本文ファイルのパス"""
+        return self.cache_dir / f"{key}.body"
+
+    def _get_ttl(self, headers, ttl=None):
+        """キャッシュの有効期間（秒）を決定（Noneは保存しない）"""
+        cache_control = headers.get('Cache-Control', '').lower()
+        directives = [d.strip() for d in cache_control.split(',') if d.strip()]
+
+        if 'no-store' in directives:
+            return None
+
+        # ソースごとの指定がある場合はそれを優先
+        if ttl is not None:
+            return ttl if ttl > 0 else None
+
+        if 'no-cache' in directives:
+            return None
+
+        for directive in directives:
+            match = re.match(r'(?:s-)?max-age\s*=\s*"?(\d+)"?', directive)
+            if match:
+                max_age = int(match.group(1))
+                return max_age if max_age > 0 else None
+
+        expires = headers.get('Expires')
+        if expires:
+            try:
+                remaining = parsedate_to_datetime(expires).timestamp() - self.clock()
+            except (TypeError, ValueError):
+                # 不正なExpiresは期限切れとして扱う
+                return None
+            return remaining if remaining > 0 else None
+
+        return self.default_ttl if self.default_ttl > 0 else None
+
+    def get(self, url):
+        """有効なキャッシュがあればResponseとして返す"""
+        key = self._get_key(url)
+
+        with self._lock:
+            entry = self.index.get(key)
+            if not entry:
+                return None
+
+            if entry['expires'] <= self.clock():
+                self._remove(key)
+                return None
+
+            try:
+                body = self._get_body_path(key).read_bytes()
+            except OSError:
+                self._remove(key)
+                return None
+
+            entry['last_access'] = self.clock()
+
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.headers = CaseInsensitiveDict(entry.get('headers', {}))
+        response.url = url
+        response.encoding = entry.get('encoding')
+        response.from_cache = True
+        return response
+
+    def put(self, url, response, ttl=None):
+        """レスポンスをキャッシュに保存（保存しなかった場合はFalse。索引はsave()でまとめて保存）"""
+        if response.status_code != 200:
+            return False
+
+        lifetime = self._get_ttl(response.headers, ttl)
+        if lifetime is None:
+            return False
+
+        body = response.content
+        if len(body) > self.max_bytes:
+            return False
+
+        key = self._get_key(url)
+        now = self.clock()
+
+        try:
+            with self._lock:
+                self._write_atomic(self._get_body_path(key), body)
+                self.index[key] = {
+                    'url': url,
+                    'expires': now + lifetime,
+                    'size': len(body),
+                    'last_access': now,
+                    'headers': {h: response.headers[h] for h in self.KEPT_HEADERS if h in response.headers},
+                    'encoding': response.encoding
+                }
+                self._evict()
+            return True
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"HTTPキャッシュ保存エラー: {url} - {e}")
+            return False
+
+    def _remove(self, key):
+        """エントリを削除（ロック取得済みで呼ぶ）"""
+        self.index.pop(key, None)
+        try:
+            self._get_body_path(key).unlink()
+        except OSError:
+            pass
+
+    def _evict(self):
+        """サイズ上限を超えた分を最終アクセスの古い順に削除（ロック取得済みで呼ぶ）"""
+        total = sum(entry['size'] for entry in self.index.values())
+        if total <= self.max_bytes:
+            return
+
+        for key, entry in sorted(self.index.items(), key=lambda item: item[1]['last_access']):
+            self._remove(key)
+            total -= entry['size']
+            if total <= self.max_bytes:
+                break
+
+    def total_size(self):
+        """キャッシュ本文の合計バイト数"""
+        with self._lock:
+            return sum(entry['size'] for entry in self.index.values())
@@ -0,0 +1,288 @@
+import random
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.utils.rate_limiter import HostRateLimiter, parse_retry_after
+from src.utils.circuit_breaker import CircuitOpenError
+from src.utils.http2_adapter import HTTP2Adapter, is_http2_available
+
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+class ResponseTooLarge(requests.RequestException):
+    """レスポンスが上限サイズを超えた場合の例外"""
+
+
+class DeadlineExceeded(requests.Timeout):
+    """リクエスト全体の制限時間を超えた場合の例外"""
+
+
+class RateLimitDeadlineExceeded(requests.RequestException):
+    """送信速度制御の待機が制限時間を超えるため送信しなかった場合の例外（ホストの障害ではない）"""
+
+
+def get_request_limits(source):
+    """ソース設定からリクエストごとの上限（サイズ・制限時間）を取得"""
+    limits = {}
+    if source.get('max_response_mb') is not None:
+        limits['max_bytes'] = int(source['max_response_mb'] * 1024 * 1024)
+    if source.get('request_deadline') is not None:
+        limits['deadline'] = source['request_deadline']
+    return limits
+
+
+class HTTPClient:
+    """接続プール・リトライ・タイムアウトを共通化したHTTPクライアント"""
+
+    # リトライ対象のステータスコード
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+
+    # リトライしてよいメソッド（冪等なもののみ）
+    RETRY_METHODS = ('GET', 'HEAD')
+
+    # 本文を読み込む単位（バイト）
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, config=None, logger=None, circuit_breaker=None):
+        config = config or {}
+        self.logger = logger
+
+        # ホスト単位のサーキットブレーカー（Noneの場合は使用しない）
+        self.circuit_breaker = circuit_breaker
+
+        # タイムアウト設定（秒）
+        self.connect_timeout = config.get("connect_timeout", 10)
+        self.read_timeout = config.get("read_timeout", 30)
+
+        # 1リクエストあたりの本文サイズの上限と、リトライを含めた全体の制限時間（0で無制限）
+        self.max_response_bytes = int(config.get("max_response_mb", 10) * 1024 * 1024)
+        self.request_deadline = config.get("request_deadline", 60)
+
+        # リトライ設定
+        self.max_retries = config.get("max_retries", 2)
+        self.backoff_factor = config.get("backoff_factor", 0.5)
+        self.backoff_max = config.get("backoff_max", 10)
+
+        # Retry-Afterで待機する最大秒数（超える場合は再試行しない）
+        self.max_retry_after = config.get("max_retry_after", 120)
+
+        self.user_agent = config.get("user_agent", DEFAULT_USER_AGENT)
+
+        # ホストごとに接続を使い回すセッション
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=config.get("pool_connections", 20),
+            pool_maxsize=config.get("pool_maxsize", 10),
+            max_retries=0
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["User-Agent"] = self.user_agent
+
+        # HTTP/2を使う場合は同一オリジンへのリクエストを1本の接続に多重化する（HTTPSのみ）
+        if config.get("http2", False):
+            if is_http2_available():
+                self.session.mount("https://", HTTP2Adapter(
+                    max_connections=config.get("pool_connections", 20),
+                    max_keepalive_connections=config.get("pool_connections", 20)
+                ))
+            elif self.logger:
+                self.logger.warning("httpx[http2]がインストールされていないためHTTP/1.1で通信します")
+
+        # ホスト単位の送信速度制御（全フェッチャーで共有）
+        rate_config = dict(config.get("rate_limit") or {})
+        rate_config.setdefault("max_retry_after", self.max_retry_after)
+        if rate_config.get("enabled", True):
+            self.rate_limiter = HostRateLimiter(config=rate_config, logger=logger)
+        else:
+            self.rate_limiter = None
+
+    def _get_backoff(self, attempt):
+        """ジッター付き指数バックオフの待機秒数"""
+        cap = min(self.backoff_max, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, cap)
+
+    def _get_timeout(self, url, timeout, deadline_at):
+        """接続・読み込みタイムアウトを残り時間に収める"""
+        if deadline_at is None:
+            return timeout
+
+        remaining = deadline_at - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"リクエストの制限時間を超えました: {url}")
+
+        if isinstance(timeout, tuple):
+            return tuple(min(t, remaining) if t is not None else remaining for t in timeout)
+        return min(timeout, remaining) if timeout is not None else remaining
+
+    def _exceeds_deadline(self, wait, deadline_at):
+        """待機後に制限時間を超えるか判定"""
+        return deadline_at is not None and time.monotonic() + wait >= deadline_at
+
+    def _read_body(self, response, url, max_bytes, deadline_at):
+        """上限サイズと制限時間を確認しながら本文を読み込む"""
+        try:
+            length = int(response.headers.get('Content-Length') or 0)
+        except (TypeError, ValueError):
+            length = 0
+
+        try:
+            if max_bytes and length > max_bytes:
+                raise ResponseTooLarge(
+                    f"レスポンスサイズが上限を超えています ({length} > {max_bytes} bytes): {url}", response=response
+                )
+
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(self.CHUNK_SIZE):
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise ResponseTooLarge(
+                        f"レスポンスサイズが上限を超えたため中断しました (> {max_bytes} bytes): {url}", response=response
+                    )
+                if deadline_at is not None and time.monotonic() > deadline_at:
+                    raise DeadlineExceeded(f"リクエストの制限時間を超えたため中断しました: {url}", response=response)
+                chunks.append(chunk)
+        except Exception:
+            # 読み残しのある接続はプールに戻さず閉じる
+            response.close()
+            raise
+
+        response._content = b''.join(chunks)
+        response._content_consumed = True
+        return response
+
+    def request(self, method, url, max_bytes=None, deadline=None, **kwargs):
+        """ホストのサーキットを確認してリクエストを送信"""
+        if not self.circuit_breaker:
+            return self._request(method, url, max_bytes, deadline, **kwargs)
+
+        # 停止中のホストには接続せず、タイムアウトまで待たずに失敗させる
+        host_key = f"host:{urlparse(url).netloc.lower()}"
+        if not self.circuit_breaker.allow(host_key):
+            raise CircuitOpenError(f"停止中のホストのため通信しません: {url}")
+
+        try:
+            response = self._request(method, url, max_bytes, deadline, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            self.circuit_breaker.record_failure(host_key, e)
+            raise
+
+        if response.status_code >= 500:
+            self.circuit_breaker.record_failure(host_key, f"HTTP {response.status_code}")
+        else:
+            self.circuit_breaker.record_success(host_key)
+
+        return response
+
+    def _request(self, method, url, max_bytes=None, deadline=None, **kwargs):
+        """リトライ付きでリクエストを送信（本文はサイズ上限・制限時間付きで読み込む）"""
+        timeout = kwargs.pop("timeout", (self.connect_timeout, self.read_timeout))
+
+        max_bytes = self.max_response_bytes if max_bytes is None else max_bytes
+        deadline = self.request_deadline if deadline is None else deadline
+        deadline_at = time.monotonic() + deadline if deadline else None
+
+        # 上限を確認しながら読むためにストリーミングで受信する（呼び出し側がstreamを指定した場合はそのまま返す）
+        read_body = not kwargs.get("stream") and (max_bytes or deadline_at is not None)
+        if read_body:
+            kwargs["stream"] = True
+
+        retries = self.max_retries if method.upper() in self.RETRY_METHODS else 0
+        attempt = 0
+
+        while True:
+            # 送信速度制御の待機は残り時間までに収め、超える場合は送信せずに打ち切る
+            if self.rate_limiter:
+                remaining = deadline_at - time.monotonic() if deadline_at is not None else None
+                if not self.rate_limiter.acquire(url, timeout=remaining):
+                    raise RateLimitDeadlineExceeded(f"送信速度制御の待機が制限時間を超えるため送信しません: {url}")
+
+            kwargs["timeout"] = self._get_timeout(url, timeout, deadline_at)
+
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                wait = self._get_backoff(attempt)
+                if attempt >= retries or self._exceeds_deadline(wait, deadline_at):
+                    raise
+                if self.logger:
+                    self.logger.warning(f"HTTP通信エラーのため再試行します ({attempt + 1}/{retries}): {url} - {e}")
+            else:
+                retry_after = None
+                if response.status_code in HostRateLimiter.THROTTLE_STATUS:
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+
+                if self.rate_limiter:
+                    self.rate_limiter.on_response(url, response.status_code, response.headers.get('Retry-After'))
+
+                # 速度制御がない場合はRetry-Afterをここで待つ（ある場合は次のacquireで待機）
+                wait = self._get_backoff(attempt)
+                if retry_after and not self.rate_limiter:
+                    wait = max(wait, retry_after)
+
+                # 待機指示が長すぎる場合・待機すると制限時間を超える場合は再試行せずに返す
+                if (response.status_code not in self.RETRY_STATUS or attempt >= retries
+                        or (retry_after and retry_after > self.max_retry_after)
+                        or self._exceeds_deadline(max(wait, retry_after or 0), deadline_at)):
+                    return self._read_body(response, url, max_bytes, deadline_at) if read_body else response
+
+                if self.logger:
+                    self.logger.warning(f"HTTP {response.status_code} のため再試行します ({attempt + 1}/{retries}): {url}")
+                response.close()
+
+            time.sleep(wait)
+            attempt += 1
+
+    def get(self, url, **kwargs):
+        """GETリクエスト"""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        """POSTリクエスト"""
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        """セッションを閉じる"""
+        self.session.close()
+
+
+# プロセス共通のHTTPクライアントと、生成時に渡された設定
+_shared_client = None
+_shared_config = None
+_shared_lock = threading.Lock()
+
+
+def _get_breaker_settings(circuit_breaker):
+    """サーキットブレーカーの設定（共通クライアントとの比較用）"""
+    if circuit_breaker is None:
+        return None
+    return (
+        circuit_breaker.data_dir.resolve(), circuit_breaker.enabled,
+        circuit_breaker.failure_threshold, circuit_breaker.cooldown, circuit_breaker.max_cooldown
+    )
+
+
+def get_http_client(config=None, logger=None, circuit_breaker=None):
+    """プロセス共通のHTTPクライアントを取得（初回呼び出し時の設定で生成し、以降に異なる設定が渡された場合は警告）"""
+    global _shared_client, _shared_config
+
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HTTPClient(config=config, logger=logger, circuit_breaker=circuit_breaker)
+            _shared_config = config
+            return _shared_client
+
+        logger = logger or _shared_client.logger
+        if config is not None and config != _shared_config and logger:
+            logger.warning("共通HTTPクライアントは生成済みのため、指定されたHTTP設定は使用されません")
+        if (circuit_breaker is not None and circuit_breaker is not _shared_client.circuit_breaker
+                and _get_breaker_settings(circuit_breaker) != _get_breaker_settings(_shared_client.circuit_breaker)
+                and logger):
+            logger.warning("共通HTTPクライアントは生成済みのため、指定されたサーキットブレーカーは使用されません")
+
+        return _shared_client
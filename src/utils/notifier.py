@@ -1,32 +1,33 @@
 import json
-import requests
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 
+from src.utils.http_client import get_http_client
+
 
 class Notifier:
     """通知を送信するクラス"""
 
-    def __init__(self, config, logger=None):
+    # URL通知に載せるエントリ数（残りは件数だけを表示）
+    URL_MAX_ENTRIES = 10
+
+    def __init__(self, config, logger=None, http_client=None):
         self.config = config
         self.logger = logger
+        self.http_client = http_client or get_http_client(logger=logger)
         self.enabled = config.get("enabled", False)
         self.method = config.get("method", "cli")
 
-    def _format_url_entries(self, entries, max_entries=10):
-        """URL通知のフォーマット"""
+    def _format_url_entries(self, entries, max_entries=URL_MAX_ENTRIES, total=None):
+        """URL通知のフォーマット（totalは全件数。entriesに先頭の一部だけを渡す場合に指定）"""
         if not entries:
             return "新着情報はありません。"
 
         # エントリ数の制限
-        if len(entries) > max_entries:
-            shown_entries = entries[:max_entries]
-            remaining = len(entries) - max_entries
-        else:
-            shown_entries = entries
-            remaining = 0
+        shown_entries = entries[:max_entries]
+        remaining = max((total or len(entries)) - len(shown_entries), 0)
 
         # メッセージの構築
         lines = []
@@ -82,14 +83,14 @@ class Notifier:
 
         return "\n".join(lines)
 
-    def notify_url_updates(self, entries):
-        """URL更新の通知"""
+    def notify_url_updates(self, entries, total=None):
+        """URL更新の通知（totalは全件数。通知に載せる先頭のエントリだけを渡す場合に指定）"""
         if not self.enabled or not entries:
             return
 
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        subject = f"GovInfoWatcher: 新着情報 {len(entries)}件 ({timestamp})"
-        message = self._format_url_entries(entries)
+        subject = f"GovInfoWatcher: 新着情報 {total or len(entries)}件 ({timestamp})"
+        message = self._format_url_entries(entries, total=total)
 
         return self._send_notification(subject, message)
 
@@ -168,7 +169,7 @@ class Notifier:
                 ]
             }
 
-            response = requests.post(
+            response = self.http_client.post(
                 webhook_url,
                 data=json.dumps(payload),
                 headers={"Content-Type": "application/json"}
@@ -0,0 +1,125 @@
+import statistics
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+
+from src.storage.state_manager import get_state_manager
+
+
+class PollScheduler:
+    """ソースごとの更新履歴から次回の取得時刻を決めるクラス"""
+
+    # 保持する更新時刻の件数
+    HISTORY_SIZE = 10
+
+    # 実行タイミングのずれを吸収する猶予
+    GRACE = timedelta(minutes=1)
+
+    def __init__(self, data_dir="data", min_interval=15, max_interval=1440, enabled=True, logger=None, state=None):
+        self.data_dir = Path(data_dir)
+        self.logger = logger
+        self.enabled = enabled
+
+        # 取得間隔の下限・上限（分）
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+
+        # データディレクトリが存在しない場合は作成
+        self.data_dir.mkdir(exist_ok=True, parents=True)
+
+        # プロセス共通の状態（URL監視・動画監視で同じファイルを共有）
+        self.state = state or get_state_manager(data_dir, logger=logger)
+
+        # ソースごとのスケジュール
+        self.schedule = self.state.document("poll_schedule.json")
+
+        self._lock = threading.Lock()
+
+    def save(self):
+        """スケジュールを保存（別プロセスが更新した他のソースのスケジュールは残す）"""
+        with self._lock:
+            self.state.save(self.schedule)
+
+    def _get_key(self, source_type, source):
+        """スケジュールのキー"""
+        return f"{source_type}:{source['url']}"
+
+    def _get_bounds(self, source):
+        """ソースごとの取得間隔の下限・上限（分）"""
+        min_interval = source.get('min_interval', self.min_interval)
+        max_interval = max(min_interval, source.get('max_interval', self.max_interval))
+        return min_interval, max_interval
+
+    def is_due(self, source_type, source, now=None):
+        """ソースが取得対象の時刻になっているか判定"""
+        if not self.enabled:
+            return True
+
+        now = now or datetime.now()
+        state = self.schedule.get(self._get_key(source_type, source))
+        if not state or not state.get('next_due'):
+            return True
+
+        try:
+            next_due = datetime.fromisoformat(state['next_due'])
+        except ValueError:
+            return True
+
+        return now + self.GRACE >= next_due
+
+    def _estimate_interval(self, history, current, min_interval, max_interval):
+        """更新履歴から取得間隔（分）を推定"""
+        if len(history) >= 2:
+            times = [datetime.fromisoformat(t) for t in history]
+            gaps = [(b - a).total_seconds() / 60 for a, b in zip(times, times[1:])]
+            # 更新間隔の中央値の半分ごとに確認すれば、遅れは平均で間隔の1/4程度に収まる
+            interval = statistics.median(gaps) / 2
+        else:
+            interval = current / 2
+
+        return min(max_interval, max(min_interval, interval))
+
+    def record(self, source_type, source, new_count, now=None):
+        """取得結果を記録して次回の取得時刻を更新"""
+        if not self.enabled:
+            return
+
+        now = now or datetime.now()
+        key = self._get_key(source_type, source)
+        min_interval, max_interval = self._get_bounds(source)
+
+        with self._lock:
+            state = self.schedule.setdefault(key, {'interval': min_interval, 'history': []})
+            interval = state.get('interval', min_interval)
+
+            if new_count > 0:
+                # 更新があったソースは履歴から間隔を推定（短くなりやすい）
+                history = (state.get('history', []) + [now.isoformat(timespec='seconds')])[-self.HISTORY_SIZE:]
+                state['history'] = history
+                state['last_updated'] = now.isoformat(timespec='seconds')
+                interval = self._estimate_interval(history, interval, min_interval, max_interval)
+            else:
+                # 更新がなければ徐々に間隔を延ばす
+                interval = min(max_interval, max(min_interval, interval * 1.5))
+
+            state['interval'] = round(interval, 1)
+            state['last_checked'] = now.isoformat(timespec='seconds')
+            state['next_due'] = (now + timedelta(minutes=interval)).isoformat(timespec='seconds')
+
+    def filter_due(self, source_type, sources, now=None):
+        """有効かつ取得時刻になっているソースだけを返す"""
+        due = []
+        skipped = 0
+
+        for source in sources:
+            if not source.get("enabled", True):
+                continue
+            if self.is_due(source_type, source, now=now):
+                due.append(source)
+            else:
+                skipped += 1
+
+        if skipped and self.logger:
+            self.logger.info(f"取得時刻前のため {skipped} 件のソースをスキップします ({source_type})")
+
+        return due
@@ -0,0 +1,140 @@
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+
+def parse_retry_after(value):
+    """Retry-Afterヘッダー（秒数またはHTTP日付）を待機秒数に変換"""
+    if not value:
+        return None
+
+    value = str(value).strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class _Bucket:
+    """1ホスト分のトークンバケット"""
+
+    def __init__(self, rate, burst, now):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+        self.blocked_until = 0.0
+
+    def refill(self, now):
+        """経過時間分のトークンを補充"""
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(float(self.burst), self.tokens + elapsed * self.rate)
+        self.updated = now
+
+
+class HostRateLimiter:
+    """ホスト単位のトークンバケットで送信間隔を制御し、429/503に応じて速度を調整するクラス"""
+
+    # 速度を落とす対象のステータスコード
+    THROTTLE_STATUS = (429, 503)
+
+    def __init__(self, config=None, logger=None, clock=time.monotonic, sleep=time.sleep):
+        config = config or {}
+        self.logger = logger
+        self.clock = clock
+        self.sleep = sleep
+
+        # ホストごとの平均リクエスト数（件/秒）と連続送信数
+        self.default_rate = float(config.get("requests_per_second", 1.0))
+        self.burst = max(1, int(config.get("burst", 3)))
+        self.host_rates = {host.lower(): float(rate) for host, rate in (config.get("hosts") or {}).items()}
+
+        # 429/503受信時の減速と、成功時の回復の設定
+        self.min_rate = float(config.get("min_requests_per_second", 0.05))
+        self.backoff_ratio = float(config.get("backoff_ratio", 0.5))
+        self.recovery_ratio = float(config.get("recovery_ratio", 0.1))
+
+        # Retry-Afterで待機する最大秒数
+        self.max_retry_after = float(config.get("max_retry_after", 120))
+
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _get_host(self, url):
+        """URLからホスト名を取得"""
+        return urlparse(url).netloc.lower()
+
+    def _get_bucket(self, host, now):
+        """ホストのバケットを取得（なければ作成）"""
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate = self.host_rates.get(host, self.default_rate)
+            bucket = _Bucket(rate, self.burst, now)
+            self._buckets[host] = bucket
+        return bucket
+
+    def acquire(self, url, timeout=None):
+        """送信可能になるまで待機してトークンを1つ消費（timeout秒以内に送信できない場合は待たずにFalse）"""
+        host = self._get_host(url)
+        deadline = self.clock() + timeout if timeout is not None else None
+
+        while True:
+            with self._lock:
+                now = self.clock()
+                bucket = self._get_bucket(host, now)
+                bucket.refill(now)
+
+                if bucket.blocked_until > now:
+                    wait = bucket.blocked_until - now
+                elif bucket.tokens >= 1:
+                    bucket.tokens -= 1
+                    return True
+                else:
+                    wait = (1 - bucket.tokens) / bucket.rate
+
+            if deadline is not None and now + wait > deadline:
+                return False
+
+            self.sleep(wait)
+
+    def on_response(self, url, status_code, retry_after=None):
+        """レスポンスに応じて送信速度を調整"""
+        host = self._get_host(url)
+
+        with self._lock:
+            now = self.clock()
+            bucket = self._get_bucket(host, now)
+
+            if status_code in self.THROTTLE_STATUS:
+                # 速度を落とし、Retry-Afterがあればその間は送信を止める
+                bucket.rate = max(self.min_rate, bucket.rate * self.backoff_ratio)
+                wait = parse_retry_after(retry_after)
+                if wait:
+                    bucket.blocked_until = max(bucket.blocked_until, now + min(wait, self.max_retry_after))
+                    bucket.tokens = 0.0
+
+                if self.logger:
+                    self.logger.warning(
+                        f"HTTP {status_code} を受信したため {host} への送信速度を下げます: "
+                        f"{bucket.rate:.2f}件/秒" + (f" (Retry-After: {wait:.0f}秒)" if wait else "")
+                    )
+            elif status_code < 400 and bucket.rate < bucket.base_rate:
+                # 成功が続けば元の速度まで徐々に戻す
+                bucket.rate = min(bucket.base_rate, bucket.rate + bucket.base_rate * self.recovery_ratio)
+
+    def get_rate(self, url):
+        """ホストの現在の送信速度（件/秒）"""
+        host = self._get_host(url)
+        with self._lock:
+            return self._get_bucket(host, self.clock()).rate
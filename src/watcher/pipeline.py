@@ -0,0 +1,170 @@
+import queue
+import threading
+
+
+# ステージの終了を伝える目印
+_DONE = object()
+
+
+class Downloader:
+    """取得したレスポンスを解析ステージのキューへ渡すクラス（FetchEngineのフェッチャーとして使用）"""
+
+    def __init__(self, source_type, fetcher, responses):
+        self.source_type = source_type
+        self.fetcher = fetcher
+        self.responses = responses
+
+    def fetch(self, source):
+        """レスポンスを取得してキューに追加（キューが一杯の場合は解析が追いつくまで待つ）"""
+        response = self.fetcher.download(source)
+        self.responses.put((self.source_type, self.fetcher, source, response))
+        return []
+
+
+class NotificationDigest:
+    """通知に載せる先頭のエントリと全件数だけを保持するクラス"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = []
+        self.total = 0
+
+    def add(self, entry):
+        """エントリを追加（上限を超えた分は件数だけを数える）"""
+        self.total += 1
+        if len(self.entries) < self.max_entries:
+            self.entries.append(entry)
+
+
+class URLPipeline:
+    """取得→解析・重複排除→保存→通知の各ステージを上限付きキューでつなぎ、新着エントリを1件ずつ流すクラス"""
+
+    def __init__(self, fetch_engine, notifier=None, storage=None, scheduler=None, parse_workers=1, queue_size=20, logger=None):
+        self.fetch_engine = fetch_engine
+        self.logger = logger
+
+        # 通知（Noneの場合は通知しない）
+        self.notifier = notifier
+
+        # 新着エントリの保存先（Noneの場合は保存しない）
+        self.storage = storage
+
+        # 取得結果から次回の取得時刻を更新するスケジューラ（Noneの場合は記録しない）
+        self.scheduler = scheduler
+
+        # 解析・重複排除を並行して行うワーカー数
+        self.parse_workers = max(1, int(parse_workers))
+
+        # ステージ間のキューの上限（取得済みで未解析のレスポンス・未処理のエントリの数）
+        self.queue_size = max(1, int(queue_size))
+
+    def _download(self, jobs, responses):
+        """取得ステージ（ホスト単位の同時接続数を守って並行取得）"""
+        try:
+            self.fetch_engine.run([(Downloader(source_type, fetcher, responses), source) for source_type, fetcher, source in jobs])
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"取得ステージのエラー: {e}")
+        finally:
+            # 解析ワーカーの数だけ終了を伝える
+            for _ in range(self.parse_workers):
+                responses.put(_DONE)
+
+    def _parse(self, responses, entries):
+        """解析・重複排除ステージ（新着エントリを見つけ次第、次のステージへ渡す）"""
+        try:
+            while True:
+                job = responses.get()
+                if job is _DONE:
+                    break
+
+                source_type, fetcher, source, response = job
+
+                # 取得できなかったソース（停止中・取得エラー）は新着なしと区別して伝える
+                if response is None:
+                    entries.put(('failed', source_type, source, None))
+                    continue
+
+                count = 0
+                try:
+                    for entry in fetcher.iter_new_entries(source, response):
+                        entries.put(('entry', source_type, source, entry))
+                        count += 1
+                except Exception as e:
+                    if self.logger:
+                        self.logger.error(f"解析ステージのエラー: {source['name']} - {e}")
+
+                # ソースごとの新着件数
+                entries.put(('done', source_type, source, count))
+        finally:
+            entries.put(_DONE)
+
+    def _store(self, source_type, entry):
+        """保存ステージ"""
+        if self.storage:
+            self.storage.save_url_entry(entry, source_type)
+
+    def run(self, jobs):
+        """(種別, フェッチャー, ソース) のリストを処理し、新着エントリの件数を返す"""
+        if not jobs:
+            return 0
+
+        responses = queue.Queue(maxsize=self.queue_size)
+        entries = queue.Queue(maxsize=self.queue_size)
+
+        threads = [threading.Thread(target=self._download, args=(jobs, responses), daemon=True)]
+        threads += [threading.Thread(target=self._parse, args=(responses, entries), daemon=True) for _ in range(self.parse_workers)]
+        for thread in threads:
+            thread.start()
+
+        # 通知に載せるエントリ（全件は保持しない）
+        max_entries = self.notifier.URL_MAX_ENTRIES if self.notifier else 0
+        digest = NotificationDigest(max_entries)
+
+        # 保存・通知ステージ（解析ワーカーがすべて終わるまで受け取る）
+        total = 0
+        running = self.parse_workers
+        while running:
+            item = entries.get()
+            if item is _DONE:
+                running -= 1
+                continue
+
+            # 受け取りを止めると解析ワーカーが待ち続けるため、エラーは記録して続ける
+            kind, source_type, source, value = item
+            if kind == 'failed':
+                # 取得に失敗したソースは取得間隔を延ばさない
+                continue
+
+            if kind == 'done':
+                # 取得結果から次回の取得時刻を更新
+                try:
+                    if self.scheduler:
+                        self.scheduler.record(source_type, source, value)
+                except Exception as e:
+                    if self.logger:
+                        self.logger.error(f"取得時刻の更新エラー: {source['name']} - {e}")
+                continue
+
+            total += 1
+            try:
+                self._store(source_type, value)
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"保存ステージのエラー: {source['name']} - {e}")
+
+            digest.add(value)
+
+        for thread in threads:
+            thread.join()
+
+        # 新着情報の通知
+        if total:
+            if self.logger:
+                self.logger.info(f"合計 {total} 件の新着情報を検出しました")
+            if self.notifier:
+                self.notifier.notify_url_updates(digest.entries, total=digest.total)
+        elif self.logger:
+            self.logger.info("新着情報はありませんでした")
+
+        return total
@@ -0,0 +1,148 @@
+import time
+
+from src.fetcher.fetch_engine import FetchEngine
+from src.parser.rss_parser import RSSParser
+from src.parser.html_parser import HTMLParser
+from src.parser.video_parser import VideoParser
+from src.utils.encoding import EncodingResolver
+from src.utils.http_client import get_http_client, get_request_limits
+
+
+# 設定ファイルのソース一覧と種別の対応
+SOURCE_KEYS = {'rss': 'rss_sources', 'html': 'html_sources', 'video': 'video_sources'}
+
+
+class ResponseRecorder:
+    """ソースのレスポンスを解析せずにアーカイブへ保存するクラス（FetchEngineのフェッチャーとして使用）"""
+
+    def __init__(self, source_type, archive, logger=None, http_client=None):
+        self.source_type = source_type
+        self.archive = archive
+        self.logger = logger
+
+        # 共通HTTPクライアント
+        self.http_client = http_client or get_http_client(logger=logger)
+
+    def fetch(self, source):
+        """レスポンスを取得して保存（新着エントリは返さない）"""
+        response = self.http_client.get(source['url'], **get_request_limits(source))
+        self.archive.store(self.source_type, source, response)
+
+        if self.logger:
+            self.logger.info(f"レスポンス保存: {source['name']} (HTTP {response.status_code}, {len(response.content)} bytes)")
+
+        return []
+
+
+def record_sweep(config, archive, logger=None, http_client=None):
+    """有効な全ソースのレスポンスを1巡回分保存して件数を返す"""
+    http_client = http_client or get_http_client(config.get("http"), logger=logger)
+
+    jobs = []
+    for source_type, key in SOURCE_KEYS.items():
+        recorder = ResponseRecorder(source_type, archive, logger=logger, http_client=http_client)
+        jobs.extend((recorder, source) for source in config.get(key, []) if source.get("enabled", True))
+
+    fetch_engine = FetchEngine(
+        max_concurrency=config["general"].get("max_concurrency", 10),
+        per_host_concurrency=config["general"].get("per_host_concurrency", 2),
+        logger=logger
+    )
+    fetch_engine.run(jobs)
+
+    return len(jobs)
+
+
+class ResponseReplayer:
+    """アーカイブしたレスポンスを解析・重複排除し直すクラス（ネットワークには接続しない）"""
+
+    def __init__(self, archive, config, deduplicator=None, logger=None):
+        self.archive = archive
+        self.logger = logger
+
+        # 重複排除に使う監視済み状態（Noneの場合は重複排除しない）
+        self.deduplicator = deduplicator
+
+        # 解析モジュール
+        self.rss_parser = RSSParser(logger=logger)
+        general = config.get("general", {})
+        backend = general.get("html_parser")
+        self.html_parser = HTMLParser(logger=logger, backend=backend, partial_parse=general.get("partial_parse", True))
+        self.video_parser = VideoParser(logger=logger, backend=backend)
+        self.encoding_resolver = EncodingResolver(logger=logger)
+
+        # 現在の設定のソース（セレクタ修正後の再解析に使う）
+        self.sources = {
+            (source_type, source['url']): source
+            for source_type, key in SOURCE_KEYS.items()
+            for source in config.get(key, [])
+        }
+
+    def _parse(self, entry, response):
+        """種別に応じた解析モジュールでエントリを抽出"""
+        source_type = entry['type']
+        source = self.sources.get((source_type, entry['url']), {})
+        source_name = source.get('name', entry.get('source', ''))
+
+        if source_type == 'rss':
+            return self.rss_parser.parse(
+                response.content, source_name=source_name, response_headers=dict(response.headers), base_url=response.url
+            )
+
+        response.encoding = self.encoding_resolver.resolve_response(response)
+
+        if source_type == 'html':
+            return self.html_parser.parse(response.text, entry['url'], source.get('selector'), source_name, source.get('parser'))
+
+        if source_type == 'video':
+            return self.video_parser.parse_video_page(
+                response.text, entry['url'], source.get('video_selector'), source_name, source.get('parser')
+            )
+
+        return []
+
+    def replay(self, source_type=None, source_name=None, since=None, until=None):
+        """保存済みレスポンスを古い順に再解析して集計結果を返す"""
+        stats = {'responses': 0, 'entries': 0, 'new_entries': [], 'elapsed': 0.0}
+        started = time.perf_counter()
+
+        for entry in self.archive.entries(source_type=source_type, source_name=source_name, since=since, until=until):
+            # 本文のないレスポンス（304・エラー）は解析しない
+            if entry.get('status') != 200 or not entry.get('hash'):
+                continue
+
+            try:
+                response = self.archive.to_response(entry)
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"アーカイブ読み込みエラー: {entry.get('source')} ({entry['time']}) - {e}")
+                continue
+
+            items = self._parse(entry, response)
+            stats['responses'] += 1
+            stats['entries'] += len(items)
+
+            if self.deduplicator is None:
+                continue
+
+            # 取得時刻順に重複排除し、初めて現れたエントリを新着とする
+            for item in items:
+                link = item.get('link') or item.get('url')
+                if not link:
+                    continue
+                if self.deduplicator.is_new_url(link, entry['url'], entry['type']):
+                    self.deduplicator.mark_as_processed(link, entry['url'], entry['type'], save=False)
+                    stats['new_entries'].append(dict(item, fetched_at=entry['time']))
+
+        if self.deduplicator is not None:
+            self.deduplicator.save()
+
+        stats['elapsed'] = time.perf_counter() - started
+
+        if self.logger:
+            self.logger.success(
+                f"再解析完了: {stats['responses']}件のレスポンス, {stats['entries']}件のエントリ, "
+                f"新着 {len(stats['new_entries'])}件 ({stats['elapsed']:.2f}秒)"
+            )
+
+        return stats
@@ -0,0 +1,164 @@
+from pathlib import Path
+
+from src.fetcher.rss_fetcher import RSSFetcher
+from src.fetcher.html_scraper import HTMLScraper
+from src.fetcher.fetch_engine import FetchEngine
+from src.utils.http_client import get_http_client
+from src.utils.notifier import Notifier
+from src.utils.poll_scheduler import PollScheduler
+from src.utils.circuit_breaker import CircuitBreaker
+from src.storage.response_archive import ResponseArchive
+from src.storage.db_storage import DBStorage
+from src.storage.state_manager import get_state_manager
+from src.watcher.pipeline import URLPipeline
+
+
+def create_poll_scheduler(config, data_dir, logger=None, state=None):
+    """設定から適応ポーリングスケジューラを作成"""
+    general = config["general"]
+    return PollScheduler(
+        data_dir=data_dir,
+        min_interval=general.get("min_poll_interval", general.get("execution_interval", 15)),
+        max_interval=general.get("max_poll_interval", 1440),
+        enabled=general.get("adaptive_polling", True),
+        logger=logger,
+        state=state
+    )
+
+
+def create_circuit_breaker(config, data_dir, logger=None):
+    """設定からサーキットブレーカーを作成（無効の場合はNone）"""
+    breaker_config = config.get("circuit_breaker") or {}
+    if not breaker_config.get("enabled", True):
+        return None
+
+    return CircuitBreaker(
+        data_dir=data_dir,
+        failure_threshold=breaker_config.get("failure_threshold", 3),
+        cooldown=breaker_config.get("cooldown", 600),
+        max_cooldown=breaker_config.get("max_cooldown", 3600),
+        logger=logger
+    )
+
+
+def create_db_storage(config, data_dir, logger=None):
+    """設定から新着エントリの保存先を作成（無効の場合はNone）"""
+    storage_config = config.get("storage") or {}
+    if not storage_config.get("database", False):
+        return None
+
+    return DBStorage(data_dir=data_dir, db_name=storage_config.get("db_name", "govinfo.db"), logger=logger)
+
+
+def create_response_archive(config, data_dir, logger=None):
+    """設定からレスポンスアーカイブを作成（無効の場合はNone）"""
+    archive_config = config.get("archive") or {}
+    if not archive_config.get("enabled", False):
+        return None
+
+    return ResponseArchive(
+        Path(data_dir) / archive_config.get("dir", "archive"),
+        compression=archive_config.get("compression", "auto"),
+        logger=logger
+    )
+
+
+class URLWatcher:
+    """RSS/固定URLの監視を1巡回ずつ実行するクラス"""
+
+    def __init__(self, config, data_dir="data", logger=None, http_client=None):
+        self.data_dir = Path(data_dir)
+        self.logger = logger
+
+        # データディレクトリが存在しない場合は作成
+        self.data_dir.mkdir(exist_ok=True, parents=True)
+
+        # プロセス共通の監視済み状態（フェッチャー・スケジューラで共有し、巡回の終わりにまとめて保存）
+        self.state = get_state_manager(self.data_dir, logger=logger)
+
+        # 共通HTTPクライアントの初期化（ホスト単位のサーキットブレーカー付き）
+        self.http_client = http_client or get_http_client(
+            config.get("http"), logger=logger, circuit_breaker=create_circuit_breaker(config, self.data_dir, logger=logger)
+        )
+
+        # ソース単位でも同じサーキットブレーカーを使う
+        self.circuit_breaker = self.http_client.circuit_breaker
+
+        # 取得したレスポンスの保存先
+        archive = create_response_archive(config, self.data_dir, logger=logger)
+
+        # RSSフェッチャーの初期化
+        self.rss_fetcher = RSSFetcher(
+            data_dir=self.data_dir, logger=logger, http_client=self.http_client,
+            archive=archive, circuit_breaker=self.circuit_breaker, state=self.state
+        )
+
+        # HTMLスクレイパーの初期化
+        self.html_scraper = HTMLScraper(
+            data_dir=self.data_dir, logger=logger, http_client=self.http_client,
+            archive=archive, circuit_breaker=self.circuit_breaker, state=self.state
+        )
+
+        self.update_config(config)
+
+    def update_config(self, config):
+        """設定を反映（フェッチャーの監視済み状態や接続は維持）"""
+        self.config = config
+
+        # HTMLパーサーと部分解析の有無（ソースごとのparser・partial_parseで上書き可）
+        self.html_scraper.parser_backend = config["general"].get("html_parser")
+        self.html_scraper.partial_parse = config["general"].get("partial_parse", True)
+
+        # 整形式のフィードを逐次解析するか（falseの場合は常にfeedparserで解析）
+        self.rss_fetcher.fast_parse = config["general"].get("fast_feed_parser", True)
+
+        # 並行取得エンジンの初期化
+        self.fetch_engine = FetchEngine(
+            max_concurrency=config["general"].get("max_concurrency", 10),
+            per_host_concurrency=config["general"].get("per_host_concurrency", 2),
+            logger=self.logger
+        )
+
+        # 適応ポーリングスケジューラの初期化
+        self.scheduler = create_poll_scheduler(config, self.data_dir, logger=self.logger, state=self.state)
+
+        # 通知モジュールの初期化
+        self.notifier = Notifier(config["notification"], logger=self.logger, http_client=self.http_client)
+
+        # 取得→解析・重複排除→保存→通知のパイプライン
+        self.pipeline = URLPipeline(
+            self.fetch_engine,
+            notifier=self.notifier,
+            storage=create_db_storage(config, self.data_dir, logger=self.logger),
+            scheduler=self.scheduler,
+            parse_workers=config["general"].get("parse_workers", 1),
+            queue_size=config["general"].get("pipeline_queue_size", 20),
+            logger=self.logger
+        )
+
+    def run(self):
+        """URL監視を1回実行して新着エントリの件数を返す"""
+        if self.logger:
+            self.logger.info("URL監視処理を開始します")
+
+        # RSS/HTML取得ジョブの作成（取得時刻になったソースのみ）
+        jobs = [("rss", self.rss_fetcher, source) for source in self.scheduler.filter_due("rss", self.config["rss_sources"])]
+        jobs += [("html", self.html_scraper, source) for source in self.scheduler.filter_due("html", self.config["html_sources"])]
+
+        # 監視済みURL・フィード状態・取得時刻・サーキット状態は巡回の終わりに1度だけ保存
+        with self.state.sweep():
+            # 取得したソースから順に解析し、新着エントリを保存・通知へ流す（取得時刻もソースごとに更新）
+            total = self.pipeline.run(jobs)
+            self.scheduler.save()
+
+            if self.circuit_breaker:
+                self.circuit_breaker.save()
+
+        # 停止中のソース・ホストの出力
+        if self.circuit_breaker:
+            self.circuit_breaker.log_summary()
+
+        if self.logger:
+            self.logger.info("URL監視処理が完了しました")
+
+        return total
@@ -0,0 +1,156 @@
+import os
+from pathlib import Path
+from datetime import datetime
+
+from src.fetcher.video_fetcher import VideoFetcher
+from src.processor.video_capture import VideoCapture
+from src.processor.transcriber import Transcriber
+from src.processor.summarizer import Summarizer
+from src.utils.http_client import get_http_client
+from src.utils.http_cache import HTTPCache
+from src.utils.notifier import Notifier
+from src.storage.state_manager import get_state_manager
+from src.watcher.url_watcher import create_poll_scheduler, create_response_archive, create_circuit_breaker
+
+
+class VideoWatcher:
+    """動画監視を1巡回ずつ実行するクラス（Whisperモデルは初期化時に1度だけロード）"""
+
+    def __init__(self, config, secrets=None, data_dir="data", logger=None, http_client=None):
+        self.data_dir = Path(data_dir)
+        self.logger = logger
+        secrets = secrets or {}
+
+        # データディレクトリが存在しない場合は作成
+        self.data_dir.mkdir(exist_ok=True, parents=True)
+
+        # プロセス共通の監視済み状態（フェッチャー・スケジューラで共有し、巡回の終わりにまとめて保存）
+        self.state = get_state_manager(self.data_dir, logger=logger)
+
+        # 共通HTTPクライアントの初期化（ホスト単位のサーキットブレーカー付き）
+        self.http_client = http_client or get_http_client(
+            config.get("http"), logger=logger, circuit_breaker=create_circuit_breaker(config, self.data_dir, logger=logger)
+        )
+
+        # ソース単位でも同じサーキットブレーカーを使う
+        self.circuit_breaker = self.http_client.circuit_breaker
+
+        # リンク先ページ・m3u8のディスクキャッシュの初期化
+        cache_config = config.get("http_cache") or {}
+        http_cache = None
+        if cache_config.get("enabled", True):
+            http_cache = HTTPCache(
+                self.data_dir / "http_cache",
+                max_bytes=int(cache_config.get("max_size_mb", 100) * 1024 * 1024),
+                default_ttl=cache_config.get("default_ttl", 0),
+                logger=logger
+            )
+
+        # 動画フェッチャーの初期化
+        self.video_fetcher = VideoFetcher(
+            data_dir=self.data_dir,
+            logger=logger,
+            http_client=self.http_client,
+            detail_workers=config["general"].get("detail_workers", 4),
+            http_cache=http_cache,
+            archive=create_response_archive(config, self.data_dir, logger=logger),
+            circuit_breaker=self.circuit_breaker,
+            state=self.state
+        )
+
+        # 動画キャプチャの初期化
+        self.video_capture = VideoCapture(data_dir=self.data_dir, logger=logger)
+
+        # 文字起こしモジュールの初期化
+        self.transcriber = Transcriber(data_dir=self.data_dir, logger=logger)
+
+        # 要約モジュールの初期化
+        openai_api_key = secrets.get("openai_api_key", os.environ.get("OPENAI_API_KEY"))
+        self.summarizer = Summarizer(data_dir=self.data_dir, logger=logger, api_key=openai_api_key)
+
+        self.update_config(config)
+
+    def update_config(self, config):
+        """設定を反映（ロード済みのモデルや監視済み状態は維持）"""
+        self.config = config
+
+        # HTMLパーサー（ソースごとのparserで上書き可）
+        self.video_fetcher.parser_backend = config["general"].get("html_parser")
+
+        # 適応ポーリングスケジューラの初期化
+        self.scheduler = create_poll_scheduler(config, self.data_dir, logger=self.logger, state=self.state)
+
+        # 通知モジュールの初期化
+        self.notifier = Notifier(config["notification"], logger=self.logger, http_client=self.http_client)
+
+    def run(self):
+        """動画監視を1回実行して処理済み動画を返す"""
+        if self.logger:
+            self.logger.info("動画監視処理を開始します")
+
+        # 動画取得処理
+        new_videos = []
+        processed_videos = []
+
+        # 監視済みURL・取得時刻・サーキット状態は巡回の終わりに1度だけ保存
+        with self.state.sweep():
+            for source in self.scheduler.filter_due("video", self.config["video_sources"]):
+                videos = self.video_fetcher.fetch_videos(source)
+
+                # 取得に失敗したソースは取得間隔を延ばさない
+                if videos is None:
+                    continue
+
+                new_videos.extend(videos)
+
+                # 取得結果から次回の取得時刻を更新
+                self.scheduler.record("video", source, len(videos))
+
+            self.scheduler.save()
+
+            if self.circuit_breaker:
+                self.circuit_breaker.save()
+
+        # 停止中のソース・ホストの出力
+        if self.circuit_breaker:
+            self.circuit_breaker.log_summary()
+
+        # 見つかった動画の処理
+        for video in new_videos:
+            # キャプチャ処理
+            metadata = self.video_capture.capture(video)
+
+            if metadata and video.get("summarize", True):
+                # 文字起こし処理
+                transcript = self.transcriber.transcribe(video)
+
+                if transcript:
+                    # 要約処理
+                    summary = self.summarizer.summarize(transcript)
+
+                    if summary:
+                        processed_video = {
+                            "id": video["id"],
+                            "title": video["title"],
+                            "url": video["url"],
+                            "source_name": video["source_name"],
+                            "source_url": video["source_url"],
+                            "processed_date": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                            "summary": summary.get("summary", "要約なし"),
+                            "screenshots": metadata.get("screenshots", [])
+                        }
+
+                        processed_videos.append(processed_video)
+
+        # 新着動画の通知
+        if processed_videos:
+            if self.logger:
+                self.logger.info(f"合計 {len(processed_videos)} 件の動画を処理しました")
+            self.notifier.notify_video_updates(processed_videos)
+        elif self.logger:
+            self.logger.info("新着動画はありませんでした")
+
+        if self.logger:
+            self.logger.info("動画監視処理が完了しました")
+
+        return processed_videos
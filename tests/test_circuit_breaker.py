@@ -0,0 +1,176 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from pathlib import Path
+import tempfile
+import sys
+import requests
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from src.utils.http_client import HTTPClient, RateLimitDeadlineExceeded
+
+
+class FakeClock:
+    """テスト用の時計"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+        self.logger = MagicMock()
+        self.breaker = self._create()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _create(self, **kwargs):
+        return CircuitBreaker(
+            data_dir=self.temp_dir.name, failure_threshold=3, cooldown=60, max_cooldown=200,
+            logger=self.logger, clock=self.clock, **kwargs
+        )
+
+    def test_opens_after_consecutive_failures(self):
+        key = "host:down.example.jp"
+        for _ in range(2):
+            self.breaker.record_failure(key, "timeout")
+        self.assertTrue(self.breaker.allow(key))
+
+        self.breaker.record_failure(key, "timeout")
+
+        self.assertEqual(self.breaker.get_state(key), CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow(key))
+        self.logger.warning.assert_called()
+
+    def test_success_resets_failure_count(self):
+        key = "rss:https://example.jp/rss.xml"
+        self.breaker.record_failure(key)
+        self.breaker.record_failure(key)
+        self.breaker.record_success(key)
+        self.breaker.record_failure(key)
+
+        self.assertEqual(self.breaker.get_state(key), CircuitBreaker.CLOSED)
+
+    def test_success_without_failures_does_not_write_state(self):
+        self.breaker.record_success("rss:https://example.jp/rss.xml")
+        self.breaker.save()
+
+        # 失敗の記録がなければ状態ファイルを書き込まない
+        self.assertFalse((Path(self.temp_dir.name) / "circuit_state.json").exists())
+
+    def test_half_open_allows_single_probe(self):
+        key = "host:down.example.jp"
+        for _ in range(3):
+            self.breaker.record_failure(key)
+
+        self.clock.now += 61
+
+        # 冷却期間後は1件だけ試行できる
+        self.assertTrue(self.breaker.allow(key))
+        self.assertEqual(self.breaker.get_state(key), CircuitBreaker.HALF_OPEN)
+        self.assertFalse(self.breaker.allow(key))
+
+        # 試行が成功すれば閉じる
+        self.breaker.record_success(key)
+        self.assertEqual(self.breaker.get_state(key), CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow(key))
+
+    def test_failed_probe_extends_cooldown(self):
+        key = "host:down.example.jp"
+        for _ in range(3):
+            self.breaker.record_failure(key)
+
+        for expected in (120, 200, 200):
+            self.clock.now += 1000
+            self.assertTrue(self.breaker.allow(key))
+            self.breaker.record_failure(key)
+            self.assertEqual(self.breaker.states[key]["cooldown"], expected)
+
+        self.clock.now += 199
+        self.assertFalse(self.breaker.allow(key))
+
+    def test_state_is_persisted(self):
+        key = "html:https://example.jp/news/"
+        for _ in range(3):
+            self.breaker.record_failure(key, "HTTP 404")
+        self.breaker.save()
+
+        reloaded = self._create()
+
+        self.assertFalse(reloaded.allow(key))
+        self.assertEqual(reloaded.get_open_keys(), [key])
+        self.assertEqual(reloaded.states[key]["last_error"], "HTTP 404")
+
+    def test_disabled(self):
+        breaker = self._create(enabled=False)
+        for _ in range(5):
+            breaker.record_failure("host:down.example.jp")
+
+        self.assertTrue(breaker.allow("host:down.example.jp"))
+
+
+class TestHTTPClientCircuit(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.breaker = CircuitBreaker(data_dir=self.temp_dir.name, failure_threshold=2, cooldown=600)
+        self.client = HTTPClient(
+            config={"max_retries": 0, "rate_limit": {"enabled": False}},
+            circuit_breaker=self.breaker
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_open_host_fails_fast_without_delaying_others(self):
+        def request(method, url, **kwargs):
+            if "down.example.jp" in url:
+                raise requests.ConnectTimeout("タイムアウト")
+            return MagicMock(status_code=200, headers={})
+
+        with patch.object(self.client.session, "request", side_effect=request) as mock_request:
+            for _ in range(2):
+                with self.assertRaises(requests.ConnectTimeout):
+                    self.client.get("https://down.example.jp/a", max_bytes=0, deadline=0)
+
+            # 停止中のホストには接続しない
+            with self.assertRaises(CircuitOpenError):
+                self.client.get("https://down.example.jp/b", max_bytes=0, deadline=0)
+            self.assertEqual(mock_request.call_count, 2)
+
+            # 他のホストは影響を受けない
+            response = self.client.get("https://www.example.jp/", max_bytes=0, deadline=0)
+            self.assertEqual(response.status_code, 200)
+
+    def test_server_errors_count_as_failures(self):
+        with patch.object(self.client.session, "request", return_value=MagicMock(status_code=503, headers={})):
+            self.client.get("https://flaky.example.jp/", max_bytes=0, deadline=0)
+            self.client.get("https://flaky.example.jp/", max_bytes=0, deadline=0)
+
+        self.assertEqual(self.breaker.get_state("host:flaky.example.jp"), CircuitBreaker.OPEN)
+
+    def test_local_throttling_is_not_a_failure(self):
+        client = HTTPClient(
+            config={"max_retries": 0, "rate_limit": {"requests_per_second": 0.01, "burst": 1}},
+            circuit_breaker=self.breaker
+        )
+        with patch.object(client.session, "request", return_value=MagicMock(status_code=200, headers={})) as mock_request:
+            client.get("https://slow.example.jp/", max_bytes=0, deadline=5)
+            for _ in range(2):
+                with self.assertRaises(RateLimitDeadlineExceeded):
+                    client.get("https://slow.example.jp/", max_bytes=0, deadline=5)
+
+        # 送信速度制御で送らなかったリクエストはホストの障害にしない
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertEqual(self.breaker.get_state("host:slow.example.jp"), CircuitBreaker.CLOSED)
+
+
+if __name__ == '__main__':
+    unittest.main()
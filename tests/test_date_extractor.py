@@ -0,0 +1,132 @@
+import unittest
+from pathlib import Path
+import re
+import sys
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.parser.backends import parse_html, is_backend_available
+from src.parser.date_extractor import DateExtractor, normalize_date
+
+FIXTURE_DIR = root_dir / "tests" / "fixtures" / "html"
+
+
+def reference_extract(element):
+    """従来の抽出方法（クラスごと・time要素・全文検索を順に探索）"""
+    for cls in ['date', 'time', 'datetime', 'published', 'updated']:
+        date_element = element.find(class_=re.compile(cls, re.IGNORECASE))
+        if date_element:
+            return date_element.get_text(strip=True)
+
+    time_element = element.find('time')
+    if time_element:
+        if time_element.has_attr('datetime'):
+            return time_element['datetime']
+        return time_element.get_text(strip=True)
+
+    text = element.get_text()
+    date_match = re.search(r'\d{4}[/-]\d{1,2}[/-]\d{1,2}', text) or re.search(r'\d{4}年\d{1,2}月\d{1,2}日', text)
+    return date_match.group(0) if date_match else None
+
+
+class TestNormalizeDate(unittest.TestCase):
+    def test_formats(self):
+        cases = {
+            "2025/5/1": "2025-05-01 00:00:00",
+            "2025-05-20": "2025-05-20 00:00:00",
+            "2025.05.19": "2025-05-19 00:00:00",
+            "2025年5月22日": "2025-05-22 00:00:00",
+            "２０２５年５月２２日（木）": "2025-05-22 00:00:00",
+            "2025年5月22日(木) 10:30": "2025-05-22 10:30:00",
+            "2025-05-20T10:00:00+09:00": "2025-05-20 10:00:00",
+            "掲載日：2025/05/21 更新": "2025-05-21 00:00:00",
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(normalize_date(text), expected)
+
+    def test_japanese_era(self):
+        cases = {
+            "令和7年5月17日": "2025-05-17 00:00:00",
+            "令和元年5月1日": "2019-05-01 00:00:00",
+            "平成31年4月30日": "2019-04-30 00:00:00",
+            "昭和64年1月7日": "1989-01-07 00:00:00",
+            "令和 7 年 5 月 1 日": "2025-05-01 00:00:00",
+            "R7.5.17": "2025-05-17 00:00:00",
+            "H30.1.2": "2018-01-02 00:00:00",
+            "㋿7年5月17日": "2025-05-17 00:00:00",
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(normalize_date(text), expected)
+
+    def test_invalid(self):
+        for text in ["", None, "お知らせ", "ver 1.2.3", "12025/1/1", "ITEM12.5.3", "2025年2月30日"]:
+            with self.subTest(text=text):
+                self.assertIsNone(normalize_date(text))
+
+        # 存在しない日付の後にある日付を使う
+        self.assertEqual(normalize_date("2025/2/30 訂正 2025/3/1"), "2025-03-01 00:00:00")
+
+    def test_memoized(self):
+        normalize_date.cache_clear()
+        for _ in range(3):
+            normalize_date("2025年5月22日")
+
+        self.assertEqual(normalize_date.cache_info().hits, 2)
+
+
+class TestDateExtractor(unittest.TestCase):
+    def setUp(self):
+        self.extractor = DateExtractor()
+
+    def _extract(self, html, backend="html.parser"):
+        return self.extractor.extract(parse_html(html, backend).select("li")[0])
+
+    def test_class_priority(self):
+        # dateを含むクラスはtime要素より優先
+        html = '<ul><li><time datetime="2025-01-01">1月1日</time><span class="post-date">2025年5月2日</span></li></ul>'
+        self.assertEqual(self._extract(html), "2025-05-02 00:00:00")
+
+        # dateがない場合はtimeを含むクラス（大文字・小文字は区別しない）
+        html = '<ul><li><span class="Published">2025/5/3</span><span class="TimeStamp">2025/5/4</span></li></ul>'
+        self.assertEqual(self._extract(html), "2025-05-04 00:00:00")
+
+    def test_time_element_and_text(self):
+        html = '<ul><li><time datetime="2025-05-20T09:30:00+09:00">5月20日</time><a href="/a">記事</a></li></ul>'
+        self.assertEqual(self._extract(html), "2025-05-20 09:30:00")
+
+        html = '<ul><li><a href="/a">記事</a>（令和7年5月21日掲載）</li></ul>'
+        self.assertEqual(self._extract(html), "2025-05-21 00:00:00")
+
+        self.assertIsNone(self._extract('<ul><li><a href="/a">日付なし</a></li></ul>'))
+
+    def test_unparseable_class_falls_through(self):
+        html = '<ul><li><span class="time">更新</span> 2025年5月22日</li></ul>'
+        self.assertEqual(self._extract(html), "2025-05-22 00:00:00")
+
+    def test_unparseable_date_class_keeps_scanning(self):
+        # dateクラスの要素が日付でない場合は後ろの要素も探す
+        html = '<ul><li><span class="date">新着</span><a href="/a">記事</a><time datetime="2025-05-23">5月23日</time></li></ul>'
+        self.assertEqual(self._extract(html), "2025-05-23 00:00:00")
+
+        html = '<ul><li><span class="update-date">-</span><span class="published">2025/5/24</span></li></ul>'
+        self.assertEqual(self._extract(html), "2025-05-24 00:00:00")
+
+    def test_matches_reference_on_fixtures(self):
+        """従来の方法で抽出した文字列を正規化した結果と一致する"""
+        backends = [backend for backend in ("html.parser", "lxml", "selectolax") if is_backend_available(backend)]
+        for name, selector in [("news_list.html", ".news-list li"), ("news_dl.html", ".news-list dt, .news-list .news-item")]:
+            html = (FIXTURE_DIR / name).read_text(encoding="utf-8")
+            expected = [normalize_date(reference_extract(element)) for element in parse_html(html, "html.parser").select(selector)]
+            self.assertTrue(any(expected))
+
+            for backend in backends:
+                with self.subTest(fixture=name, backend=backend):
+                    actual = [self.extractor.extract(element) for element in parse_html(html, backend).select(selector)]
+                    self.assertEqual(actual, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
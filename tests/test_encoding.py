@@ -0,0 +1,116 @@
+import unittest
+from pathlib import Path
+import sys
+import codecs
+import requests
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.encoding import EncodingResolver, normalize_encoding
+
+
+JAPANESE_TEXT = "消防庁からのお知らせ①　令和６年度の通知一覧"
+
+
+def make_response(body, content_type=None, url="https://www.example.go.jp/news.html"):
+    """テスト用のResponseを作成"""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.url = url
+    if content_type:
+        response.headers['Content-Type'] = content_type
+    return response
+
+
+class TestNormalizeEncoding(unittest.TestCase):
+    def test_shift_jis_is_read_as_cp932(self):
+        """Shift_JIS表記は機種依存文字を含むcp932として扱う"""
+        self.assertEqual(normalize_encoding("Shift_JIS"), "cp932")
+        self.assertEqual(normalize_encoding("x-sjis"), "cp932")
+        self.assertEqual(normalize_encoding("Windows-31J"), "cp932")
+
+    def test_known_and_unknown_labels(self):
+        """既知の表記は正規化し、未知の表記はNone"""
+        self.assertEqual(normalize_encoding("EUC-JP"), "euc_jp")
+        self.assertEqual(normalize_encoding("UTF8"), "utf-8")
+        self.assertEqual(normalize_encoding("us-ascii"), "utf-8")
+        self.assertIsNone(normalize_encoding("no-such-charset"))
+        self.assertIsNone(normalize_encoding(None))
+
+
+class TestEncodingResolver(unittest.TestCase):
+    def setUp(self):
+        self.resolver = EncodingResolver()
+
+    def test_header_charset(self):
+        """Content-Typeヘッダーのcharsetを優先"""
+        body = f"<html><body>{JAPANESE_TEXT}</body></html>".encode("cp932")
+        response = make_response(body, "text/html; charset=Shift_JIS")
+
+        response.encoding = self.resolver.resolve_response(response)
+
+        self.assertEqual(response.encoding, "cp932")
+        self.assertIn(JAPANESE_TEXT, response.text)
+
+    def test_meta_charset(self):
+        """ヘッダーにcharsetがなければmetaタグから判定"""
+        body = (
+            '<html><head><meta http-equiv="Content-Type" content="text/html; charset=EUC-JP">'
+            f'</head><body>{JAPANESE_TEXT.replace("①", "")}</body></html>'
+        ).encode("euc_jp")
+        response = make_response(body, "text/html")
+
+        response.encoding = self.resolver.resolve_response(response)
+
+        self.assertEqual(response.encoding, "euc_jp")
+        self.assertIn("消防庁からのお知らせ", response.text)
+
+    def test_bom(self):
+        """BOM付きUTF-8はBOMを除いて読む"""
+        body = codecs.BOM_UTF8 + f"<p>{JAPANESE_TEXT}</p>".encode("utf-8")
+        response = make_response(body)
+
+        response.encoding = self.resolver.resolve_response(response)
+
+        self.assertEqual(response.encoding, "utf-8-sig")
+        self.assertTrue(response.text.startswith("<p>"))
+
+    def test_xml_declaration(self):
+        """XML宣言のencodingから判定"""
+        body = f'<?xml version="1.0" encoding="Shift_JIS"?><rss><title>{JAPANESE_TEXT}</title></rss>'.encode("cp932")
+
+        self.assertEqual(self.resolver.resolve(body), "cp932")
+
+    def test_detect_without_hints(self):
+        """手がかりがない場合は本文から判定"""
+        utf8_body = f"<p>{JAPANESE_TEXT}</p>".encode("utf-8")
+        self.assertEqual(self.resolver.resolve(utf8_body), "utf-8")
+
+        sjis_body = f"<p>{JAPANESE_TEXT * 20}</p>".encode("cp932")
+        encoding = self.resolver.resolve(sjis_body)
+        self.assertIn(JAPANESE_TEXT, sjis_body.decode(encoding))
+
+    def test_host_memory(self):
+        """同じホストの2ページ目以降は前回の判定結果を使う"""
+        first = f"<p>{JAPANESE_TEXT}</p>".encode("cp932")
+        self.resolver.resolve(first, {"Content-Type": "text/html; charset=Shift_JIS"}, "https://www.example.go.jp/a.html")
+
+        # ヘッダーもmetaもない短い本文（単独では判定が難しい）
+        second = "一覧".encode("cp932")
+        encoding = self.resolver.resolve(second, {}, "https://www.example.go.jp/b.html")
+
+        self.assertEqual(encoding, "cp932")
+        self.assertEqual(self.resolver.resolve(second, {}, "https://other.example.jp/"), self.resolver._detect(second))
+
+    def test_sample_truncated_inside_multibyte_char(self):
+        """サンプルの末尾でマルチバイト文字が切れてもUTF-8と判定"""
+        resolver = EncodingResolver(sample_bytes=10)
+        body = "あいうえおかきくけこ".encode("utf-8")
+
+        self.assertEqual(resolver.resolve(body), "utf-8")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from pathlib import Path
+import sys
+import feedparser
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.parser.fast_feed_parser import FastFeedParser, FeedParseError
+from src.parser.rss_parser import RSSParser
+
+# 比較する項目
+FIELDS = ('title', 'link', 'id', 'summary', 'description', 'published_parsed', 'updated_parsed')
+
+RSS20 = '''<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel><title>総務省消防庁</title><link>https://www.fdma.go.jp/</link>
+<item><title> 消防白書 &amp; 資料 </title><link> https://www.fdma.go.jp/a.html </link><guid isPermaLink="false">id-1</guid>
+<pubDate>Thu, 22 May 2025 10:00:00 +0900</pubDate><description><![CDATA[<p>本文です</p>]]></description></item>
+<item><title>guidのみ</title><guid>https://www.fdma.go.jp/b.html</guid><pubDate>Wed, 21 May 2025 09:00:00 GMT</pubDate><description>説明</description></item>
+<item><title>dc:date</title><link>https://www.fdma.go.jp/c.html</link><dc:date>2025-05-20T10:00:00+09:00</dc:date>
+<content:encoded><![CDATA[<b>本文</b>]]></content:encoded></item>
+<item><title>日付なし</title><link>https://www.fdma.go.jp/d.html</link></item>
+</channel></rss>'''
+
+RDF = '''<?xml version="1.0" encoding="UTF-8"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/" xmlns:dc="http://purl.org/dc/elements/1.1/">
+<channel rdf:about="https://www.kantei.go.jp/"><title>首相官邸</title><link>https://www.kantei.go.jp/</link><description>新着</description></channel>
+<item rdf:about="https://www.kantei.go.jp/1.html"><title>記者会見</title><link>https://www.kantei.go.jp/1.html</link>
+<description>会見の説明</description><dc:date>2025-05-22T18:00:00+09:00</dc:date></item>
+<item rdf:about="https://www.kantei.go.jp/2.html"><title>閣議</title><link>https://www.kantei.go.jp/2.html</link><dc:date>2025-05-21</dc:date></item>
+</rdf:RDF>'''
+
+ATOM = '''<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>政府広報</title><id>urn:gov</id><updated>2025-05-22T00:00:00Z</updated>
+<entry><title>お知らせ1</title><link rel="alternate" href="https://example.jp/1"/><link rel="enclosure" href="https://example.jp/1.mp4"/>
+<id>urn:1</id><published>2025-05-22T10:00:00+09:00</published><updated>2025-05-22T11:00:00+09:00</updated><summary>要約</summary></entry>
+<entry><title>お知らせ2</title><link href="https://example.jp/2"/><id>urn:2</id><updated>2025-05-21T00:00:00Z</updated>
+<content type="html">&lt;p&gt;内容&lt;/p&gt;</content></entry>
+<entry><title>リンクなし</title><id>urn:3</id><updated>2025-05-20T00:00:00Z</updated></entry>
+</feed>'''
+
+SHIFT_JIS = '''<?xml version="1.0" encoding="Shift_JIS"?>
+<rss version="2.0"><channel><title>お知らせ</title>
+<item><title>火災予防運動の実施について</title><link>https://example.jp/s1</link><pubDate>Thu, 22 May 2025 10:00:00 +0900</pubDate></item>
+</channel></rss>'''.encode('cp932')
+
+RELATIVE_RSS = '''<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>相対URL</title><link>/</link>
+<item><title>ルート相対</title><link>/news/1.html</link></item>
+<item><title>相対</title><link>detail/2.html</link><guid isPermaLink="false">id-2</guid></item>
+<item><title>guidのみ</title><guid>detail/3.html</guid></item>
+<item><title>xml:base</title><link xml:base="https://other.example.jp/base/">4.html</link></item>
+</channel></rss>'''
+
+RELATIVE_ATOM = '''<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xml:base="https://example.jp/feed/"><title>相対URL</title><id>urn:gov</id>
+<entry><title>1</title><link href="1.html"/><id>urn:1</id><updated>2025-05-22T00:00:00Z</updated></entry>
+<entry xml:base="/archive/"><title>2</title><link href="2.html"/><id>urn:2</id><updated>2025-05-21T00:00:00Z</updated></entry>
+<entry><title>3</title><id>detail/3</id><updated>2025-05-20T00:00:00Z</updated></entry>
+</feed>'''
+
+
+def normalize(entry):
+    """比較する項目だけを取り出す（日時は年〜秒）"""
+    return {
+        key: tuple(entry[key][:6]) if key.endswith('_parsed') else entry[key]
+        for key in FIELDS if key in entry
+    }
+
+
+class TestFastFeedParser(unittest.TestCase):
+    def setUp(self):
+        self.parser = FastFeedParser()
+
+    def _assert_same_as_feedparser(self, content, headers=None, base_url=None):
+        feed_headers = dict(headers or {}, **({'content-location': base_url} if base_url else {}))
+        expected = [normalize(entry) for entry in feedparser.parse(content, response_headers=feed_headers).entries]
+        with patch('src.parser.fast_feed_parser.feedparser.parse') as mock_parse:
+            actual = [normalize(entry) for entry in self.parser.iter_entries(content, headers, base_url=base_url)]
+
+        # 整形式のフィードはfeedparserを使わない
+        mock_parse.assert_not_called()
+        self.assertTrue(expected)
+        self.assertEqual(actual, expected)
+
+    def test_rss20(self):
+        self._assert_same_as_feedparser(RSS20.encode('utf-8'))
+
+    def test_rdf(self):
+        self._assert_same_as_feedparser(RDF.encode('utf-8'))
+
+    def test_atom(self):
+        self._assert_same_as_feedparser(ATOM.encode('utf-8'))
+
+    def test_shift_jis(self):
+        self._assert_same_as_feedparser(SHIFT_JIS)
+        self._assert_same_as_feedparser(SHIFT_JIS, {'Content-Type': 'application/rss+xml; charset=Shift_JIS'})
+
+    def test_relative_links(self):
+        # 相対URLのリンクはフィードのURL・xml:baseを基準にfeedparserと同じく解決する
+        self._assert_same_as_feedparser(RELATIVE_RSS.encode('utf-8'), base_url='https://example.jp/feed/rss.xml')
+        self._assert_same_as_feedparser(RELATIVE_ATOM.encode('utf-8'), base_url='https://example.jp/feed/atom.xml')
+
+        entries = list(self.parser.iter_entries(RELATIVE_RSS.encode('utf-8'), base_url='https://example.jp/feed/rss.xml'))
+        self.assertEqual([entry['link'] for entry in entries], [
+            'https://example.jp/news/1.html',
+            'https://example.jp/feed/detail/2.html',
+            'https://example.jp/feed/detail/3.html',
+            'https://other.example.jp/base/4.html',
+        ])
+
+    def test_machine_dependent_characters(self):
+        # 機種依存文字もcp932として読み込む
+        content = '<?xml version="1.0" encoding="Shift_JIS"?><rss version="2.0"><channel><item><title>①お知らせ</title></item></channel></rss>'
+        entries = list(self.parser.iter_entries(content.encode('cp932')))
+
+        self.assertEqual(entries[0]['title'], '①お知らせ')
+
+    def test_entries_are_lazy(self):
+        content = RSS20.encode('utf-8')
+        entries = self.parser.iter_entries(content)
+
+        first = next(entries)
+        self.assertEqual(first['link'], 'https://www.fdma.go.jp/a.html')
+        self.assertEqual(len(list(entries)), 3)
+
+    def test_malformed_falls_back_to_feedparser(self):
+        logger = MagicMock()
+        parser = FastFeedParser(logger=logger)
+        # XMLで定義されていない実体参照を含む
+        content = RSS20.replace('<title>guidのみ</title>', '<title>guid&nbsp;のみ</title>').encode('utf-8')
+
+        expected = [normalize(entry) for entry in feedparser.parse(content).entries]
+        actual = [normalize(entry) for entry in parser.iter_entries(content)]
+
+        self.assertEqual(len(actual), 4)
+        self.assertEqual([entry['link'] for entry in actual], [entry['link'] for entry in expected])
+        self.assertEqual(actual[1:], expected[1:])
+        logger.debug.assert_called()
+
+    def test_unsupported_format_falls_back(self):
+        content = b'<?xml version="1.0"?><feed version="0.3" xmlns="http://purl.org/atom/ns#"><entry><title>old</title><link rel="alternate" type="text/html" href="https://example.jp/old"/><id>x</id></entry></feed>'
+
+        entries = list(self.parser.iter_entries(content))
+
+        self.assertEqual(entries[0]['link'], 'https://example.jp/old')
+
+    def test_unparseable(self):
+        with self.assertRaises(FeedParseError):
+            list(self.parser.iter_entries(b'<html><body>Not Found</body>'))
+
+    def test_fast_disabled(self):
+        with patch('src.parser.fast_feed_parser.feedparser.parse', return_value=feedparser.parse(RSS20.encode('utf-8'))) as mock_parse:
+            entries = list(self.parser.iter_entries(RSS20.encode('utf-8'), fast=False))
+
+        mock_parse.assert_called_once()
+        self.assertEqual(len(entries), 4)
+
+
+class TestRSSParserFastPath(unittest.TestCase):
+    def test_parse_bytes_and_feedparser_result(self):
+        parser = RSSParser()
+        fast = parser.parse(RDF.encode('utf-8'), source_name="官邸")
+        slow = parser.parse(feedparser.parse(RDF.encode('utf-8')), source_name="官邸")
+
+        self.assertEqual(fast, slow)
+        self.assertEqual(fast[0]['published'], '2025-05-22 09:00:00')
+
+    def test_parse_error(self):
+        logger = MagicMock()
+        entries = RSSParser(logger=logger).parse(b'<html>', source_name="壊れたフィード")
+
+        self.assertEqual(entries, [])
+        logger.error.assert_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from unittest.mock import MagicMock
+from pathlib import Path
+import sys
+import threading
+import time
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.fetcher.fetch_engine import FetchEngine
+
+
+class SlowFetcher:
+    """同時実行数を記録するテスト用フェッチャー"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = {}
+        self.max_active = {}
+        self.max_total = 0
+
+    def fetch(self, source):
+        host = source['url'].split('/')[2]
+        with self.lock:
+            self.active[host] = self.active.get(host, 0) + 1
+            self.max_active[host] = max(self.max_active.get(host, 0), self.active[host])
+            self.max_total = max(self.max_total, sum(self.active.values()))
+        time.sleep(self.delay)
+        with self.lock:
+            self.active[host] -= 1
+        return [source['name']]
+
+
+class TestFetchEngine(unittest.TestCase):
+    """FetchEngineの並行実行・順序保持・上限制御の検証"""
+
+    def setUp(self):
+        self.logger = MagicMock()
+
+    def test_results_keep_job_order(self):
+        fetcher = SlowFetcher(delay=0.01)
+        jobs = [(fetcher, {"name": f"s{i}", "url": f"https://host{i % 3}.example.jp/{i}"}) for i in range(9)]
+
+        engine = FetchEngine(max_concurrency=4, per_host_concurrency=2, logger=self.logger)
+        results = engine.run(jobs)
+
+        self.assertEqual(results, [[f"s{i}"] for i in range(9)])
+
+    def test_concurrency_limits(self):
+        fetcher = SlowFetcher(delay=0.05)
+        jobs = [(fetcher, {"name": f"s{i}", "url": f"https://host{i % 2}.example.jp/{i}"}) for i in range(8)]
+
+        engine = FetchEngine(max_concurrency=3, per_host_concurrency=1, logger=self.logger)
+        engine.run(jobs)
+
+        self.assertLessEqual(fetcher.max_total, 2)
+        self.assertEqual(max(fetcher.max_active.values()), 1)
+
+    def test_exception_becomes_empty_result(self):
+        fetcher = MagicMock()
+        fetcher.fetch.side_effect = RuntimeError("失敗")
+        jobs = [(fetcher, {"name": "壊れたソース", "url": "https://broken.example.jp/"})]
+
+        engine = FetchEngine(logger=self.logger)
+        results = engine.run(jobs)
+
+        self.assertEqual(results, [[]])
+        self.logger.error.assert_called()
+
+    def test_empty_jobs(self):
+        engine = FetchEngine(logger=self.logger)
+        self.assertEqual(engine.run([]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,6 +5,7 @@ import tempfile
 import sys
 import json
 import requests
+import hashlib
 
 root_dir = Path(__file__).resolve().parent.parent
 sys.path.append(str(root_dir))
@@ -42,49 +43,108 @@ class TestHTMLScraper(unittest.TestCase):
         </body></html>
         '''
 
-    @patch("src.fetcher.html_scraper.requests.get")
+    @patch("src.utils.http_client.HTTPClient.get")
     def test_scrape_extracts_new_links(self, mock_get):
         """正常系: リンク2件抽出 & watched登録"""
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.text = self.sample_html
+        mock_response.content = self.sample_html.encode('utf-8')
         mock_get.return_value = mock_response
 
         new_links = self.scraper.fetch(self.sample_source)
 
         expected = [
             "https://example.com/article1",
-            "https://example.com/article2"
+            "https://example.com/article2",
+            # リンクのない要素は要素のハッシュ値をIDにする
+            "https://example.com/news#" + hashlib.md5("リンクなし記事".encode('utf-8')).hexdigest()
         ]
-        self.assertEqual(sorted(new_links), sorted(expected))
-        self.assertIn(self.sample_source["url"], self.scraper.watched_urls["html"])
-        self.assertTrue(len(self.scraper.watched_urls["html"][self.sample_source["url"]]) >= 2)
+        self.assertEqual(sorted(entry['link'] for entry in new_links), sorted(expected))
+        self.assertTrue(self.scraper.seen_store.has_source("html", self.sample_source["url"]))
+        self.assertTrue(len(self.scraper.seen_store.urls("html", self.sample_source["url"])) >= 2)
 
     def test_watched_url_storage_and_reload(self):
-        """watched_urls.jsonの読み書き"""
-        self.scraper.watched_urls["html"]["dummy"] = ["https://example.com/test"]
-        self.scraper._save_watched_urls()
+        """監視済みURLの保存と再読み込み"""
+        self.scraper.seen_store.add("html", "dummy", "https://example.com/test")
+        self.scraper.seen_store.commit()
 
         reloaded = HTMLScraper(data_dir=self.data_dir, logger=self.mock_logger)
-        self.assertEqual(reloaded.watched_urls["html"]["dummy"], ["https://example.com/test"])
+        self.assertEqual(reloaded.seen_store.urls("html", "dummy"), ["https://example.com/test"])
 
-    @patch("src.fetcher.html_scraper.requests.get")
+    @patch("src.utils.http_client.HTTPClient.get")
     def test_connection_error_handling(self, mock_get):
         mock_get.side_effect = requests.RequestException("失敗")
         result = self.scraper.fetch(self.sample_source)
         self.assertEqual(result, [])
         self.mock_logger.error.assert_called()
 
-    @patch("src.fetcher.html_scraper.requests.get")
+    @patch("src.utils.http_client.HTTPClient.get")
     def test_selector_yields_no_elements(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.text = "<html><body><p>見つからない</p></body></html>"
+        mock_response.content = mock_response.text.encode('utf-8')
         mock_get.return_value = mock_response
 
         result = self.scraper.fetch(self.sample_source)
         self.assertEqual(result, [])
         self.mock_logger.info.assert_called()
 
+    @patch("src.utils.http_client.HTTPClient.get")
+    def test_unchanged_body_skips_parsing(self, mock_get):
+        """本文が前回と同じ場合は解析も監視済みURLの保存も行わない"""
+        html = '<html><body><div class="news-item"><a href="/a1">記事</a></div></body></html>'
+        mock_get.return_value = MagicMock(status_code=200, text=html, content=html.encode('utf-8'))
+
+        first = self.scraper.fetch(self.sample_source)
+        self.assertEqual(len(first), 1)
+
+        with patch("src.fetcher.html_scraper.select_html") as mock_select, \
+                patch.object(self.scraper.seen_store, "add") as mock_add:
+            second = self.scraper.fetch(self.sample_source)
+
+        self.assertEqual(second, [])
+        mock_select.assert_not_called()
+        mock_add.assert_not_called()
+
+    @patch("src.utils.http_client.HTTPClient.get")
+    def test_unchanged_region_skips_dedupe(self, mock_get):
+        """セレクタ範囲外だけが変わった場合は新着判定を省略する"""
+        template = '<html><head><script>var t = "{}";</script></head><body><div class="news-item"><a href="/a1">記事</a></div></body></html>'
+        first_html = template.format("1")
+        second_html = template.format("2")
+
+        mock_get.return_value = MagicMock(status_code=200, text=first_html, content=first_html.encode('utf-8'))
+        self.scraper.fetch(self.sample_source)
+
+        mock_get.return_value = MagicMock(status_code=200, text=second_html, content=second_html.encode('utf-8'))
+        with patch.object(self.scraper.seen_store, "add") as mock_add:
+            result = self.scraper.fetch(self.sample_source)
+
+        self.assertEqual(result, [])
+        mock_add.assert_not_called()
+        self.assertEqual(
+            self.scraper.fingerprints[self.sample_source["url"]]["body"],
+            hashlib.md5(second_html.encode('utf-8')).hexdigest()
+        )
+
+    @patch("src.utils.http_client.HTTPClient.get")
+    def test_legacy_relative_link_not_renotified(self, mock_get):
+        """以前の形式（相対URLのまま）で監視済みのリンクは新着にしない"""
+        html = (
+            '<html><body><div class="news-item"><a href="detail/1.html">既読の記事</a></div>'
+            '<div class="news-item"><a href="detail/2.html">新しい記事</a></div></body></html>'
+        )
+        mock_get.return_value = MagicMock(status_code=200, text=html, content=html.encode('utf-8'))
+        source_id = self.sample_source["url"]
+        self.scraper.seen_store.add("html", source_id, "detail/1.html")
+
+        result = self.scraper.fetch(self.sample_source)
+
+        self.assertEqual([entry['link'] for entry in result], ["https://example.com/detail/2.html"])
+        # 現在の形式でも監視済みになる
+        self.assertTrue(self.scraper.seen_store.contains("html", source_id, "https://example.com/detail/1.html"))
+
     def tearDown(self):
         self.temp_dir.cleanup()
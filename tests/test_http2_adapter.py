@@ -0,0 +1,117 @@
+import unittest
+from unittest.mock import MagicMock
+from pathlib import Path
+import gzip
+import sys
+import requests
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils import http2_adapter
+from src.utils.http2_adapter import HTTP2Adapter
+from src.utils.http_client import HTTPClient, ResponseTooLarge
+
+
+@unittest.skipUnless(http2_adapter.is_http2_available(), "httpx[http2]がインストールされていません")
+class TestHTTP2Adapter(unittest.TestCase):
+    """HTTP/2アダプター経由でもrequestsと同じResponseが返るかの検証"""
+
+    def setUp(self):
+        self.requests_seen = []
+        self.client = HTTPClient(config={"max_retries": 1, "backoff_factor": 0, "rate_limit": {"enabled": False}})
+
+    def tearDown(self):
+        self.client.close()
+
+    def _mount(self, handler):
+        """モックのhttpxトランスポートを使うアダプターをHTTPSに設定"""
+        import httpx
+
+        def record(request):
+            self.requests_seen.append(request)
+            return handler(request)
+
+        self.client.session.mount("https://", HTTP2Adapter(transport=httpx.MockTransport(record)))
+
+    def test_response_is_converted(self):
+        import httpx
+        body = "<rss><title>消防庁</title></rss>".encode("cp932")
+        self._mount(lambda request: httpx.Response(
+            200, content=body, headers={"Content-Type": "application/rss+xml; charset=Shift_JIS", "ETag": '"v1"'}
+        ))
+
+        response = self.client.get("https://www.fdma.go.jp/index.xml", headers={"If-None-Match": '"v0"'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, body)
+        self.assertEqual(response.headers["etag"], '"v1"')
+        self.assertIn("消防庁", response.text)
+        response.raise_for_status()
+
+        # 指定したヘッダーとUser-Agentを送り、Accept-Encodingはhttpxが展開できる形式のみ
+        sent = self.requests_seen[0].headers
+        self.assertEqual(sent["if-none-match"], '"v0"')
+        self.assertEqual(len(sent.get_list("accept-encoding")), 1)
+        self.assertIn("Mozilla", sent["user-agent"])
+
+    def test_compressed_body_is_decoded_once(self):
+        import httpx
+        body = b"<html>" + b"a" * 5000 + b"</html>"
+        self._mount(lambda request: httpx.Response(
+            200, content=gzip.compress(body), headers={"Content-Encoding": "gzip"}
+        ))
+
+        response = self.client.get("https://example.jp/")
+
+        self.assertEqual(response.content, body)
+
+    def test_size_limit_applies(self):
+        import httpx
+        self._mount(lambda request: httpx.Response(200, content=b"x" * 300000))
+
+        with self.assertRaises(ResponseTooLarge):
+            self.client.get("https://example.jp/large", max_bytes=100000)
+
+    def test_errors_are_converted_and_retried(self):
+        import httpx
+        responses = [httpx.ConnectTimeout("timeout"), httpx.Response(200, content=b"ok")]
+
+        def handler(request):
+            result = responses.pop(0) if responses else httpx.ConnectTimeout("timeout")
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        self._mount(handler)
+
+        # 接続タイムアウトはrequestsの例外として扱われ、再試行される
+        response = self.client.get("https://example.jp/")
+        self.assertEqual(response.content, b"ok")
+
+        with self.assertRaises(requests.ConnectTimeout):
+            self.client.get("https://example.jp/")
+        self.assertEqual(len(self.requests_seen), 4)
+
+    def test_fallback_without_httpx(self):
+        logger = MagicMock()
+        original = http2_adapter.httpx
+        http2_adapter.httpx = None
+        try:
+            client = HTTPClient(config={"http2": True}, logger=logger)
+        finally:
+            http2_adapter.httpx = original
+
+        self.assertNotIsInstance(client.session.get_adapter("https://example.jp/"), HTTP2Adapter)
+        logger.warning.assert_called()
+
+    def test_enabled_by_config(self):
+        client = HTTPClient(config={"http2": True})
+
+        self.assertIsInstance(client.session.get_adapter("https://example.jp/"), HTTP2Adapter)
+        self.assertNotIsInstance(client.session.get_adapter("http://example.jp/"), HTTP2Adapter)
+        client.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
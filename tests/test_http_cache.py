@@ -0,0 +1,103 @@
+import unittest
+from unittest.mock import MagicMock
+from pathlib import Path
+import tempfile
+import sys
+import requests
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.http_cache import HTTPCache
+
+
+def make_response(body, headers=None, status_code=200):
+    """テスト用のResponseを作成"""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response.headers.update(headers or {})
+    return response
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestHTTPCache(unittest.TestCase):
+    """HTTPCacheの有効期間・LRU削除の検証"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+        self.cache = HTTPCache(self.temp_dir.name, max_bytes=100, logger=MagicMock(), clock=self.clock)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_max_age_hit_and_expiry(self):
+        url = "https://example.jp/detail/1"
+        self.assertTrue(self.cache.put(url, make_response(b"<html>1</html>", {"Cache-Control": "public, max-age=60"})))
+
+        cached = self.cache.get(url)
+        self.assertEqual(cached.content, b"<html>1</html>")
+        self.assertTrue(cached.from_cache)
+
+        self.clock.now += 61
+        self.assertIsNone(self.cache.get(url))
+
+    def test_no_store_and_missing_headers_are_not_cached(self):
+        self.assertFalse(self.cache.put("https://example.jp/a", make_response(b"a", {"Cache-Control": "no-store"})))
+        self.assertFalse(self.cache.put("https://example.jp/b", make_response(b"b")))
+        self.assertFalse(self.cache.put("https://example.jp/c", make_response(b"c", {"Cache-Control": "max-age=60"}, 404)))
+
+    def test_expires_header(self):
+        url = "https://example.jp/playlist.m3u8"
+        self.assertTrue(self.cache.put(url, make_response(b"#EXTM3U", {"Expires": "Fri, 01 Jan 2100 00:00:00 GMT"})))
+        self.assertIsNotNone(self.cache.get(url))
+
+    def test_source_ttl_override(self):
+        url = "https://example.jp/detail/2"
+        self.assertTrue(self.cache.put(url, make_response(b"x", {"Cache-Control": "no-cache"}), ttl=30))
+        self.assertIsNotNone(self.cache.get(url))
+
+        self.clock.now += 31
+        self.assertIsNone(self.cache.get(url))
+
+    def test_lru_eviction(self):
+        headers = {"Cache-Control": "max-age=600"}
+        self.cache.put("https://example.jp/1", make_response(b"a" * 40, headers))
+        self.clock.now += 1
+        self.cache.put("https://example.jp/2", make_response(b"b" * 40, headers))
+        self.clock.now += 1
+
+        # 1を参照して2を最も古いエントリにする
+        self.cache.get("https://example.jp/1")
+        self.clock.now += 1
+        self.cache.put("https://example.jp/3", make_response(b"c" * 40, headers))
+
+        self.assertIsNotNone(self.cache.get("https://example.jp/1"))
+        self.assertIsNone(self.cache.get("https://example.jp/2"))
+        self.assertIsNotNone(self.cache.get("https://example.jp/3"))
+        self.assertLessEqual(self.cache.total_size(), 100)
+
+    def test_persisted_across_instances(self):
+        url = "https://example.jp/detail/3"
+        self.cache.put(url, make_response(b"persist", {"Cache-Control": "max-age=600", "Content-Type": "text/html"}))
+
+        # 索引はsave()までは書き込まない
+        self.assertFalse(self.cache.index_file.exists())
+        self.cache.save()
+
+        reloaded = HTTPCache(self.temp_dir.name, max_bytes=100, clock=self.clock)
+        cached = reloaded.get(url)
+        self.assertEqual(cached.content, b"persist")
+        self.assertEqual(cached.headers["content-type"], "text/html")
+
+
+if __name__ == '__main__':
+    unittest.main()
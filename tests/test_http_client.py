@@ -0,0 +1,167 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from pathlib import Path
+import sys
+import io
+import itertools
+import tempfile
+import requests
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.http_client import HTTPClient, ResponseTooLarge, DeadlineExceeded, get_request_limits, get_http_client
+from src.utils.circuit_breaker import CircuitBreaker
+
+
+def make_streamed_response(body, headers=None):
+    """ストリーミング受信のResponseを作成"""
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(body)
+    response.headers.update(headers or {})
+    return response
+
+
+class TestHTTPClient(unittest.TestCase):
+    """HTTPClientのリトライ・タイムアウト・ヘッダー設定の検証"""
+
+    def setUp(self):
+        self.logger = MagicMock()
+        self.client = HTTPClient(
+            config={"max_retries": 2, "backoff_factor": 0, "connect_timeout": 3, "read_timeout": 7},
+            logger=self.logger
+        )
+
+    def test_default_headers_and_timeout(self):
+        with patch.object(self.client.session, "request", return_value=MagicMock(status_code=200)) as mock_request:
+            self.client.get("https://example.jp/")
+
+        _, kwargs = mock_request.call_args
+        self.assertEqual(kwargs["timeout"], (3, 7))
+        self.assertIn("Mozilla", self.client.session.headers["User-Agent"])
+
+    def test_retry_on_server_error(self):
+        responses = [MagicMock(status_code=503), MagicMock(status_code=200)]
+        with patch.object(self.client.session, "request", side_effect=responses) as mock_request:
+            response = self.client.get("https://example.jp/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_request.call_count, 2)
+
+    def test_retry_gives_up_on_connection_error(self):
+        with patch.object(self.client.session, "request", side_effect=requests.ConnectionError("失敗")) as mock_request:
+            with self.assertRaises(requests.ConnectionError):
+                self.client.get("https://example.jp/")
+
+        self.assertEqual(mock_request.call_count, 3)
+
+    def test_post_is_not_retried(self):
+        with patch.object(self.client.session, "request", return_value=MagicMock(status_code=503)) as mock_request:
+            response = self.client.post("https://hooks.example.jp/", data="{}")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(mock_request.call_count, 1)
+
+    def test_long_retry_after_is_not_retried(self):
+        response = MagicMock(status_code=429, headers={"Retry-After": "3600"})
+        with patch.object(self.client.session, "request", return_value=response) as mock_request:
+            result = self.client.get("https://example.jp/")
+
+        self.assertEqual(result.status_code, 429)
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertLess(self.client.rate_limiter.get_rate("https://example.jp/"), 1.0)
+
+
+    def test_body_is_streamed_within_limit(self):
+        body = b"<html>" + b"x" * 200000 + b"</html>"
+        with patch.object(self.client.session, "request", return_value=make_streamed_response(body)) as mock_request:
+            response = self.client.get("https://example.jp/", max_bytes=len(body))
+
+        _, kwargs = mock_request.call_args
+        self.assertTrue(kwargs["stream"])
+        self.assertEqual(response.content, body)
+
+    def test_content_length_over_limit(self):
+        response = make_streamed_response(b"x" * 100, {"Content-Length": "5000000"})
+        with patch.object(self.client.session, "request", return_value=response):
+            with self.assertRaises(ResponseTooLarge):
+                self.client.get("https://example.jp/large.zip", max_bytes=1000)
+
+        # 本文を読まずに接続を閉じる
+        self.assertTrue(response.raw.closed)
+
+    def test_streamed_body_over_limit(self):
+        body = b"x" * (HTTPClient.CHUNK_SIZE * 4)
+        with patch.object(self.client.session, "request", return_value=make_streamed_response(body)):
+            with self.assertRaises(ResponseTooLarge):
+                self.client.get("https://example.jp/runaway", max_bytes=HTTPClient.CHUNK_SIZE)
+
+    def test_deadline_aborts_slow_body(self):
+        # 時刻の取得ごとに10秒進む時計（送信速度制御は使わない）
+        self.client.rate_limiter = None
+        clock = itertools.count(0, 10)
+        body = b"x" * (HTTPClient.CHUNK_SIZE * 2)
+        with patch("src.utils.http_client.time.monotonic", side_effect=lambda: next(clock)):
+            with patch.object(self.client.session, "request", return_value=make_streamed_response(body)) as mock_request:
+                with self.assertRaises(DeadlineExceeded):
+                    self.client.get("https://example.jp/slow", deadline=15)
+
+        # 読み込みタイムアウトも残り時間に収める
+        _, kwargs = mock_request.call_args
+        self.assertEqual(kwargs["timeout"], (3, 5))
+
+    def test_limits_can_be_disabled(self):
+        client = HTTPClient(config={"max_response_mb": 0, "request_deadline": 0, "rate_limit": {"enabled": False}})
+        with patch.object(client.session, "request", return_value=MagicMock(status_code=200)) as mock_request:
+            client.get("https://example.jp/")
+
+        _, kwargs = mock_request.call_args
+        self.assertNotIn("stream", kwargs)
+
+    def test_request_limits_from_source(self):
+        limits = get_request_limits({"url": "https://example.jp/", "max_response_mb": 0.5, "request_deadline": 20})
+        self.assertEqual(limits, {"max_bytes": 512 * 1024, "deadline": 20})
+        self.assertEqual(get_request_limits({"url": "https://example.jp/"}), {})
+
+
+
+class TestSharedHTTPClient(unittest.TestCase):
+    """プロセス共通のHTTPクライアントの検証"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.logger = MagicMock()
+
+        # テストごとに共通クライアントを作り直す
+        patcher = patch("src.utils.http_client._shared_client", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def create_breaker(self, **kwargs):
+        return CircuitBreaker(data_dir=self.temp_dir.name, state=MagicMock(), **kwargs)
+
+    def test_same_settings_are_shared_silently(self):
+        client = get_http_client({"max_retries": 1}, logger=self.logger, circuit_breaker=self.create_breaker())
+
+        self.assertIs(get_http_client(logger=self.logger), client)
+        self.assertIs(get_http_client({"max_retries": 1}, logger=self.logger, circuit_breaker=self.create_breaker()), client)
+        self.logger.warning.assert_not_called()
+
+    def test_different_settings_are_warned(self):
+        client = get_http_client({"max_retries": 1}, logger=self.logger, circuit_breaker=self.create_breaker())
+
+        with self.subTest("config"):
+            self.assertIs(get_http_client({"max_retries": 5}, logger=self.logger), client)
+            self.assertEqual(self.logger.warning.call_count, 1)
+
+        with self.subTest("circuit_breaker"):
+            self.assertIs(get_http_client(logger=self.logger, circuit_breaker=self.create_breaker(cooldown=60)), client)
+            self.assertEqual(self.logger.warning.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
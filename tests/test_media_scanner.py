@@ -0,0 +1,106 @@
+import unittest
+from unittest.mock import patch
+from pathlib import Path
+import json
+import re
+import sys
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.parser import media_scanner
+from src.parser.media_scanner import has_media_hint, iter_media_urls, scan_media_urls
+from src.parser.backends import parse_html, is_backend_available
+from src.parser.video_parser import VideoParser
+
+FIXTURE_DIR = root_dir / "tests" / "fixtures" / "html"
+
+SCRIPT = '''
+var config = {"player": {"url": "https://www.gov-online.go.jp/movie/intro.mp4", "title": "紹介動画"}};
+loadPlayer('https://stream.gov-online.go.jp/live/master.m3u8?token=1');
+var backup = "https://www.gov-online.go.jp/movie/intro.mp4";
+var page = "https://www.gov-online.go.jp/movie/index.html";
+'''
+
+
+def reference_scan(text):
+    """以前の実装（m3u8・mp4・JSONの3回の走査）で見つかるURL"""
+    urls = [match[0] for match in re.findall(r'[\'"]((https?://[^\'"\s]+\.m3u8)[^\'"]*)[\'"]', text)]
+    urls += [match[0] for match in re.findall(r'[\'"]((https?://[^\'"\s]+\.mp4)[^\'"]*)[\'"]', text)]
+    for json_obj in re.findall(r'({[^{}]*"url"[^{}]*})', text):
+        try:
+            data = json.loads(re.sub(r'([{,])\s*(\w+):', r'\1"\2":', json_obj))
+        except Exception:
+            continue
+        if isinstance(data.get('url'), str) and data['url'].endswith(('.mp4', '.m3u8')):
+            urls.append(data['url'])
+    return urls
+
+
+class TestMediaScanner(unittest.TestCase):
+    def test_same_urls_as_reference(self):
+        """以前の実装と同じURLを重複なく検出"""
+        expected = list(dict.fromkeys(reference_scan(SCRIPT)))
+        actual = [media['url'] for media in scan_media_urls([SCRIPT])]
+
+        self.assertEqual(sorted(actual), sorted(expected))
+        self.assertEqual(len(reference_scan(SCRIPT)), 4)
+        self.assertEqual(len(actual), 2)
+
+    def test_order_format_and_title(self):
+        media = scan_media_urls([SCRIPT])
+
+        self.assertEqual(media[0], {'url': 'https://www.gov-online.go.jp/movie/intro.mp4', 'format': 'mp4', 'title': '紹介動画'})
+        self.assertEqual(media[1], {'url': 'https://stream.gov-online.go.jp/live/master.m3u8?token=1', 'format': 'm3u8'})
+
+    def test_js_object_keys_and_escapes(self):
+        text = r'''jwplayer({url: '/movie/kaiken.mov', title: "会見動画"}); var src = "https:\/\/cdn.example.jp\/v\/a.m3u8";'''
+
+        media = list(iter_media_urls(text))
+
+        self.assertEqual(media[0], {'url': '/movie/kaiken.mov', 'format': 'mov', 'title': '会見動画'})
+        self.assertEqual(media[1], {'url': 'https://cdn.example.jp/v/a.m3u8', 'format': 'm3u8'})
+
+    def test_extension_must_end_path_segment(self):
+        """拡張子の後に英数字が続くURL（.movie など）は対象外"""
+        text = '''a = "https://example.jp/a.movie/index.html"; b = "https://example.jp/b.mp4x"; c = "https://example.jp/c.mov"'''
+
+        self.assertEqual([media['url'] for media in iter_media_urls(text)], ['https://example.jp/c.mov'])
+
+    def test_mismatched_quotes(self):
+        self.assertEqual(list(iter_media_urls('''x = "https://example.jp/a.mp4'; y = 1;''')), [])
+
+    def test_skips_scripts_without_hint(self):
+        self.assertFalse(has_media_hint('var analytics = {"id": "UA-1"};'))
+        self.assertFalse(has_media_hint(None))
+
+        with patch.object(media_scanner, '_MEDIA_RE') as mock_re:
+            self.assertEqual(scan_media_urls(['var analytics = {"url": "https://example.jp/"};', None, '']), [])
+        mock_re.finditer.assert_not_called()
+
+    def test_deduplicates_across_scripts(self):
+        media = scan_media_urls([
+            'play("https://example.jp/a.mp4")',
+            'var v = {"url": "https://example.jp/a.mp4", "title": "動画A"}',
+        ])
+
+        self.assertEqual(media, [{'url': 'https://example.jp/a.mp4', 'format': 'mp4', 'title': '動画A'}])
+
+
+class TestVideoParserScripts(unittest.TestCase):
+    def test_extract_videos_from_js(self):
+        html = (FIXTURE_DIR / "video_page.html").read_text(encoding="utf-8")
+
+        for backend in ('html.parser', 'lxml', 'selectolax'):
+            if not is_backend_available(backend):
+                continue
+            with self.subTest(backend=backend):
+                videos = VideoParser(backend=backend)._extract_videos_from_js(parse_html(html, backend), "https://www.gov-online.go.jp")
+                self.assertEqual(videos, [
+                    {'url': 'https://www.gov-online.go.jp/movie/intro.mp4', 'title': '紹介動画', 'format': 'mp4'},
+                    {'url': 'https://stream.gov-online.go.jp/live/master.m3u8?token=1', 'title': 'm3u8動画 2', 'format': 'm3u8'},
+                ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,199 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from pathlib import Path
+import tempfile
+import sys
+from bs4 import BeautifulSoup
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.parser import backends
+from src.parser.backends import parse_html, select_html, build_strainer, is_backend_available, resolve_backend
+from src.parser.html_parser import HTMLParser
+from src.parser.video_parser import VideoParser
+from src.fetcher.html_scraper import HTMLScraper
+
+FIXTURE_DIR = root_dir / "tests" / "fixtures" / "html"
+
+# html.parserの結果と比較するパーサー
+FAST_BACKENDS = ("lxml", "selectolax")
+
+
+def load_fixture(name):
+    """テスト用のHTMLを読み込む"""
+    return (FIXTURE_DIR / name).read_text(encoding="utf-8")
+
+
+class TestBackendEquivalence(unittest.TestCase):
+    """どのパーサーでもhtml.parserと同じ抽出結果になるかの検証"""
+
+    HTML_CASES = [
+        ("news_list.html", "https://www.fdma.go.jp/news/index.html", ".news-list li"),
+        ("news_dl.html", "https://www.kantei.go.jp/jp/joho/news/index.html", ".news-list dt, .news-list dd"),
+        ("news_dl.html", "https://www.kantei.go.jp/jp/joho/news/index.html", "div.news-list > .news-item"),
+    ]
+
+    VIDEO_CASES = [".movie-container a", ".movie-list a", ".movie-container video source", "#missing"]
+
+    def _html_entries(self, backend, name, url, selector):
+        entries = HTMLParser(backend=backend).parse(load_fixture(name), url, selector, "テスト")
+        # 日付がない場合の取得時刻は比較しない
+        return [(e["title"], e["link"]) for e in entries]
+
+    def _dates(self, backend, name, selector):
+        parser = HTMLParser()
+        return [parser._extract_date(element) for element in parse_html(load_fixture(name), backend).select(selector)]
+
+    def test_html_parser(self):
+        for backend in FAST_BACKENDS:
+            if not is_backend_available(backend):
+                continue
+            for name, url, selector in self.HTML_CASES:
+                with self.subTest(backend=backend, fixture=name, selector=selector):
+                    expected = self._html_entries("html.parser", name, url, selector)
+                    self.assertTrue(expected)
+                    self.assertEqual(self._html_entries(backend, name, url, selector), expected)
+                    self.assertEqual(self._dates(backend, name, selector), self._dates("html.parser", name, selector))
+
+    def test_video_parser(self):
+        html = load_fixture("video_page.html")
+        url = "https://www.gov-online.go.jp/movie/index.html"
+        for backend in FAST_BACKENDS:
+            if not is_backend_available(backend):
+                continue
+            for selector in self.VIDEO_CASES:
+                with self.subTest(backend=backend, selector=selector):
+                    expected = VideoParser(backend="html.parser").parse_video_page(html, url, selector, "テスト")
+                    self.assertTrue(expected)
+                    self.assertEqual(VideoParser(backend=backend).parse_video_page(html, url, selector, "テスト"), expected)
+
+    def test_page_title(self):
+        for backend in FAST_BACKENDS:
+            if not is_backend_available(backend):
+                continue
+            with self.subTest(backend=backend):
+                self.assertEqual(
+                    HTMLParser(backend=backend).extract_page_title(load_fixture("news_list.html")),
+                    "新着情報 | 総務省消防庁"
+                )
+
+
+@unittest.skipUnless(is_backend_available("selectolax"), "selectolaxがインストールされていません")
+class TestSelectolaxNode(unittest.TestCase):
+    """selectolaxのラッパーがBeautifulSoupのTagと同じ値を返すかの検証"""
+
+    def setUp(self):
+        html = load_fixture("video_page.html")
+        self.soup = parse_html(html, "html.parser")
+        self.node = parse_html(html, "selectolax")
+
+    def test_attributes_and_text(self):
+        expected = self.soup.select(".movie-list a")[0]
+        actual = self.node.select(".movie-list a")[0]
+
+        self.assertEqual(actual.name, expected.name)
+        self.assertEqual(actual["data-src"], expected["data-src"])
+        self.assertEqual(actual.has_attr("href"), expected.has_attr("href"))
+        self.assertFalse(actual.has_attr("src"))
+        self.assertEqual(actual.get("title"), None)
+        self.assertEqual(actual.parent["class"], expected.parent["class"])
+        self.assertEqual(actual.parent.get_text(strip=True), expected.parent.get_text(strip=True))
+
+    def test_find_and_previous(self):
+        video = self.node.find("video")
+        self.assertEqual(video.find("source")["src"], "/movie/bousai.mp4")
+        self.assertEqual(video.find_previous("h2").get_text(strip=True), "防災の基礎知識")
+        self.assertIsNone(self.node.find("h1").find("h1"))
+
+        names = [tag.name for tag in self.node.find_all(["h1", "h2", "h3"])]
+        self.assertEqual(names, [tag.name for tag in self.soup.find_all(["h1", "h2", "h3"])])
+
+    def test_script_string(self):
+        expected = [script.string for script in self.soup.find_all("script")]
+        actual = [script.string for script in self.node.find_all("script")]
+
+        self.assertEqual(actual, expected)
+        self.assertIsNone(self.node.find("section").string)
+
+
+class TestPartialParse(unittest.TestCase):
+    """セレクタに関係する部分だけを解析しても全体を解析した場合と同じ要素が得られるかの検証"""
+
+    CASES = [
+        ("news_list.html", ".news-list li"),
+        ("news_list.html", "ul.news-list > li"),
+        ("news_dl.html", ".news-list dt, .news-list dd"),
+        ("news_dl.html", "div.news-list > .news-item a"),
+        ("video_page.html", ".movie-container a"),
+        ("video_page.html", "section.movie-list div a"),
+        ("video_page.html", "li:first-child"),
+    ]
+
+    def test_same_elements_as_full_parse(self):
+        for backend in ("html.parser", "lxml"):
+            if not is_backend_available(backend):
+                continue
+            for name, selector in self.CASES:
+                with self.subTest(backend=backend, fixture=name, selector=selector):
+                    html = load_fixture(name)
+                    expected = [str(element) for element in parse_html(html, backend).select(selector)]
+                    actual = [str(element) for element in select_html(html, selector, backend)]
+                    self.assertEqual(actual, expected)
+
+    def test_only_matching_subtrees_are_parsed(self):
+        soup = parse_html(load_fixture("news_list.html"), "html.parser")
+        strained = BeautifulSoup(load_fixture("news_list.html"), "html.parser", parse_only=build_strainer(".news-list li"))
+
+        self.assertIsNone(strained.find("header"))
+        self.assertIsNone(strained.find(class_="other-list"))
+        self.assertLess(len(strained.find_all(True)), len(soup.find_all(True)))
+
+    def test_unsupported_selectors_fall_back(self):
+        for selector in ["li:first-child", ".a + .b", "a[href]", "body .news", ".news, .topics", "*", ""]:
+            with self.subTest(selector=selector):
+                self.assertIsNone(build_strainer(selector))
+
+        self.assertIsNotNone(build_strainer("div#main.news ul"))
+        self.assertEqual(select_html("<ul><li>A</li></ul>", None), [])
+
+
+class TestBackendSelection(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_unavailable_backend_falls_back(self):
+        logger = MagicMock()
+        original = backends.LexborHTMLParser
+        backends.LexborHTMLParser = None
+        backends._warned.discard("selectolax")
+        try:
+            self.assertEqual(resolve_backend("selectolax", logger), "html.parser")
+            soup = parse_html("<ul><li>A</li></ul>", "selectolax", logger)
+        finally:
+            backends.LexborHTMLParser = original
+            backends._warned.discard("selectolax")
+
+        self.assertEqual(soup.select("li")[0].get_text(), "A")
+        logger.warning.assert_called_once()
+
+    def test_source_overrides_global_backend(self):
+        html = load_fixture("news_list.html")
+        client = MagicMock()
+        client.get.return_value = MagicMock(status_code=200, text=html, content=html.encode("utf-8"), headers={})
+        scraper = HTMLScraper(data_dir=self.temp_dir.name, http_client=client, parser_backend="html.parser")
+
+        source = {"name": "消防庁", "url": "https://www.fdma.go.jp/news/", "selector": ".news-list li", "parser": "lxml"}
+        with patch("src.fetcher.html_scraper.select_html", side_effect=select_html) as mock_select:
+            entries = scraper.fetch(source)
+
+        used = [call.args[2] for call in mock_select.call_args_list]
+        self.assertEqual(used, ["lxml"])
+        self.assertEqual(len(entries), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
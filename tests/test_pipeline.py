@@ -0,0 +1,237 @@
+import unittest
+from unittest.mock import MagicMock
+from pathlib import Path
+import tempfile
+import threading
+import sys
+from datetime import datetime
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.fetcher.fetch_engine import FetchEngine
+from src.fetcher.rss_fetcher import RSSFetcher
+from src.fetcher.html_scraper import HTMLScraper
+from src.utils.notifier import Notifier
+from src.watcher.pipeline import URLPipeline
+
+
+class FakeFetcher:
+    """指定件数の新着エントリを返すテスト用フェッチャー（取り出しと保存の順序を記録）"""
+
+    def __init__(self, events, count=3, fail_download=False, fail_after=None):
+        self.events = events
+        self.count = count
+        self.fail_download = fail_download
+        self.fail_after = fail_after
+        self.lock = threading.Lock()
+
+    def download(self, source):
+        if self.fail_download:
+            return None
+        return MagicMock(source=source['name'])
+
+    def iter_new_entries(self, source, response):
+        for i in range(self.count):
+            if self.fail_after is not None and i == self.fail_after:
+                raise ValueError("解析エラー")
+            with self.lock:
+                self.events.append(('produced', source['name'], i))
+            yield {'title': f"{source['name']}-{i}", 'link': f"{source['url']}/{i}", 'source': source['name']}
+
+
+class RecordingStorage:
+    """保存したエントリを記録するテスト用の保存先"""
+
+    def __init__(self, events):
+        self.events = events
+
+    def save_url_entry(self, entry, source_type='rss'):
+        self.events.append(('stored', entry['source'], int(entry['link'].rsplit('/', 1)[1])))
+        return True
+
+
+class TestURLPipeline(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+        self.notifier = MagicMock(URL_MAX_ENTRIES=3)
+        self.scheduler = MagicMock()
+        self.engine = FetchEngine(max_concurrency=4, per_host_concurrency=2)
+
+    def _source(self, name, **kwargs):
+        return dict({'name': name, 'url': f"https://{name}.example.jp/feed"}, **kwargs)
+
+    def test_entries_flow_through_all_stages(self):
+        fetcher = FakeFetcher(self.events, count=4)
+        jobs = [('rss', fetcher, self._source('a')), ('html', fetcher, self._source('b'))]
+        pipeline = URLPipeline(self.engine, notifier=self.notifier, storage=RecordingStorage(self.events), scheduler=self.scheduler)
+
+        total = pipeline.run(jobs)
+
+        self.assertEqual(total, 8)
+        self.assertEqual(len([event for event in self.events if event[0] == 'stored']), 8)
+
+        # 通知は先頭の3件と全件数だけを受け取る
+        entries, kwargs = self.notifier.notify_url_updates.call_args
+        self.assertEqual(len(entries[0]), 3)
+        self.assertEqual(kwargs['total'], 8)
+
+        # ソースごとの新着件数でスケジューラを更新
+        recorded = sorted((call.args[0], call.args[1]['name'], call.args[2]) for call in self.scheduler.record.call_args_list)
+        self.assertEqual(recorded, [('html', 'b', 4), ('rss', 'a', 4)])
+
+    def test_entries_stored_while_parsing(self):
+        """解析が終わる前に先頭のエントリが保存される（全件をためない）"""
+        fetcher = FakeFetcher(self.events, count=50)
+        pipeline = URLPipeline(self.engine, storage=RecordingStorage(self.events), queue_size=1)
+
+        pipeline.run([('rss', fetcher, self._source('a'))])
+
+        first_stored = self.events.index(('stored', 'a', 0))
+        last_produced = self.events.index(('produced', 'a', 49))
+        self.assertLess(first_stored, last_produced)
+
+    def test_parse_workers(self):
+        fetcher = FakeFetcher(self.events, count=5)
+        jobs = [('rss', fetcher, self._source(f"s{i}")) for i in range(6)]
+        pipeline = URLPipeline(self.engine, storage=RecordingStorage(self.events), parse_workers=3, queue_size=2)
+
+        self.assertEqual(pipeline.run(jobs), 30)
+
+    def test_failures_do_not_stop_pipeline(self):
+        logger = MagicMock()
+        jobs = [
+            ('rss', FakeFetcher(self.events, fail_download=True), self._source('a')),
+            ('rss', FakeFetcher(self.events, count=3, fail_after=1), self._source('b')),
+            ('html', FakeFetcher(self.events, count=2), self._source('c')),
+        ]
+        storage = MagicMock()
+        storage.save_url_entry.side_effect = [True, RuntimeError("DBエラー"), True]
+        pipeline = URLPipeline(self.engine, notifier=self.notifier, storage=storage, scheduler=self.scheduler, logger=logger)
+
+        total = pipeline.run(jobs)
+
+        self.assertEqual(total, 3)
+        # 取得に失敗したソースは取得間隔を延ばさない
+        recorded = sorted(call.args[1]['name'] for call in self.scheduler.record.call_args_list)
+        self.assertEqual(recorded, ['b', 'c'])
+        logger.error.assert_called()
+
+    def test_no_new_entries(self):
+        pipeline = URLPipeline(self.engine, notifier=self.notifier)
+
+        self.assertEqual(pipeline.run([('rss', FakeFetcher(self.events, count=0), self._source('a'))]), 0)
+        self.assertEqual(pipeline.run([]), 0)
+        self.notifier.notify_url_updates.assert_not_called()
+
+
+class TestURLPipelineFetchers(unittest.TestCase):
+    """実際のフェッチャーとパーサーを使ったパイプラインの検証"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_rss_and_html(self):
+        feed = (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>テスト</title>'
+            '<item><title>記事1</title><link>https://feed.example.jp/1</link><pubDate>Thu, 22 May 2025 10:00:00 GMT</pubDate></item>'
+            '</channel></rss>'
+        ).encode('utf-8')
+        page = (
+            '<html><body><ul class="news"><li><span class="date">2025年5月22日</span><a href="detail/1.html">お知らせ</a></li>'
+            '<li>リンクなし</li></ul></body></html>'
+        )
+        responses = {
+            'https://feed.example.jp/rss': MagicMock(status_code=200, content=feed, headers={}, url='https://feed.example.jp/rss'),
+            'https://page.example.jp/news/': MagicMock(status_code=200, content=page.encode('utf-8'), text=page, headers={}, url='https://page.example.jp/news/'),
+        }
+        http_client = MagicMock()
+        http_client.get.side_effect = lambda url, **kwargs: responses[url]
+
+        rss_fetcher = RSSFetcher(data_dir=self.temp_dir.name, http_client=http_client)
+        html_scraper = HTMLScraper(data_dir=self.temp_dir.name, http_client=http_client)
+        html_scraper.encoding_resolver = MagicMock(resolve_response=MagicMock(return_value='utf-8'))
+        notifier = Notifier({'enabled': True, 'method': 'cli'})
+        notifier.notify_url_updates = MagicMock()
+
+        pipeline = URLPipeline(FetchEngine(), notifier=notifier)
+        jobs = [
+            ('rss', rss_fetcher, {'name': 'フィード', 'url': 'https://feed.example.jp/rss'}),
+            ('html', html_scraper, {'name': 'ページ', 'url': 'https://page.example.jp/news/', 'selector': '.news li'}),
+        ]
+
+        started = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.assertEqual(pipeline.run(jobs), 3)
+        finished = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        entries = {entry['title']: entry for entry in notifier.notify_url_updates.call_args.args[0]}
+        self.assertEqual(entries['記事1']['published'], '2025-05-22 10:00:00')
+        self.assertEqual(entries['2025年5月22日お知らせ']['link'], 'https://page.example.jp/news/detail/1.html')
+        # HTMLの公開日は取得時刻
+        self.assertTrue(started <= entries['2025年5月22日お知らせ']['published'] <= finished)
+        self.assertTrue(entries['リンクなし']['link'].startswith('https://page.example.jp/news/#'))
+
+        # 2回目は新着なし
+        self.assertEqual(pipeline.run(jobs), 0)
+
+    def test_parse_workers_run_sources_concurrently(self):
+        """同じフェッチャーの複数ソースを解析ワーカーが同時に解析する"""
+        feed = '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><item><title>記事</title><link>{}</link></item></channel></rss>'
+        page = '<html><body><ul class="news"><li><a href="{}">お知らせ</a></li></ul></body></html>'
+        responses = {}
+        for name in ('a', 'b'):
+            url = f'https://{name}.example.jp/rss'
+            content = feed.format(f'https://{name}.example.jp/1').encode('utf-8')
+            responses[url] = MagicMock(status_code=200, content=content, headers={}, url=url)
+            url = f'https://{name}.example.jp/news/'
+            text = page.format(f'https://{name}.example.jp/1.html')
+            responses[url] = MagicMock(status_code=200, content=text.encode('utf-8'), text=text, headers={}, url=url)
+        http_client = MagicMock()
+        http_client.get.side_effect = lambda url, **kwargs: responses[url]
+
+        rss_fetcher = RSSFetcher(data_dir=self.temp_dir.name, http_client=http_client)
+        html_scraper = HTMLScraper(data_dir=self.temp_dir.name, http_client=http_client)
+        html_scraper.encoding_resolver = MagicMock(resolve_response=MagicMock(return_value='utf-8'))
+
+        for source_type, fetcher, parser, url in [
+            ('rss', rss_fetcher, rss_fetcher.rss_parser, 'https://{}.example.jp/rss'),
+            ('html', html_scraper, html_scraper.html_parser, 'https://{}.example.jp/news/'),
+        ]:
+            with self.subTest(source_type=source_type):
+                # 2つのソースのエントリ作成が揃うまで待つ（1ソースずつしか解析できない場合はタイムアウト）
+                barrier = threading.Barrier(2, timeout=5)
+                build_entry = parser.build_entry
+
+                def wait_and_build(*args, build_entry=build_entry, barrier=barrier, **kwargs):
+                    barrier.wait()
+                    return build_entry(*args, **kwargs)
+
+                parser.build_entry = wait_and_build
+                logger = MagicMock()
+                pipeline = URLPipeline(FetchEngine(), parse_workers=2, logger=logger)
+                jobs = [
+                    (source_type, fetcher, {'name': name, 'url': url.format(name), 'selector': '.news li'})
+                    for name in ('a', 'b')
+                ]
+
+                self.assertEqual(pipeline.run(jobs), 2)
+                logger.error.assert_not_called()
+
+
+class TestNotifierTotal(unittest.TestCase):
+    def test_format_with_total(self):
+        notifier = Notifier({'enabled': False})
+        entries = [{'title': f"記事{i}", 'link': f"https://example.jp/{i}", 'source': 'テスト'} for i in range(3)]
+
+        message = notifier._format_url_entries(entries, max_entries=3, total=25)
+
+        self.assertIn("3. 【テスト】 記事2", message)
+        self.assertIn("...他 22 件", message)
+        self.assertNotIn("...他", notifier._format_url_entries(entries, max_entries=3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import MagicMock
+from pathlib import Path
+from datetime import datetime, timedelta
+import tempfile
+import sys
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.poll_scheduler import PollScheduler
+
+
+class TestPollScheduler(unittest.TestCase):
+    """PollSchedulerの取得間隔の学習と取得対象判定の検証"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = self.temp_dir.name
+        self.scheduler = PollScheduler(data_dir=self.data_dir, min_interval=15, max_interval=1440, logger=MagicMock())
+        self.source = {"name": "テストRSS", "url": "https://example.jp/rss.xml"}
+        self.now = datetime(2025, 5, 22, 9, 0, 0)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_new_source_is_due(self):
+        self.assertTrue(self.scheduler.is_due("rss", self.source, now=self.now))
+
+    def test_quiet_source_backs_off(self):
+        now = self.now
+        for _ in range(20):
+            self.scheduler.record("rss", self.source, 0, now=now)
+            now += timedelta(days=1)
+
+        state = self.scheduler.schedule["rss:https://example.jp/rss.xml"]
+        self.assertEqual(state["interval"], 1440)
+        self.assertFalse(self.scheduler.is_due("rss", self.source, now=self.now + timedelta(days=19, hours=12)))
+
+    def test_busy_source_learns_short_interval(self):
+        # 1時間ごとに更新されるソース
+        now = self.now
+        for _ in range(5):
+            self.scheduler.record("rss", self.source, 1, now=now)
+            now += timedelta(hours=1)
+
+        state = self.scheduler.schedule["rss:https://example.jp/rss.xml"]
+        self.assertEqual(state["interval"], 30)
+
+    def test_interval_respects_bounds(self):
+        now = self.now
+        for _ in range(5):
+            self.scheduler.record("rss", self.source, 3, now=now)
+            now += timedelta(minutes=5)
+
+        state = self.scheduler.schedule["rss:https://example.jp/rss.xml"]
+        self.assertEqual(state["interval"], 15)
+
+    def test_save_and_reload(self):
+        self.scheduler.record("rss", self.source, 0, now=self.now)
+        self.scheduler.save()
+
+        reloaded = PollScheduler(data_dir=self.data_dir)
+        self.assertFalse(reloaded.is_due("rss", self.source, now=self.now + timedelta(minutes=5)))
+        self.assertTrue(reloaded.is_due("rss", self.source, now=self.now + timedelta(minutes=30)))
+
+    def test_filter_due_skips_disabled_and_waiting(self):
+        waiting = {"name": "待機中", "url": "https://example.jp/waiting.xml"}
+        disabled = {"name": "無効", "url": "https://example.jp/disabled.xml", "enabled": False}
+        self.scheduler.record("rss", waiting, 0, now=self.now)
+
+        due = self.scheduler.filter_due("rss", [self.source, waiting, disabled], now=self.now)
+        self.assertEqual(due, [self.source])
+
+    def test_disabled_scheduler_always_due(self):
+        scheduler = PollScheduler(data_dir=self.data_dir, enabled=False)
+        scheduler.record("rss", self.source, 0, now=self.now)
+        self.assertTrue(scheduler.is_due("rss", self.source, now=self.now))
+
+
+if __name__ == '__main__':
+    unittest.main()
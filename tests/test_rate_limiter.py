@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import MagicMock
+from pathlib import Path
+import sys
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.utils.rate_limiter import HostRateLimiter, parse_retry_after
+
+
+class FakeClock:
+    """sleepで進む疑似時計"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestHostRateLimiter(unittest.TestCase):
+    """HostRateLimiterのトークンバケット・減速・Retry-Afterの検証"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = HostRateLimiter(
+            config={"requests_per_second": 2.0, "burst": 2, "hosts": {"slow.example.jp": 0.5}},
+            logger=MagicMock(),
+            clock=self.clock,
+            sleep=self.clock.sleep
+        )
+
+    def test_burst_then_wait(self):
+        for _ in range(3):
+            self.limiter.acquire("https://www.example.jp/a")
+
+        # 2件目まではすぐ送信でき、3件目は0.5秒待つ
+        self.assertEqual(len(self.clock.slept), 1)
+        self.assertAlmostEqual(self.clock.slept[0], 0.5)
+
+    def test_hosts_are_independent(self):
+        for _ in range(2):
+            self.limiter.acquire("https://a.example.jp/")
+        for _ in range(2):
+            self.limiter.acquire("https://b.example.jp/")
+
+        self.assertEqual(self.clock.slept, [])
+
+    def test_host_override(self):
+        self.assertEqual(self.limiter.get_rate("https://slow.example.jp/feed.xml"), 0.5)
+
+    def test_throttle_and_recover(self):
+        url = "https://www.example.jp/"
+        self.limiter.on_response(url, 429)
+        self.assertAlmostEqual(self.limiter.get_rate(url), 1.0)
+
+        for _ in range(10):
+            self.limiter.on_response(url, 200)
+        self.assertAlmostEqual(self.limiter.get_rate(url), 2.0)
+
+    def test_retry_after_blocks_host(self):
+        url = "https://www.example.jp/"
+        self.limiter.on_response(url, 503, retry_after="30")
+        self.limiter.acquire(url)
+
+        self.assertAlmostEqual(sum(self.clock.slept), 30.0)
+
+    def test_acquire_gives_up_before_timeout(self):
+        url = "https://www.example.jp/"
+        self.limiter.on_response(url, 503, retry_after="30")
+
+        # 制限時間内に送信できない場合は待たずに諦める
+        self.assertFalse(self.limiter.acquire(url, timeout=10))
+        self.assertEqual(self.clock.slept, [])
+        self.assertTrue(self.limiter.acquire(url, timeout=60))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("120"), 120.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("不正な値"))
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
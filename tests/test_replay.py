@@ -0,0 +1,130 @@
+import unittest
+from unittest.mock import MagicMock
+from pathlib import Path
+from datetime import datetime
+import tempfile
+import sys
+import requests
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.storage.response_archive import ResponseArchive
+from src.utils.deduplicator import Deduplicator
+from src.watcher.replay import ResponseReplayer, record_sweep
+
+
+RSS_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>新着情報</title>{items}</channel></rss>"""
+
+RSS_ITEM = "<item><title>お知らせ{0}</title><link>https://example.jp/news/{0}.html</link></item>"
+
+HTML_PAGE = """<html><head><meta charset="Shift_JIS"></head><body>
+<ul class="news"><li><a href="/info/1.html">令和7年5月1日 通知①</a></li>
+<li><a href="/info/2.html">令和7年5月2日 通知②</a></li></ul></body></html>"""
+
+CONFIG = {
+    "general": {"max_concurrency": 2, "per_host_concurrency": 1},
+    "rss_sources": [{"name": "テスト RSS", "url": "https://example.jp/rss.xml", "enabled": True}],
+    "html_sources": [
+        {"name": "テスト HTML", "url": "https://example.jp/info/", "selector": "ul.news li", "enabled": True},
+        {"name": "無効なソース", "url": "https://example.jp/disabled/", "selector": "li", "enabled": False}
+    ],
+    "video_sources": []
+}
+
+
+def make_response(body, status_code=200, content_type="text/html"):
+    """テスト用のResponseを作成"""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response.headers["Content-Type"] = content_type
+    return response
+
+
+def make_feed(*numbers):
+    """テスト用のRSSを作成"""
+    return RSS_TEMPLATE.format(items="".join(RSS_ITEM.format(n) for n in numbers)).encode("utf-8")
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.archive = ResponseArchive(Path(self.temp_dir.name) / "archive", compression="gzip")
+        self.rss_source = CONFIG["rss_sources"][0]
+        self.html_source = CONFIG["html_sources"][0]
+
+        self.archive.store("rss", self.rss_source, make_response(make_feed(1, 2), content_type="application/rss+xml"),
+                           fetched_at=datetime(2025, 5, 1, 9, 0))
+        self.archive.store("rss", self.rss_source, make_response(b"", status_code=304),
+                           fetched_at=datetime(2025, 5, 1, 9, 15))
+        self.archive.store("rss", self.rss_source, make_response(make_feed(1, 2, 3), content_type="application/rss+xml"),
+                           fetched_at=datetime(2025, 5, 1, 9, 30))
+        self.archive.store("html", self.html_source, make_response(HTML_PAGE.encode("cp932")),
+                           fetched_at=datetime(2025, 5, 1, 9, 0))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_replay_dedupes_in_fetch_order(self):
+        """取得時刻順に再解析し、初めて現れたエントリだけを新着とする"""
+        deduplicator = Deduplicator(data_dir=Path(self.temp_dir.name) / "state")
+        replayer = ResponseReplayer(self.archive, CONFIG, deduplicator=deduplicator, logger=MagicMock())
+
+        stats = replayer.replay()
+
+        self.assertEqual(stats["responses"], 3)
+        self.assertEqual(stats["entries"], 7)
+        links = [entry["link"] for entry in stats["new_entries"]]
+        self.assertEqual(links, [
+            "https://example.jp/news/1.html",
+            "https://example.jp/news/2.html",
+            "https://example.jp/news/3.html",
+            "https://example.jp/info/1.html",
+            "https://example.jp/info/2.html"
+        ])
+        self.assertEqual(stats["new_entries"][2]["fetched_at"], "2025-05-01T09:30:00")
+
+        # Shift_JISのページも文字化けせずに解析される
+        self.assertIn("通知①", stats["new_entries"][3]["title"])
+
+        # 監視済み状態はまとめて保存される
+        reloaded = Deduplicator(data_dir=Path(self.temp_dir.name) / "state")
+        self.assertEqual(len(reloaded.seen_store.urls("rss", self.rss_source["url"])), 3)
+
+    def test_replay_without_dedupe(self):
+        """重複排除なしでは解析のみ行う"""
+        replayer = ResponseReplayer(self.archive, CONFIG)
+
+        stats = replayer.replay(source_type="rss", since=datetime(2025, 5, 1, 9, 10))
+
+        self.assertEqual(stats["responses"], 1)
+        self.assertEqual(stats["entries"], 3)
+        self.assertEqual(stats["new_entries"], [])
+
+    def test_replay_uses_current_selector(self):
+        """再解析には現在の設定のセレクタを使う"""
+        config = dict(CONFIG, html_sources=[dict(self.html_source, selector="ul.news li:first-child")])
+        replayer = ResponseReplayer(self.archive, config)
+
+        stats = replayer.replay(source_type="html")
+
+        self.assertEqual(stats["entries"], 1)
+
+    def test_record_sweep(self):
+        """有効なソースのレスポンスだけを保存する"""
+        archive = ResponseArchive(Path(self.temp_dir.name) / "record", compression="gzip")
+        http_client = MagicMock()
+        http_client.get.side_effect = lambda url, **kwargs: make_response(f"<html>{url}</html>".encode("utf-8"))
+
+        count = record_sweep(CONFIG, archive, logger=MagicMock(), http_client=http_client)
+
+        self.assertEqual(count, 2)
+        entries = sorted(archive.entries(), key=lambda entry: entry["type"])
+        self.assertEqual([entry["type"] for entry in entries], ["html", "rss"])
+        self.assertEqual(archive.read_body(entries[1]["hash"]), b"<html>https://example.jp/rss.xml</html>")
+
+
+if __name__ == '__main__':
+    unittest.main()
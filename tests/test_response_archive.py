@@ -0,0 +1,100 @@
+import unittest
+from unittest.mock import MagicMock
+from pathlib import Path
+from datetime import datetime
+import tempfile
+import sys
+import requests
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.storage import response_archive
+from src.storage.response_archive import ResponseArchive
+
+
+SOURCE = {"name": "消防庁_新着情報", "url": "https://www.fdma.go.jp/index.xml"}
+
+
+def make_response(body, status_code=200, content_type="application/rss+xml; charset=UTF-8"):
+    """テスト用のResponseを作成"""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response.headers["Content-Type"] = content_type
+    return response
+
+
+class TestResponseArchive(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.archive = ResponseArchive(self.temp_dir.name, compression="gzip", logger=MagicMock())
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_identical_bodies_are_stored_once(self):
+        """同じ本文は1つだけ保存し、取得履歴は毎回記録する"""
+        body = "<rss><channel><title>新着情報</title></channel></rss>".encode("utf-8") * 50
+
+        first = self.archive.store("rss", SOURCE, make_response(body), fetched_at=datetime(2025, 5, 1, 9, 0))
+        size = self.archive.total_size()
+        second = self.archive.store("rss", SOURCE, make_response(body), fetched_at=datetime(2025, 5, 1, 9, 15))
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.archive.total_size(), size)
+        self.assertLess(size, len(body))
+        self.assertEqual(len(list(self.archive.entries())), 2)
+
+    def test_read_back_body(self):
+        """保存した本文を展開して読み戻せる"""
+        body = "令和7年5月1日 報道発表".encode("utf-8")
+        content_hash = self.archive.store("rss", SOURCE, make_response(body))
+
+        self.assertEqual(self.archive.read_body(content_hash), body)
+        with self.archive.open_body(content_hash) as f:
+            self.assertEqual(f.read(4), body[:4])
+
+    def test_entries_filter_and_response(self):
+        """種別・ソース・期間で絞り込み、Responseとして復元できる"""
+        html_source = {"name": "消防庁_お知らせ", "url": "https://www.fdma.go.jp/news/"}
+        self.archive.store("rss", SOURCE, make_response(b"<rss/>"), fetched_at=datetime(2025, 5, 1, 9, 0))
+        self.archive.store("html", html_source, make_response(b"<html/>", content_type="text/html"),
+                           fetched_at=datetime(2025, 5, 2, 9, 0))
+        self.archive.store("rss", SOURCE, make_response(b"", status_code=304), fetched_at=datetime(2025, 5, 3, 9, 0))
+
+        html_entries = list(self.archive.entries(source_type="html"))
+        self.assertEqual([entry["source"] for entry in html_entries], ["消防庁_お知らせ"])
+
+        recent = list(self.archive.entries(source_name=SOURCE["name"], since=datetime(2025, 5, 2)))
+        self.assertEqual(len(recent), 1)
+        self.assertEqual(recent[0]["status"], 304)
+        self.assertIsNone(recent[0]["hash"])
+
+        response = self.archive.to_response(html_entries[0])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"<html/>")
+        self.assertEqual(response.headers["content-type"], "text/html")
+        self.assertEqual(response.url, html_source["url"])
+
+    def test_truncated_index_line_is_skipped(self):
+        """書き込み途中の索引行は読み飛ばす"""
+        self.archive.store("rss", SOURCE, make_response(b"<rss/>"))
+        with open(self.archive.index_file, "a", encoding="utf-8") as f:
+            f.write('{"time": "2025-05-01T09')
+
+        self.assertEqual(len(list(self.archive.entries())), 1)
+
+    @unittest.skipUnless(response_archive.zstandard, "zstandardがインストールされていません")
+    def test_zstd_and_gzip_objects_coexist(self):
+        """圧縮形式を変えても保存済みの本文を読める"""
+        content_hash = self.archive.store("rss", SOURCE, make_response(b"<rss>gzip</rss>"))
+        zstd_archive = ResponseArchive(self.temp_dir.name, compression="zstd")
+        zstd_hash = zstd_archive.store("rss", SOURCE, make_response(b"<rss>zstd</rss>"))
+
+        self.assertEqual(zstd_archive.read_body(content_hash), b"<rss>gzip</rss>")
+        self.assertEqual(self.archive.read_body(zstd_hash), b"<rss>zstd</rss>")
+
+
+if __name__ == '__main__':
+    unittest.main()
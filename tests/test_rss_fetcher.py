@@ -4,12 +4,14 @@ import sys
 from pathlib import Path
 import json
 import tempfile
+import requests
 
 # プロジェクトのルートディレクトリをパスに追加
 root_dir = Path(__file__).resolve().parent.parent
 sys.path.append(str(root_dir))
 
 from src.fetcher.rss_fetcher import RSSFetcher
+from src.utils.circuit_breaker import CircuitBreaker
 
 
 class TestRSSFetcher(unittest.TestCase):
@@ -24,8 +26,12 @@ class TestRSSFetcher(unittest.TestCase):
         # モックロガー
         self.mock_logger = MagicMock()
 
+        # モックHTTPクライアント
+        self.mock_http = MagicMock()
+        self.mock_http.get.return_value = MagicMock(status_code=200, content=b'', headers={})
+
         # RSSFetcherのインスタンス化
-        self.rss_fetcher = RSSFetcher(data_dir=self.data_dir, logger=self.mock_logger)
+        self.rss_fetcher = RSSFetcher(data_dir=self.data_dir, logger=self.mock_logger, http_client=self.mock_http)
 
         # サンプルRSSソース
         self.sample_source = {
@@ -44,40 +50,28 @@ class TestRSSFetcher(unittest.TestCase):
         # データディレクトリが作成されているか
         self.assertTrue(Path(self.data_dir).exists())
 
-        # watched_urlsが初期化されているか
-        self.assertEqual(self.rss_fetcher.watched_urls, {"rss": {}, "html": {}, "video": {}})
+        # 監視済みURLのデータベースが作成されているか
+        self.assertTrue((Path(self.data_dir) / "seen_urls.db").exists())
+        self.assertEqual(self.rss_fetcher.seen_store.sources("rss"), [])
 
-    def test_load_watched_urls(self):
-        """監視済みURLのロードテスト"""
+    def test_migrates_watched_urls(self):
+        """以前のwatched_urls.jsonの監視済みURLを引き継ぐテスト"""
         # サンプルデータの作成
         sample_data = {"rss": {"test": ["url1", "url2"]}, "html": {}, "video": {}}
 
-        # ファイルに保存
-        watched_file = Path(self.data_dir) / "watched_urls.json"
+        # ファイルに保存（監視済み状態をまだ開いていないデータディレクトリ）
+        data_dir = Path(self.data_dir) / "legacy"
+        data_dir.mkdir()
+        watched_file = data_dir / "watched_urls.json"
         with open(watched_file, 'w', encoding='utf-8') as f:
             json.dump(sample_data, f)
 
-        # データのロード
-        result = self.rss_fetcher._load_watched_urls()
-
-        # 期待される結果
-        self.assertEqual(result, sample_data)
-
-    def test_save_watched_urls(self):
-        """監視済みURLの保存テスト"""
-        # サンプルデータの設定
-        self.rss_fetcher.watched_urls = {"rss": {"test": ["url1", "url2"]}, "html": {}, "video": {}}
-
-        # データの保存
-        self.rss_fetcher._save_watched_urls()
-
-        # 保存されたファイルの読み込み
-        watched_file = Path(self.data_dir) / "watched_urls.json"
-        with open(watched_file, 'r', encoding='utf-8') as f:
-            loaded_data = json.load(f)
+        # 起動時に取り込まれる
+        reloaded = RSSFetcher(data_dir=data_dir, logger=self.mock_logger, http_client=self.mock_http)
 
         # 期待される結果
-        self.assertEqual(loaded_data, self.rss_fetcher.watched_urls)
+        self.assertEqual(reloaded.seen_store.urls("rss", "test"), ["url1", "url2"])
+        self.assertFalse(watched_file.exists())
 
     @patch('feedparser.parse')
     def test_fetch_success(self, mock_parse):
@@ -103,8 +97,42 @@ class TestRSSFetcher(unittest.TestCase):
         self.assertEqual(entries[0]['title'], 'テスト記事')
         self.assertEqual(entries[0]['link'], 'https://example.com/article1')
 
-        # watched_urlsに追加されているか
-        self.assertIn('https://example.com/article1', self.rss_fetcher.watched_urls["rss"]["https://example.com/rss.xml"])
+        # 監視済みURLに追加されているか
+        self.assertTrue(self.rss_fetcher.seen_store.contains("rss", "https://example.com/rss.xml", 'https://example.com/article1'))
+
+    @patch('feedparser.parse')
+    def test_fetch_well_formed_without_feedparser(self, mock_parse):
+        """整形式のフィードはfeedparserを使わずに解析"""
+        content = (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>テスト</title>'
+            '<item><title>記事1</title><link>https://example.com/1</link><pubDate>Sun, 01 Jan 2023 12:00:00 GMT</pubDate></item>'
+            '<item><title>記事2</title><guid>https://example.com/2</guid></item>'
+            '</channel></rss>'
+        ).encode('utf-8')
+        self.mock_http.get.return_value = MagicMock(status_code=200, content=content, headers={}, url=self.sample_source['url'])
+
+        entries = self.rss_fetcher.fetch(self.sample_source)
+
+        mock_parse.assert_not_called()
+        self.assertEqual([entry['link'] for entry in entries], ['https://example.com/1', 'https://example.com/2'])
+        self.assertEqual(entries[0]['published'], '2023-01-01 12:00:00')
+
+    def test_fetch_resolves_relative_links(self):
+        """相対URLのリンクはフィードのURLを基準に解決する"""
+        content = (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>テスト</title>'
+            '<item><title>記事1</title><link>/news/1.html</link></item>'
+            '<item><title>記事2</title><link>detail/2.html</link></item>'
+            '</channel></rss>'
+        ).encode('utf-8')
+        self.mock_http.get.return_value = MagicMock(status_code=200, content=content, headers={}, url=None)
+        self.rss_fetcher.fast_parse = False
+
+        entries = self.rss_fetcher.fetch(self.sample_source)
+
+        expected = ['https://example.com/news/1.html', 'https://example.com/detail/2.html']
+        self.assertEqual([entry['link'] for entry in entries], expected)
+        self.assertEqual(self.rss_fetcher.seen_store.urls("rss", self.sample_source["url"]), expected)
 
     @patch('feedparser.parse')
     def test_fetch_error(self, mock_parse):
@@ -140,7 +168,7 @@ class TestRSSFetcher(unittest.TestCase):
         )
 
         # 既に処理済みのURLを設定
-        self.rss_fetcher.watched_urls["rss"]["https://example.com/rss.xml"] = ["https://example.com/article1"]
+        self.rss_fetcher.seen_store.add("rss", "https://example.com/rss.xml", "https://example.com/article1")
 
         # RSS取得の実行
         entries = self.rss_fetcher.fetch(self.sample_source)
@@ -148,6 +176,191 @@ class TestRSSFetcher(unittest.TestCase):
         # 期待される結果（重複エントリは含まれない）
         self.assertEqual(entries, [])
 
+    @patch('feedparser.parse')
+    def test_fetch_saves_validators(self, mock_parse):
+        """ETag/Last-Modifiedの保存と次回送信のテスト"""
+        mock_parse.return_value = MagicMock(bozo=False, entries=[])
+        self.mock_http.get.return_value = MagicMock(
+            status_code=200,
+            content=b'',
+            headers={'ETag': '"abc123"', 'Last-Modified': 'Wed, 21 May 2025 10:00:00 GMT'}
+        )
+
+        self.rss_fetcher.fetch(self.sample_source)
+
+        # バリデータが保存されているか
+        state_file = Path(self.data_dir) / "feed_state.json"
+        with open(state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        self.assertEqual(state["https://example.com/rss.xml"]["etag"], '"abc123"')
+
+        # 次回の取得でバリデータが送信されるか
+        reloaded = RSSFetcher(data_dir=self.data_dir, logger=self.mock_logger, http_client=self.mock_http)
+        reloaded.fetch(self.sample_source)
+        _, kwargs = self.mock_http.get.call_args
+        self.assertEqual(kwargs['headers']['If-None-Match'], '"abc123"')
+        self.assertEqual(kwargs['headers']['If-Modified-Since'], 'Wed, 21 May 2025 10:00:00 GMT')
+
+    @patch('feedparser.parse')
+    def test_fetch_not_modified(self, mock_parse):
+        """304 Not Modifiedのテスト"""
+        self.mock_http.get.return_value = MagicMock(status_code=304, content=b'', headers={})
+
+        entries = self.rss_fetcher.fetch(self.sample_source)
+
+        # 解析せず新着なしとして扱われ、監視済みURLも変更されない
+        self.assertEqual(entries, [])
+        mock_parse.assert_not_called()
+        self.assertFalse(self.rss_fetcher.seen_store.has_source("rss", "https://example.com/rss.xml"))
+        self.mock_logger.error.assert_not_called()
+
+        # 取得の失敗（None）とは区別してレスポンスを返す
+        self.assertIsNotNone(self.rss_fetcher.download(self.sample_source))
+
+
+    @patch('feedparser.parse')
+    def test_fetch_archives_response(self, mock_parse):
+        """取得したレスポンスがアーカイブに渡されるかのテスト"""
+        archive = MagicMock()
+        fetcher = RSSFetcher(data_dir=self.data_dir, logger=self.mock_logger, http_client=self.mock_http, archive=archive)
+        self.mock_http.get.return_value = MagicMock(status_code=304, content=b'', headers={})
+
+        fetcher.fetch(self.sample_source)
+
+        archive.store.assert_called_once_with('rss', self.sample_source, self.mock_http.get.return_value)
+
+
+    def test_fetch_records_circuit_state(self):
+        """取得エラーが続いたソースはスキップされるかのテスト"""
+        breaker = CircuitBreaker(data_dir=self.data_dir, failure_threshold=2, cooldown=600)
+        fetcher = RSSFetcher(data_dir=self.data_dir, logger=self.mock_logger, http_client=self.mock_http, circuit_breaker=breaker)
+        self.mock_http.get.side_effect = requests.ConnectionError("接続できません")
+
+        fetcher.fetch(self.sample_source)
+        fetcher.fetch(self.sample_source)
+        entries = fetcher.fetch(self.sample_source)
+
+        # 2回失敗した後は通信せずにスキップする
+        self.assertEqual(entries, [])
+        self.assertEqual(self.mock_http.get.call_count, 2)
+        self.assertEqual(breaker.get_state("rss:https://example.com/rss.xml"), CircuitBreaker.OPEN)
+
+
+class TestRSSFetcherHighWater(unittest.TestCase):
+    """既読位置による打ち切りのテスト"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.mock_http = MagicMock()
+        self.mock_http.get.return_value = MagicMock(status_code=200, content=b'', headers={})
+        self.rss_fetcher = RSSFetcher(data_dir=self.temp_dir.name, http_client=self.mock_http)
+        self.source = {"name": "テスト RSS", "url": "https://example.com/rss.xml"}
+        self.consumed = []
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _entry(self, number, day=None):
+        """日付の新しい順に並ぶエントリ（dayを指定すると公開日を変更）"""
+        entry = {'title': f'記事{number}', 'link': f'https://example.com/{number}'}
+        if day is not False:
+            entry['published_parsed'] = (2025, 5, day or number, 12, 0, 0, 0, 0, 0)
+        return entry
+
+    def _fetch(self, entries, source=None):
+        """取り出したエントリを記録しながら取得"""
+        self.consumed = []
+
+        def iter_entries(*args, **kwargs):
+            for entry in entries:
+                self.consumed.append(entry['link'])
+                yield entry
+
+        with patch.object(self.rss_fetcher.feed_parser, 'iter_entries', side_effect=iter_entries):
+            return self.rss_fetcher.fetch(source or self.source)
+
+    def test_ordered_feed_stops_at_high_water(self):
+        """日付順のフィードは既読位置に達した時点で打ち切る"""
+        first = [self._entry(n) for n in range(20, 0, -1)]
+        self.assertEqual(len(self._fetch(first)), 20)
+        self.assertEqual(len(self.consumed), 20)
+
+        entries = self._fetch([self._entry(21)] + first)
+
+        self.assertEqual([entry['link'] for entry in entries], ['https://example.com/21'])
+        self.assertEqual(self.consumed, ['https://example.com/21', 'https://example.com/20'])
+
+        mark = self.rss_fetcher.feed_state[self.source['url']]['high_water']
+        self.assertEqual(mark['published'], '2025-05-21 12:00:00')
+        self.assertEqual(mark['ids'][:2], ['https://example.com/21', 'https://example.com/20'])
+        self.assertTrue(mark['ordered'])
+
+    def test_unordered_feed_scans_all(self):
+        """日付順でないフィードは全件を確認し、古い日付の新着も検出する"""
+        first = [self._entry(3), self._entry(5), self._entry(1)]
+        self._fetch(first)
+        self.assertFalse(self.rss_fetcher.feed_state[self.source['url']]['high_water']['ordered'])
+
+        entries = self._fetch(first + [self._entry(9, day=2)])
+
+        self.assertEqual([entry['link'] for entry in entries], ['https://example.com/9'])
+        self.assertEqual(len(self.consumed), 4)
+
+    def test_undated_feed_scans_all(self):
+        """日付のないエントリを含むフィードは全件を確認する"""
+        first = [self._entry(3), self._entry(2, day=False), self._entry(1)]
+        self._fetch(first)
+
+        entries = self._fetch(first + [self._entry(9, day=False)])
+
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(len(self.consumed), 4)
+
+    def test_order_broken_before_high_water(self):
+        """今回の取得で順序が崩れていれば既読位置に達しても打ち切らない"""
+        first = [self._entry(n) for n in range(5, 0, -1)]
+        self._fetch(first)
+
+        # 既読位置より後ろに古い日付の新着が挿入され、先頭にも日付の古い新着がある
+        entries = self._fetch([self._entry(6, day=1)] + first[:2] + [self._entry(7, day=3)] + first[2:])
+
+        self.assertEqual(sorted(entry['link'] for entry in entries), ['https://example.com/6', 'https://example.com/7'])
+        self.assertFalse(self.rss_fetcher.feed_state[self.source['url']]['high_water']['ordered'])
+
+    def test_full_scan_option(self):
+        """full_scanを指定したソースは打ち切らない"""
+        first = [self._entry(n) for n in range(5, 0, -1)]
+        self._fetch(first)
+
+        self._fetch(first, source=dict(self.source, full_scan=True))
+
+        self.assertEqual(len(self.consumed), 5)
+
+    def test_periodic_full_scan(self):
+        """打ち切りが続いた場合は一定回数ごとに全件を確認する"""
+        self.rss_fetcher.FULL_SCAN_EVERY = 2
+        first = [self._entry(n) for n in range(5, 0, -1)]
+        self._fetch(first)
+
+        self._fetch(first)
+        self.assertEqual(len(self.consumed), 1)
+        self._fetch(first)
+        self.assertEqual(len(self.consumed), 1)
+        self._fetch(first)
+        self.assertEqual(len(self.consumed), 5)
+        self._fetch(first)
+        self.assertEqual(len(self.consumed), 1)
+
+    def test_validators_keep_high_water(self):
+        """バリデータの更新で既読位置が消えない"""
+        self.mock_http.get.return_value = MagicMock(status_code=200, content=b'', headers={'ETag': '"v1"'})
+        self._fetch([self._entry(1)])
+
+        reloaded = RSSFetcher(data_dir=self.temp_dir.name, http_client=self.mock_http)
+        state = reloaded.feed_state[self.source['url']]
+        self.assertEqual(state['etag'], '"v1"')
+        self.assertEqual(state['high_water']['ids'], ['https://example.com/1'])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,187 @@
+import unittest
+from unittest.mock import MagicMock
+from pathlib import Path
+import json
+import shutil
+import tempfile
+import threading
+import sys
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.storage.seen_store import SeenStore
+from src.utils.deduplicator import Deduplicator
+
+
+class TestSeenStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.temp_dir.name)
+        self.stores = []
+
+    def tearDown(self):
+        for store in self.stores:
+            store.close()
+        self.temp_dir.cleanup()
+
+    def _open(self, **kwargs):
+        store = SeenStore(data_dir=self.data_dir, **kwargs)
+        self.stores.append(store)
+        return store
+
+    def test_add_and_contains(self):
+        store = self._open()
+
+        self.assertTrue(store.add("rss", "feed", "https://example.jp/1"))
+        self.assertFalse(store.add("rss", "feed", "https://example.jp/1"))
+
+        self.assertTrue(store.contains("rss", "feed", "https://example.jp/1"))
+        # ソース・種別ごとに区別する
+        self.assertFalse(store.contains("rss", "other", "https://example.jp/1"))
+        self.assertFalse(store.contains("html", "feed", "https://example.jp/1"))
+
+    def test_commit_batches_writes(self):
+        store = self._open()
+        for i in range(3):
+            store.add("rss", "feed", f"https://example.jp/{i}")
+
+        # commit()までは書き込まない
+        self.assertEqual(self._open().urls("rss", "feed"), [])
+
+        store.commit()
+        self.assertEqual(self._open().urls("rss", "feed"), [f"https://example.jp/{i}" for i in range(3)])
+
+    def test_batch_size(self):
+        store = self._open()
+        store.BATCH_SIZE = 2
+        for i in range(3):
+            store.add("video", "page", f"https://example.jp/{i}.mp4")
+
+        # 上限に達した分だけ書き込まれている
+        self.assertEqual(len(self._open().urls("video", "page")), 2)
+
+    def test_sources(self):
+        store = self._open()
+        store.add_source("html", "empty")
+        store.add("html", "page", "https://example.jp/1")
+
+        self.assertTrue(store.has_source("html", "empty"))
+        self.assertFalse(store.has_source("rss", "empty"))
+
+        store.commit()
+        self.assertEqual(self._open().sources("html"), ["empty", "page"])
+
+    def test_remove(self):
+        store = self._open()
+        for i in range(3):
+            store.add("rss", "feed", f"https://example.jp/{i}")
+
+        store.remove("rss", "feed", ["https://example.jp/0", "https://example.jp/2"])
+
+        self.assertFalse(store.contains("rss", "feed", "https://example.jp/0"))
+        self.assertEqual(self._open().urls("rss", "feed"), ["https://example.jp/1"])
+
+    def test_migrates_legacy_file_once(self):
+        legacy = {"rss": {"feed": ["a", "b", "a"]}, "html": {"page": []}, "video": {"movie": ["m.mp4"]}}
+        legacy_file = self.data_dir / "watched_urls.json"
+        legacy_file.write_text(json.dumps(legacy), encoding="utf-8")
+        logger = MagicMock()
+
+        store = self._open(logger=logger)
+
+        self.assertEqual(store.urls("rss", "feed"), ["a", "b"])
+        self.assertEqual(store.urls("video", "movie"), ["m.mp4"])
+        self.assertTrue(store.has_source("html", "page"))
+        self.assertFalse(legacy_file.exists())
+        self.assertTrue((self.data_dir / "watched_urls.json.migrated").exists())
+        logger.info.assert_called()
+
+        # 移行後に同じファイルが置かれても取り込み直さない
+        legacy_file.write_text(json.dumps({"rss": {"feed": ["c"]}}), encoding="utf-8")
+        self.assertEqual(self._open().urls("rss", "feed"), ["a", "b"])
+
+    def test_broken_legacy_file(self):
+        (self.data_dir / "watched_urls.json").write_text("{", encoding="utf-8")
+        logger = MagicMock()
+
+        store = self._open(logger=logger)
+
+        logger.error.assert_called()
+        self.assertTrue(store.add("rss", "feed", "a"))
+
+    def test_migrates_shipped_file(self):
+        """同梱のwatched_urls.json（説明用の__commentを含む）を取り込む"""
+        shutil.copy(root_dir / "data" / "watched_urls.json", self.data_dir / "watched_urls.json")
+        legacy = json.loads((root_dir / "data" / "watched_urls.json").read_text(encoding="utf-8"))
+
+        store = self._open()
+
+        for source_type, sources in legacy.items():
+            expected = [source_id for source_id in sources if not source_id.startswith("__")]
+            self.assertEqual(store.sources(source_type), expected)
+            for source_id in expected:
+                self.assertEqual(store.urls(source_type, source_id), sources[source_id])
+
+        # 説明用の項目は監視済みURLとして登録しない
+        rows = store.conn.execute("SELECT COUNT(*) FROM seen_urls WHERE source_id LIKE '\\_\\_%' ESCAPE '\\'").fetchone()[0]
+        self.assertEqual(rows, 0)
+
+    def test_migrate_skips_non_list_values(self):
+        legacy = {"rss": {"__comment1": "説明", "feed": ["a"], "broken": "b"}, "__note": "説明"}
+        (self.data_dir / "watched_urls.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+        store = self._open()
+
+        self.assertEqual(store.sources("rss"), ["feed"])
+        self.assertEqual(store.urls("rss", "feed"), ["a"])
+
+    def test_concurrent_add(self):
+        store = self._open()
+        added = []
+
+        def worker():
+            added.extend(url for url in (f"u{i}" for i in range(200)) if store.add("rss", "feed", url))
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 同じURLを新着と判定するのは1回だけ
+        self.assertEqual(sorted(added), sorted(f"u{i}" for i in range(200)))
+        self.assertEqual(len(store.urls("rss", "feed")), 200)
+
+
+class TestDeduplicatorSeenStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_mark_and_save(self):
+        deduplicator = Deduplicator(data_dir=self.temp_dir.name)
+
+        self.assertTrue(deduplicator.is_new_url("https://example.jp/1", "feed"))
+        self.assertTrue(deduplicator.mark_as_processed("https://example.jp/1", "feed", save=False))
+        self.assertFalse(deduplicator.mark_as_processed("https://example.jp/1", "feed"))
+        self.assertFalse(deduplicator.is_new_url("https://example.jp/1", "feed"))
+
+        deduplicator.save()
+        reloaded = Deduplicator(data_dir=self.temp_dir.name)
+        self.assertFalse(reloaded.is_new_url("https://example.jp/1", "feed"))
+
+    def test_remove_old_urls(self):
+        deduplicator = Deduplicator(data_dir=self.temp_dir.name)
+        old_year = deduplicator.seen_store.conn.execute("SELECT strftime('%Y', 'now', '-3 years')").fetchone()[0]
+        deduplicator.mark_as_processed(f"https://example.jp/{old_year}/01/a", "feed")
+        deduplicator.mark_as_processed("https://example.jp/no-date", "feed")
+
+        self.assertEqual(deduplicator.remove_old_urls(days=30), 1)
+        self.assertEqual(deduplicator.seen_store.urls("rss", "feed"), ["https://example.jp/no-date"])
+
+
+if __name__ == '__main__':
+    unittest.main()
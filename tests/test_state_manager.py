@@ -0,0 +1,181 @@
+import unittest
+from unittest.mock import MagicMock
+from pathlib import Path
+import json
+import multiprocessing
+import sqlite3
+import tempfile
+import threading
+import sys
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.storage.state_manager import StateManager, get_state_manager
+from src.utils.file_lock import FileLock
+from src.fetcher.rss_fetcher import RSSFetcher
+from src.fetcher.html_scraper import HTMLScraper
+from src.utils.poll_scheduler import PollScheduler
+
+
+def write_keys(data_dir, prefix, count):
+    """別プロセスから状態ファイルにキーを1件ずつ保存"""
+    manager = StateManager(data_dir=data_dir)
+    document = manager.document("shared.json")
+    for i in range(count):
+        document[f"{prefix}{i}"] = i
+        manager.save(document)
+
+
+class TestStateManager(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _read(self, name):
+        with open(self.data_dir / name, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_save_merges_other_writers(self):
+        """別のプロセスが保存した他のキーを上書きしない"""
+        first = StateManager(data_dir=self.data_dir)
+        second = StateManager(data_dir=self.data_dir)
+        first_doc = first.document("feed_state.json")
+        second_doc = second.document("feed_state.json")
+
+        first_doc["a"] = {"etag": "1"}
+        first_doc["old"] = {"etag": "0"}
+        first.save(first_doc)
+
+        second_doc["b"] = {"etag": "2"}
+        second.save(second_doc)
+        self.assertEqual(set(self._read("feed_state.json")), {"a", "old", "b"})
+
+        # 削除したキーだけが消え、保存時に他のキーも読み込まれる
+        first_doc.pop("old")
+        first.save(first_doc)
+        self.assertEqual(set(self._read("feed_state.json")), {"a", "b"})
+        self.assertEqual(first_doc["b"], {"etag": "2"})
+
+    def test_sweep_saves_once(self):
+        manager = StateManager(data_dir=self.data_dir)
+        document = manager.document("feed_state.json")
+
+        with manager.sweep():
+            with manager.sweep():
+                document["a"] = 1
+                manager.seen_store.add("rss", "feed", "https://example.jp/1")
+                manager.save(document)
+
+            # 巡回中は保存しない
+            self.assertFalse((self.data_dir / "feed_state.json").exists())
+            self.assertEqual(StateManager(data_dir=self.data_dir).seen_store.urls("rss", "feed"), [])
+
+        # 巡回の終わりにまとめて保存
+        self.assertEqual(self._read("feed_state.json"), {"a": 1})
+        self.assertEqual(StateManager(data_dir=self.data_dir).seen_store.urls("rss", "feed"), ["https://example.jp/1"])
+
+    def test_sweep_saves_on_error(self):
+        manager = StateManager(data_dir=self.data_dir)
+        document = manager.document("poll_schedule.json")
+
+        with self.assertRaises(ValueError):
+            with manager.sweep():
+                document["a"] = 1
+                raise ValueError("巡回中のエラー")
+
+        self.assertEqual(self._read("poll_schedule.json"), {"a": 1})
+
+    def test_broken_file(self):
+        (self.data_dir / "feed_state.json").write_text("{", encoding="utf-8")
+        logger = MagicMock()
+
+        manager = StateManager(data_dir=self.data_dir, logger=logger)
+        document = manager.document("feed_state.json")
+        document["a"] = 1
+        manager.save(document)
+
+        logger.error.assert_called()
+        self.assertEqual(self._read("feed_state.json"), {"a": 1})
+
+    def test_close(self):
+        manager = StateManager(data_dir=self.data_dir)
+        document = manager.document("feed_state.json")
+        document["a"] = 1
+        manager.seen_store.add("rss", "feed", "https://example.jp/1")
+
+        manager.close()
+
+        # 未保存の状態を書き込んでからデータベースを閉じる
+        self.assertEqual(self._read("feed_state.json"), {"a": 1})
+        self.assertEqual(StateManager(data_dir=self.data_dir).seen_store.urls("rss", "feed"), ["https://example.jp/1"])
+        with self.assertRaises(sqlite3.ProgrammingError):
+            manager.seen_store.conn.execute("SELECT 1")
+
+    def test_shared_per_data_dir(self):
+        manager = get_state_manager(self.data_dir)
+        self.assertIs(get_state_manager(self.data_dir / "." / ""), manager)
+        self.assertIsNot(get_state_manager(self.data_dir / "other"), manager)
+
+        # フェッチャー・スケジューラは同じ状態を共有する
+        rss_fetcher = RSSFetcher(data_dir=self.data_dir, http_client=MagicMock())
+        html_scraper = HTMLScraper(data_dir=self.data_dir, http_client=MagicMock())
+        scheduler = PollScheduler(data_dir=self.data_dir)
+        self.assertIs(rss_fetcher.seen_store, html_scraper.seen_store)
+        self.assertIs(scheduler.state, manager)
+
+    def test_parallel_processes(self):
+        """同時に保存する2つのプロセスの更新がどちらも残る"""
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(target=write_keys, args=(str(self.data_dir), prefix, 20))
+            for prefix in ("url", "video")
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(timeout=60)
+            self.assertEqual(process.exitcode, 0)
+
+        saved = self._read("shared.json")
+        self.assertEqual(len(saved), 40)
+
+
+class TestFileLock(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.lock_file = Path(self.temp_dir.name) / "state.lock"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_exclusive(self):
+        acquired = threading.Event()
+        release = threading.Event()
+
+        def holder():
+            with FileLock(self.lock_file):
+                acquired.set()
+                release.wait(5)
+
+        thread = threading.Thread(target=holder)
+        thread.start()
+        acquired.wait(5)
+
+        # 別のロックは取得できない
+        with self.assertRaises(TimeoutError):
+            FileLock(self.lock_file, timeout=0.1).acquire()
+
+        release.set()
+        thread.join()
+
+        # 解放後は取得できる
+        with FileLock(self.lock_file, timeout=1):
+            pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,11 +4,14 @@ from pathlib import Path
 import tempfile
 import sys
 import requests
+import threading
+import time
 
 root_dir = Path(__file__).resolve().parent.parent
 sys.path.append(str(root_dir))
 
 from src.fetcher.video_fetcher import VideoFetcher
+from src.utils.http_cache import HTTPCache
 
 
 class TestVideoFetcher(unittest.TestCase):
@@ -26,7 +29,7 @@ class TestVideoFetcher(unittest.TestCase):
             "enabled": True
         }
 
-    @patch("src.fetcher.video_fetcher.requests.get")
+    @patch("src.utils.http_client.HTTPClient.get")
     def test_direct_video_tag(self, mock_get):
         html = '''
         <html><body>
@@ -36,10 +39,11 @@ class TestVideoFetcher(unittest.TestCase):
         mock_response = MagicMock(status_code=200, text=html)
         mock_get.return_value = mock_response
 
-        result = self.fetcher.fetch(self.source)
-        self.assertIn("https://gov.example.jp/stream.mp4", result)
+        # video要素のsrcは記載どおりに返す
+        result = self.fetcher.fetch(dict(self.source, video_selector="video"))
+        self.assertEqual([video["url"] for video in result], ["/stream.mp4"])
 
-    @patch("src.fetcher.video_fetcher.requests.get")
+    @patch("src.utils.http_client.HTTPClient.get")
     def test_source_inside_video_tag(self, mock_get):
         html = '''
         <html><body>
@@ -49,10 +53,10 @@ class TestVideoFetcher(unittest.TestCase):
         mock_response = MagicMock(status_code=200, text=html)
         mock_get.return_value = mock_response
 
-        result = self.fetcher.fetch(self.source)
-        self.assertIn("https://gov.example.jp/s.mp4", result)
+        result = self.fetcher.fetch(dict(self.source, video_selector="video"))
+        self.assertEqual([video["url"] for video in result], ["https://gov.example.jp/s.mp4"])
 
-    @patch("src.fetcher.video_fetcher.requests.get")
+    @patch("src.utils.http_client.HTTPClient.get")
     def test_a_tag_to_embedded_page(self, mock_get):
         first_html = '''
         <html><body><a href="/embed/123">動画詳細</a></body></html>
@@ -73,15 +77,121 @@ class TestVideoFetcher(unittest.TestCase):
 
         mock_get.side_effect = side_effect
 
-        result = self.fetcher.fetch(self.source)
-        self.assertIn("stream_final.mp4", result)
+        result = self.fetcher.fetch(dict(self.source, video_selector="a"))
+        self.assertEqual([video["url"] for video in result], ["stream_final.mp4"])
+        self.assertEqual(result[0]["title"], "動画詳細")
 
-    @patch("src.fetcher.video_fetcher.requests.get")
+    @patch("src.utils.http_client.HTTPClient.get")
     def test_connection_failure(self, mock_get):
         mock_get.side_effect = requests.RequestException("失敗")
         result = self.fetcher.fetch(self.source)
         self.assertEqual(result, [])
         self.logger.error.assert_called()
 
+        # 新着なしとは区別して取得の失敗を返す
+        self.assertIsNone(self.fetcher.fetch_videos(self.source))
+
+    @patch("src.utils.http_client.HTTPClient.get")
+    def test_detail_pages_resolved_concurrently_in_order(self, mock_get):
+        listing_html = '<html><body><div class="movie-list">' + "".join(
+            f'<a href="/detail/{i}">動画{i}</a>' for i in range(6)
+        ) + '</div></body></html>'
+
+        lock = threading.Lock()
+        state = {"active": 0, "max_active": 0}
+
+        def side_effect(url, *args, **kwargs):
+            res = MagicMock(status_code=200)
+            if "/detail/" in url:
+                with lock:
+                    state["active"] += 1
+                    state["max_active"] = max(state["max_active"], state["active"])
+                # 後ろの要素ほど早く返して順序が保たれることを確認する
+                number = int(url.rsplit("/", 1)[-1])
+                time.sleep(0.02 * (6 - number))
+                with lock:
+                    state["active"] -= 1
+                res.text = f'<html><body><video src="https://cdn.example.jp/{number}.mp4"></video></body></html>'
+            else:
+                res.text = listing_html
+            return res
+
+        mock_get.side_effect = side_effect
+
+        source = dict(self.source, video_selector=".movie-list a", detail_workers=3)
+        result = self.fetcher.fetch(source)
+
+        self.assertEqual([video["url"] for video in result], [f"https://cdn.example.jp/{i}.mp4" for i in range(6)])
+        self.assertEqual([video["title"] for video in result], [f"動画{i}" for i in range(6)])
+        self.assertGreater(state["max_active"], 1)
+        self.assertLessEqual(state["max_active"], 3)
+
+    @patch("src.utils.http_client.HTTPClient.get")
+    def test_detail_pages_served_from_cache(self, mock_get):
+        listing_html = '<html><body><div class="movie-list"><a href="/detail/1">動画1</a></div></body></html>'
+        detail_html = '<html><body><video src="https://cdn.example.jp/1.mp4"></video></body></html>'
+
+        def side_effect(url, *args, **kwargs):
+            if "/detail/" in url:
+                res = requests.Response()
+                res.status_code = 200
+                res._content = detail_html.encode('utf-8')
+                res.headers["Cache-Control"] = "max-age=3600"
+                return res
+            return MagicMock(status_code=200, text=listing_html)
+
+        mock_get.side_effect = side_effect
+
+        cache = HTTPCache(Path(self.data_dir) / "http_cache")
+        fetcher = VideoFetcher(data_dir=self.data_dir, logger=self.logger, http_cache=cache)
+        source = dict(self.source, video_selector=".movie-list a")
+
+        fetcher.fetch(source)
+        fetcher.fetch(source)
+
+        detail_calls = [call for call in mock_get.call_args_list if "/detail/" in call.args[0]]
+        self.assertEqual(len(detail_calls), 1)
+
+    @patch("src.utils.http_client.HTTPClient.get")
+    def test_detail_page_script_prefers_m3u8(self, mock_get):
+        listing_html = '<html><body><div class="movie-list"><a href="/detail/1">動画1</a></div></body></html>'
+        detail_html = (
+            '<html><head><script>var analytics = {"id": "UA-1"};</script></head><body>'
+            '<script>var player = {poster: "/img/1.jpg", url: "/movie/1.mp4"};'
+            'player.hls = "https://cdn.example.jp/1/index.m3u8";</script></body></html>'
+        )
+
+        def side_effect(url, *args, **kwargs):
+            return MagicMock(status_code=200, text=detail_html if "/detail/" in url else listing_html)
+
+        mock_get.side_effect = side_effect
+
+        with patch.object(self.fetcher, "_process_m3u8", side_effect=lambda url, cache_ttl=None: url):
+            result = self.fetcher.fetch(dict(self.source, video_selector=".movie-list a"))
+
+        # 同じスクリプト内ではm3u8を優先し、相対URLはリンク先ページを基準に解決する
+        self.assertEqual([video["url"] for video in result], ["https://cdn.example.jp/1/index.m3u8"])
+
+    def test_m3u8_results_bounded(self):
+        """m3u8の解析結果は上限件数まで、最近使ったものを残す"""
+        self.fetcher.M3U8_MEMO_SIZE = 2
+
+        def get_cached(url, cache_ttl=None):
+            return MagicMock(content=url.encode('utf-8'), text="#EXTM3U")
+
+        with patch.object(self.fetcher, "_get_cached", side_effect=get_cached), \
+                patch.object(self.fetcher, "_select_best_playlist", side_effect=lambda url, text: url + ".best") as mock_select:
+            for url in ("https://cdn.example.jp/1.m3u8", "https://cdn.example.jp/2.m3u8"):
+                self.fetcher._process_m3u8(url)
+            # 1を使って2を最も古い結果にする
+            self.fetcher._process_m3u8("https://cdn.example.jp/1.m3u8")
+            self.fetcher._process_m3u8("https://cdn.example.jp/3.m3u8")
+
+        self.assertEqual(mock_select.call_count, 3)
+        self.assertEqual(
+            [url for url, _ in self.fetcher._m3u8_results],
+            ["https://cdn.example.jp/1.m3u8", "https://cdn.example.jp/3.m3u8"]
+        )
+
     def tearDown(self):
         self.temp_dir.cleanup()
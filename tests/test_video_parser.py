@@ -0,0 +1,93 @@
+import unittest
+from unittest.mock import patch
+from pathlib import Path
+import sys
+
+root_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(root_dir))
+
+from src.parser.backends import BACKENDS, is_backend_available, parse_html
+from src.parser.video_parser import VideoParser, HeadingIndex
+
+FIXTURE_DIR = root_dir / "tests" / "fixtures" / "html"
+
+# 見出しの入れ子・見出しより前の動画・空の見出しを含むページ
+NESTED_PAGE = '''<html><head><title>動画一覧</title></head><body>
+<div class="top"><video src="/top.mp4"></video></div>
+<h3>三番目の見出し</h3>
+<section><div><video src="/a.mp4"></video></div><h4>後ろの見出し</h4></section>
+<article><h2><a href="/in-heading.mp4"></a></h2><h2></h2><video src="/b.mp4"></video>
+  <div><h1>記事の見出し</h1></div></article>
+<ul>''' + "".join(f'<li><h5>項目{i}</h5><a href="/movie/{i}.mp4"></a></li>' for i in range(30)) + '''</ul>
+<footer><iframe src="https://www.youtube.com/embed/x"></iframe></footer>
+</body></html>'''
+
+
+def reference_title(element, soup):
+    """以前の実装（見出しごとに親要素内とfind_previousで文書を走査）"""
+    if element.get_text(strip=True):
+        return element.get_text(strip=True)
+
+    parent = element.parent
+    for heading_tag in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
+        heading = parent.find(heading_tag)
+        if heading:
+            return heading.get_text(strip=True)
+
+        prev_heading = element.find_previous(heading_tag)
+        if prev_heading:
+            return prev_heading.get_text(strip=True)
+
+    title_tag = soup.find('title')
+    if title_tag:
+        return title_tag.get_text(strip=True)
+
+    return None
+
+
+def corpus():
+    """比較に使うページ（フィクスチャと入れ子の多いページ）"""
+    pages = [(path.name, path.read_text(encoding="utf-8")) for path in sorted(FIXTURE_DIR.glob("*.html"))]
+    pages.append(("nested", NESTED_PAGE))
+    return pages
+
+
+class TestVideoTitle(unittest.TestCase):
+    def test_titles_match_reference(self):
+        """すべての要素について以前の実装と同じタイトルになる"""
+        parser = VideoParser()
+
+        for backend in BACKENDS:
+            if not is_backend_available(backend):
+                continue
+            for name, html in corpus():
+                with self.subTest(backend=backend, page=name):
+                    soup = parse_html(html, backend)
+                    headings = HeadingIndex(soup)
+                    elements = [node for node in soup.descendants if node.name is not None]
+
+                    expected = [reference_title(element, soup) for element in elements]
+                    actual = [parser._extract_video_title(element, soup, headings) for element in elements]
+
+                    self.assertEqual(actual, expected)
+
+    def test_index_built_once(self):
+        soup = parse_html(NESTED_PAGE, "html.parser")
+        headings = HeadingIndex(soup)
+
+        with patch.object(HeadingIndex, "_build", autospec=True, side_effect=HeadingIndex._build) as mock_build:
+            for link in soup.select("li a"):
+                VideoParser()._extract_video_title(link, soup, headings)
+
+        mock_build.assert_called_once()
+
+    def test_parse_video_page_titles(self):
+        videos = VideoParser().parse_video_page(NESTED_PAGE, "https://example.jp/movie/", "li a, section video", "テスト")
+
+        self.assertEqual(videos[0]['title'], "三番目の見出し")
+        # 上位の見出し（前にあるh1）が親要素内のh5より優先される
+        self.assertEqual([video['title'] for video in videos[1:3]], ["記事の見出し", "記事の見出し"])
+
+
+if __name__ == '__main__':
+    unittest.main()